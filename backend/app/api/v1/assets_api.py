@@ -0,0 +1,104 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.api.v1.dependencies import get_active_subject, get_admin_subject, get_event_id
+from app.models.core_db import get_db
+from app.schemas.poster import PosterAssetRead
+from app.services.asset_service import ASSET_MAX_BYTES, AssetService, AssetTooLarge, AssetUpload
+from app.services.auth_service import AuthService
+from app.utils.etag_util import etag_matches
+from app.utils.storage_util import blob_key, get_asset_storage
+
+router = APIRouter()
+
+# Same validator rules as poster pages: keep a copy, revalidate before use
+ASSET_CACHE_CONTROL = "private, no-cache"
+
+
+# ------------------ UPLOAD (PUT, raw body) ------------------
+@router.put("/posters/{poster_id}/asset", response_model=PosterAssetRead)
+async def upload_poster_asset(
+    poster_id: int,
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    content_length: Optional[int] = Header(None),
+    admin_id: str = Depends(get_admin_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_db),
+):
+    if content_length is not None and content_length > ASSET_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Poster files are limited to {ASSET_MAX_BYTES // (1024 * 1024)} MB")
+    storage = get_asset_storage()
+    upload = AssetUpload(directory=storage.staging_dir())
+    try:
+        # The body is streamed to disk as it arrives; it is never held in memory whole
+        async for chunk in request.stream():
+            await run_in_threadpool(upload.write, chunk)
+        staged = await run_in_threadpool(upload.finish)
+    except AssetTooLarge as e:
+        upload.discard()
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        upload.discard()
+        raise HTTPException(status_code=415, detail=str(e))
+    except BaseException:
+        upload.discard()
+        raise
+    try:
+        return await run_in_threadpool(AssetService(db, storage).attach, event_id, poster_id, staged, filename)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+# ------------------ DOWNLOAD (Range supported) ------------------
+@router.get("/posters/{poster_id}/asset")
+def get_poster_asset(
+    poster_id: int,
+    if_none_match: Optional[str] = Header(None),
+    user_id: str = Depends(get_active_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_db),
+):
+    return _serve(db, event_id, int(user_id), poster_id, "original", if_none_match)
+
+# ------------------ THUMBNAIL / PREVIEW ------------------
+@router.get("/posters/{poster_id}/asset/{rendition}")
+def get_poster_rendition(
+    poster_id: int,
+    rendition: Literal["thumbnail", "preview"],
+    if_none_match: Optional[str] = Header(None),
+    user_id: str = Depends(get_active_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_db),
+):
+    return _serve(db, event_id, int(user_id), poster_id, rendition, if_none_match)
+
+
+def _serve(db: Session, event_id: int, user_id: int, poster_id: int, rendition: str, if_none_match: Optional[str]):
+    # `db` is the primary: a replica may not have the file just uploaded or replaced, nor its finished
+    # renders, and the one-row lookup is cheap next to sending the file
+    # Judges get the files of their own posters, admins every file
+    judge_id = None if AuthService(db).is_admin(user_id) else user_id
+    try:
+        asset = AssetService(db).get(event_id, poster_id, judge_id=judge_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if rendition == "original":
+        sha256, media_type, filename = asset.sha256, asset.content_type, asset.filename
+    else:
+        sha256, media_type, filename = getattr(asset, f"{rendition}_sha256"), "image/jpeg", f"{poster_id}-{rendition}.jpg"
+        if sha256 is None:
+            raise HTTPException(status_code=404, detail=f"No {rendition} ({asset.render_status})")
+
+    # Content-addressed: the hash is a strong validator
+    headers = {"ETag": f'"{sha256}"', "Cache-Control": ASSET_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    storage = get_asset_storage()
+    url = storage.url(blob_key(sha256), filename, media_type)
+    if url is not None:
+        return RedirectResponse(url, status_code=307, headers={"Cache-Control": "no-store"})
+    # Served from disk in chunks (or with zero-copy pathsend where the server supports it), with Range support
+    return FileResponse(storage.local_path(blob_key(sha256)), media_type=media_type, filename=filename,
+                        content_disposition_type="inline", headers=headers)
@@ -3,11 +3,15 @@ from pydantic import BaseModel
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi import Depends, Request, Response
 from jose import jwt, JWTError
-from app.schemas.user import UserCreate, UserRead, LoginRequest
+from app.schemas.user import UserCreate, UserRead, LoginRequest, LoginResponse, BulkInviteRequest
 from app.models.core_db import get_db
 from app.services.auth_service import AuthService
 from sqlalchemy.orm import Session
 from app.utils.jwt_util import issue_tokens, refresh_token, delete_refresh_cookie, REFRESH_TOKEN
+from app.utils.email_util import send_judge_invitations
+from app.api.v1.dependencies import get_admin_subject
+from fastapi.responses import StreamingResponse
+import json
 
 import logging
 logger = logging.getLogger()
@@ -15,7 +19,7 @@ logger = logging.getLogger()
     
 router = APIRouter()
 
-@router.post("/register")
+@router.post("/register", response_model=UserRead)
 async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     service = AuthService(db)
     try:
@@ -23,6 +27,38 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+INVITE_PROGRESS_EVERY = 25  # emit a progress line every N emails
+
+@router.post("/invitations")
+def invite_judges(
+    invite_request: BulkInviteRequest,
+    admin_id: str = Depends(get_admin_subject),
+    db: Session = Depends(get_db),
+):
+    """Create judge accounts in bulk and stream email progress back as NDJSON."""
+    service = AuthService(db)
+    try:
+        users, skipped = service.bulk_invite(invite_request.invites)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def progress():
+        total = len(users)
+        yield json.dumps({"created": total, "skipped": skipped}) + "\n"
+        sent, failed = 0, []
+        invitations = ((user.email, user.magic_link_token, user.first_name) for user in users)
+        for count, (receiver, ok) in enumerate(send_judge_invitations(invitations), start=1):
+            if ok:
+                sent += 1
+            else:
+                failed.append(receiver)
+            if count % INVITE_PROGRESS_EVERY == 0 and count < total:
+                yield json.dumps({"sent": sent, "failed": len(failed), "total": total}) + "\n"
+        yield json.dumps({"sent": sent, "failed": failed, "total": total, "done": True}) + "\n"
+
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
+
 class MagicLinkRequest(BaseModel):
     email: str
 
@@ -38,7 +74,7 @@ async def magic_link(magic_link_request: MagicLinkRequest, db: Session = Depends
 class VerifyRequest(BaseModel):
     token: str
 
-@router.post("/verify", response_model=UserRead)
+@router.post("/verify", response_model=LoginResponse)
 async def verify(verify_request: VerifyRequest, db: Session = Depends(get_db)):
     print("=== VERIFY DEBUG ===")
     print(f"Received token: {verify_request.token}")
@@ -49,11 +85,10 @@ async def verify(verify_request: VerifyRequest, db: Session = Depends(get_db)):
         print(f"Verification error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     
-    user_read_json = user_read.model_dump(mode="json")
-    return issue_tokens(str(user_read.id), user_read.email, user_read_json)
+    return issue_tokens(str(user_read.id), user_read.email, user_read)
 
 
-@router.post("/login")
+@router.post("/login", response_model=LoginResponse)
 async def login(user_data: LoginRequest, db: Session = Depends(get_db)):
     service = AuthService(db)
     try:
@@ -61,11 +96,10 @@ async def login(user_data: LoginRequest, db: Session = Depends(get_db)):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    user_read_json = user_read.model_dump(mode="json")
-    return issue_tokens(str(user_read.id), user_read.email, user_read_json)
+    return issue_tokens(str(user_read.id), user_read.email, user_read)
     
 
-@router.post("/refresh")
+@router.post("/refresh", response_model=LoginResponse)
 async def refresh(request: Request, resp: Response):
     print("=== REFRESH DEBUG ===")
     print(f"Request URL: {request.url}")
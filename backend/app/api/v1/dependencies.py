@@ -0,0 +1,66 @@
+from typing import Any, Callable, Hashable, Optional
+from fastapi import Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from app.cache.single_flight import SingleFlight
+from app.models.core_db import get_db, session_factory_for
+from app.services.activity_service import activity_recorder
+from app.services.auth_service import AuthService
+from app.services.event_service import EventService
+from app.utils.jwt_util import get_token_subject
+
+
+def get_admin_subject(user_id: str = Depends(get_token_subject), db: Session = Depends(get_db)):
+    """Token subject of the caller, provided the caller holds the admin role."""
+    if not AuthService(db).is_admin(int(user_id)):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user_id
+
+
+def get_active_subject(user_id: str = Depends(get_token_subject)) -> str:
+    """Token subject of the caller, noting that the caller was just active (written behind)."""
+    activity_recorder.record(int(user_id))
+    return user_id
+
+
+def get_event_id(event_id: Optional[int] = Query(None), db: Session = Depends(get_db)) -> int:
+    """Event the request is scoped to: the `event_id` query parameter, else the active event."""
+    if event_id is not None:
+        return event_id
+    current_event_id = EventService(db).current_event_id()
+    if current_event_id is None:
+        raise HTTPException(status_code=404, detail="No active event")
+    return current_event_id
+
+
+# Reads shared among identical concurrent requests in this worker
+read_flights = SingleFlight("reads")
+
+
+class Coalescer:
+    """Runs a read through `read_flights`, keyed by the request's route, query parameters and caller."""
+
+    def __init__(self, scope: Hashable):
+        self.scope = scope
+
+    async def run(self, func: Callable[..., Any], *args, db: Session, key: Hashable = ()) -> Any:
+        """
+        Result of `func(session, *args)`, shared with concurrent requests in the same scope and
+        with the same key. The read gets its own session on the same database as `db`.
+        """
+        return await read_flights.do((self.scope, key), func, *args, session_factory=session_factory_for(db))
+
+
+def get_coalescer(
+    request: Request,
+    user_id: str = Depends(get_active_subject),
+    event_id: int = Depends(get_event_id),
+) -> Coalescer:
+    """Coalescer for a read-only endpoint; requests share reads only with the same caller, event and parameters."""
+    route = request.scope.get("route")
+    return Coalescer((
+        request.method,
+        route.path if route is not None else request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        user_id,
+        event_id,
+    ))
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+from sqlalchemy.orm import Session
+from app.api.v1.dependencies import get_admin_subject
+from app.models.core_db import get_db, get_read_db
+from app.schemas.event import EventCreate, EventRead
+from app.services.event_service import EventService
+from app.utils.jwt_util import get_token_subject
+
+router = APIRouter()
+
+# ------------------ READ ------------------
+@router.get("/events", response_model=List[EventRead])
+async def list_events(
+    user_id: str = Depends(get_token_subject),
+    db: Session = Depends(get_read_db),
+):
+    return EventService(db).list_events()
+
+# ------------------ CREATE ------------------
+@router.post("/events", response_model=EventRead)
+async def create_event(
+    event_data: EventCreate,
+    admin_id: str = Depends(get_admin_subject),
+    db: Session = Depends(get_db),
+):
+    return EventService(db).create_event(event_data)
+
+# ------------------ ACTIVATE ------------------
+@router.post("/events/{event_id}/activate", response_model=EventRead)
+async def activate_event(
+    event_id: int,
+    admin_id: str = Depends(get_admin_subject),
+    db: Session = Depends(get_db),
+):
+    try:
+        return EventService(db).activate_event(event_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,50 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.api.v1.dependencies import get_admin_subject
+from app.models.core_db import get_read_db
+from app.services.export_service import ExportService, ExportFormat, MEDIA_TYPES, SCORE_COLUMNS, RANKING_COLUMNS
+
+router = APIRouter()
+
+
+def _export_response(rows, columns, export_format: ExportFormat, filename: str, service: ExportService):
+    try:
+        body = service.encode(rows, columns, export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # No Content-Length is set, so the body goes out with chunked transfer encoding
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+# ------------------ SCORES ------------------
+@router.get("/exports/scores")
+def export_scores(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    event_id: Optional[int] = Query(None),
+    session: Optional[str] = Query(None),
+    judge_id: Optional[int] = Query(None),
+    admin_id: str = Depends(get_admin_subject),
+    db: Session = Depends(get_read_db),
+):
+    service = ExportService(db)
+    rows = service.score_rows(event_id=event_id, judge_id=judge_id, session=session)
+    return _export_response(rows, SCORE_COLUMNS, format, "scores", service)
+
+# ------------------ RANKINGS ------------------
+@router.get("/exports/rankings")
+def export_rankings(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    event_id: Optional[int] = Query(None),
+    session: Optional[str] = Query(None),
+    judge_id: Optional[int] = Query(None),
+    admin_id: str = Depends(get_admin_subject),
+    db: Session = Depends(get_read_db),
+):
+    service = ExportService(db)
+    rows = service.ranking_rows(event_id=event_id, judge_id=judge_id, session=session)
+    return _export_response(rows, RANKING_COLUMNS, format, "rankings", service)
@@ -0,0 +1,23 @@
+import os
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from dotenv import load_dotenv
+from app.utils.metrics_util import metrics
+
+load_dotenv()
+# Scrapers authenticate with this static bearer token; without it the endpoint stays disabled
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+router = APIRouter()
+
+
+# ------------------ METRICS (Prometheus text format) ------------------
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics(authorization: Optional[str] = Header(None)):
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Missing or invalid token")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
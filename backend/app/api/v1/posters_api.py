@@ -1,86 +1,151 @@
 # authenticate.py
 import os
-from pydantic import BaseModel
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List
-from app.utils.jwt_util import get_token_subject
+import re
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
+from fastapi.responses import JSONResponse
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.core_db import get_db, get_read_db
+from app.schemas.poster import PosterUpdate, PosterPage, PosterDeleted, ScoreBatch, ScoreBatchResult, PosterSearchResult
+from app.services.poster_service import BatchConflict, PosterService, VersionConflict
+from app.services.search_service import PosterSearchService
+from app.services.auth_service import AuthService
+from app.api.v1.dependencies import Coalescer, get_active_subject, get_coalescer, get_event_id
+from app.utils.etag_util import make_etag, etag_matches
 from dotenv import load_dotenv
 
 load_dotenv()
 
 router = APIRouter()
 
-# Example data
-class Poster(BaseModel):
-    id: int
-    title: str
-    author: str
-    score: float
-
-fake_db = {
-    "1": [
-        Poster(id=1, title="01 Neural Networks in C. elegans", author="Alice", score=95.5),
-        Poster(id=2, title="02 Autophagy Pathways", author="Bob", score=88.0),
-        Poster(id=3, title="03 Mitochondrial Stress", author="Charlie", score=92.3),
-        Poster(id=4, title="04 Neural Networks in C. elegans", author="Alice", score=95.5),
-        Poster(id=5, title="05 Autophagy Pathways", author="Bob", score=88.0),
-        Poster(id=6, title="06 Mitochondrial Stress", author="Charlie", score=92.3),
-        Poster(id=7, title="07 Neural Networks in C. elegans", author="Alice", score=95.5),
-        Poster(id=8, title="08 Autophagy Pathways", author="Bob", score=88.0),
-        Poster(id=9, title="09 Mitochondrial Stress", author="Charlie", score=92.3),
-        Poster(id=10, title="10 Neural Networks in C. elegans", author="Alice", score=95.5),
-        Poster(id=11, title="11 Autophagy Pathways", author="Bob", score=88.0),
-        Poster(id=12, title="12 Mitochondrial Stress", author="Charlie", score=92.3),
-    ],
-    "4": [
-        Poster(id=1, title="xxxNeural Networks in C. elegans", author="Alice", score=95.5),
-        Poster(id=2, title="xxxAutophagy Pathways", author="Bob", score=88.0),
-        Poster(id=3, title="xxxMitochondrial Stress", author="Charlie", score=92.3),
-    ],
-}
+# Clients may keep a copy but must revalidate it (If-None-Match) before each use
+POSTERS_CACHE_CONTROL = "private, no-cache"
 
 # ------------------ READ (GET with pagination) ------------------
-@router.get("/posters")
+@router.get("/posters", response_model=PosterPage)
 async def get_posters(
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1),
-    user_id: str = Depends(get_token_subject),
+    if_none_match: Optional[str] = Header(None),
+    user_id: str = Depends(get_active_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
+    coalescer: Coalescer = Depends(get_coalescer),
 ):
-    posters = fake_db.get(user_id, [])
-    total = len(posters)
+    # The version is read before the page, and cached pages are keyed by it, so a concurrent write
+    # can only make the ETag stale, never wrong
+    service = PosterService(db)
+    version = service.version(event_id, int(user_id))
+    etag = make_etag(event_id, user_id, version, page, limit)
+    cache_headers = {"ETag": etag, "Cache-Control": POSTERS_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers)
 
-    start = (page - 1) * limit
-    end = start + limit
-    paginated = posters[start:end]
+    # A replica serves the page only once it has replayed the judge's latest write (read-your-writes)
+    if read_db.info.get("replica") and PosterService(read_db).version(event_id, int(user_id)) == version:
+        service = PosterService(read_db)
+    # Identical concurrent requests share one read; the version in the key keeps requests made after a write out of older reads
+    paginated, total = await coalescer.run(
+        lambda flight_db: PosterService(flight_db).list_posters(event_id, int(user_id), page, limit, version),
+        db=service.db, key=version,
+    )
 
+    response.headers.update(cache_headers)
     return {"data": paginated, "total": total}
 
+# ------------------ SEARCH ------------------
+@router.get("/posters/search", response_model=PosterSearchResult)
+async def search_posters(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    user_id: str = Depends(get_active_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_read_db),
+):
+    # Judges search their own posters, admins search every poster
+    judge_id = None if AuthService(db).is_admin(int(user_id)) else int(user_id)
+    hits = PosterSearchService(db).search(q, event_id, judge_id=judge_id, limit=limit)
+    return {"query": q, "data": hits}
+
+# ------------------ BATCH SCORES (POST) ------------------
+@router.post("/posters/scores/batch", response_model=ScoreBatchResult)
+async def submit_score_batch(
+    batch: ScoreBatch,
+    user_id: str = Depends(get_active_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_db),
+):
+    service = PosterService(db)
+    try:
+        results = service.apply_score_batch(event_id, int(user_id), batch.changes)
+    except BatchConflict as e:
+        # Every change carries an idempotency key, so resending the batch is safe
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"results": results}
+
 # ------------------ UPDATE (PUT) ------------------
-@router.put("/posters/{poster_id}")
+@router.put("/posters/{poster_id}", response_model=PosterPage)
 async def update_poster(
     poster_id: int,
-    updated: Poster,
-    user_id: str = Depends(get_token_subject),
+    updated: PosterUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    user_id: str = Depends(get_active_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_db),
 ):
-    posters = fake_db.get(user_id, [])
-    for i, poster in enumerate(posters):
-        if poster.id == poster_id:
-            fake_db[user_id][i] = updated
-            # Return full paginated data after update
-            total = len(posters)
-            return {"data": fake_db[user_id], "total": total}
-    raise HTTPException(status_code=404, detail="Poster not found")
+    # If-Match: "<poster id>.<version>" makes the update conditional, as does a `version` in the body
+    # (clients that cannot set headers); without either the last write wins
+    expected_version = _if_match_version(if_match, poster_id)
+    if expected_version is not None:
+        updated = updated.model_copy(update={"version": expected_version})
+    service = PosterService(db)
+    try:
+        poster = service.update_poster(event_id, int(user_id), poster_id, updated)
+    except VersionConflict as e:
+        return JSONResponse(
+            status_code=409,
+            content={"detail": str(e), "current": e.current.model_dump(mode="json")},
+            headers={"ETag": poster_etag(e.current.id, e.current.version)},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    response.headers["ETag"] = poster_etag(poster.id, poster.version)
+    # Return full paginated data after update
+    posters = service.all_posters(event_id, int(user_id))
+    return {"data": posters, "total": len(posters)}
 
 # ------------------ DELETE ------------------
-@router.delete("/posters/{poster_id}")
+@router.delete("/posters/{poster_id}", response_model=PosterDeleted)
 async def delete_poster(
     poster_id: int,
-    user_id: str = Depends(get_token_subject),
+    user_id: str = Depends(get_active_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_db),
 ):
-    posters = fake_db.get(user_id, [])
-    for i, poster in enumerate(posters):
-        if poster.id == poster_id:
-            deleted = fake_db[user_id].pop(i)
-            total = len(fake_db[user_id])
-            return {"data": fake_db[user_id], "total": total, "deleted": deleted}
-    raise HTTPException(status_code=404, detail="Poster not found")
\ No newline at end of file
+    service = PosterService(db)
+    try:
+        deleted = service.delete_poster(event_id, int(user_id), poster_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    posters = service.all_posters(event_id, int(user_id))
+    return {"data": posters, "total": len(posters), "deleted": deleted}
+
+
+def poster_etag(poster_id: int, version: int) -> str:
+    return make_etag(poster_id, version)
+
+
+def _if_match_version(if_match: Optional[str], poster_id: int) -> Optional[int]:
+    """Version an If-Match header requires, or None when any version will do."""
+    if not if_match or if_match.strip() == "*":
+        return None
+    for candidate in if_match.split(","):
+        # The poster's ETag names its version, whatever the encoding: the W/ that
+        # CompressionMiddleware adds to compressed responses is ignored
+        match = re.fullmatch(rf'(?:W/)?"{poster_id}\.(\d+)"', candidate.strip())
+        if match:
+            return int(match.group(1))
+    return 0  # no poster is ever at version 0, so the update conflicts
@@ -0,0 +1,35 @@
+import os
+from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from dotenv import load_dotenv
+from app.api.v1.dependencies import get_admin_subject
+from app.utils.jwt_util import TokenType, create_token
+from app.utils.profiling_util import report_path
+
+load_dotenv()
+PROFILE_TOKEN_EXPIRE_MINUTES = int(os.getenv("PROFILE_TOKEN_EXPIRE_MINUTES", "10"))
+
+router = APIRouter()
+
+
+# ------------------ PROFILE TOKEN ------------------
+@router.post("/profiling/token")
+def issue_profile_token(admin_id: str = Depends(get_admin_subject)):
+    """Token that has requests sent with it in the X-Profile-Token header profiled."""
+    token = create_token(
+        subject=admin_id,
+        email="",
+        expires_delta=timedelta(minutes=PROFILE_TOKEN_EXPIRE_MINUTES),
+        token_type=TokenType.PROFILE,
+    )
+    return {"profile_token": token, "expires_in": PROFILE_TOKEN_EXPIRE_MINUTES * 60}
+
+# ------------------ REPORTS ------------------
+@router.get("/profiling/reports/{report_id}")
+def get_profile_report(report_id: str, admin_id: str = Depends(get_admin_subject)):
+    path = report_path(report_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile report not found")
+    media_type = "text/html" if path.endswith(".html") else "text/plain"
+    return FileResponse(path, media_type=media_type)
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.api.v1.dependencies import get_admin_subject, get_event_id
+from app.models.core_db import get_db, get_read_db
+from app.schemas.poster import ScoreEventRead, ScoreReplay
+from app.services.poster_service import PosterService, ScoreLogBehind
+from app.services.score_log_service import ScoreLogService
+
+router = APIRouter()
+
+
+# ------------------ HISTORY ------------------
+@router.get("/scores/history/{poster_id}", response_model=List[ScoreEventRead])
+def get_score_history(
+    poster_id: int,
+    admin_id: str = Depends(get_admin_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_read_db),
+):
+    """Every change of the poster's score, oldest first."""
+    return ScoreLogService(db).history(event_id, poster_id)
+
+# ------------------ REPLAY ------------------
+@router.get("/scores/replay", response_model=ScoreReplay)
+def replay_scores(
+    at: Optional[datetime] = Query(None),
+    admin_id: str = Depends(get_admin_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_read_db),
+):
+    """Scores and aggregates rebuilt from the log, as of `at` (default now)."""
+    state = ScoreLogService(db).replay(event_id, until=at)
+    return {"as_of": state.through_at, "events": state.event_count, **state.aggregates(), "scores": state.scores()}
+
+# ------------------ REBUILD ------------------
+@router.post("/scores/rebuild")
+def rebuild_scores(
+    at: Optional[datetime] = Query(None),
+    confirm: bool = Query(False),
+    admin_id: str = Depends(get_admin_subject),
+    event_id: int = Depends(get_event_id),
+    db: Session = Depends(get_db),
+):
+    """Resets the posters' scores to their values replayed from the log as of `at`."""
+    # Overwrites every score in the event: never by accident, e.g. a bare POST
+    if at is None and not confirm:
+        raise HTTPException(status_code=400, detail="Pass `at`, or `confirm=true` to rebuild from the whole log")
+    try:
+        updated = PosterService(db).rebuild_scores(event_id, int(admin_id), until=at)
+    except ScoreLogBehind as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"updated": updated}
@@ -0,0 +1,17 @@
+from .bus import LocalInvalidationBus, RedisInvalidationBus, get_invalidation_bus
+from .local import LocalCache, clear_all_caches
+from .remote import RedisCacheStore, get_cache_store
+from .single_flight import SingleFlight
+from .tiered import TieredCache
+
+__all__ = [
+    LocalInvalidationBus,
+    RedisInvalidationBus,
+    get_invalidation_bus,
+    LocalCache,
+    clear_all_caches,
+    RedisCacheStore,
+    get_cache_store,
+    TieredCache,
+    SingleFlight,
+]
@@ -0,0 +1,107 @@
+# cache/bus.py
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Callable, Iterable, Optional
+from dotenv import load_dotenv
+
+try:
+    import redis
+except ImportError:  # only needed when CACHE_BUS_URL points at a Redis server
+    redis = None
+
+load_dotenv()
+CACHE_BUS_URL = os.getenv("CACHE_BUS_URL", "")
+CACHE_BUS_CHANNEL = os.getenv("CACHE_BUS_CHANNEL", "judging-app:cache-invalidation")
+
+logger = logging.getLogger(__name__)
+
+# Receives the keys and tags to evict
+Subscriber = Callable[[list[str], list[str]], None]
+
+
+class LocalInvalidationBus:
+    """
+    In-process invalidation bus: publishing evicts from this process's caches only.
+    Used when a single process serves the app, and in tests.
+    """
+
+    def __init__(self):
+        self._subscribers: list[Subscriber] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+    def publish(self, keys: Iterable[str] = (), tags: Iterable[str] = ()) -> None:
+        self._deliver(list(keys), list(tags))
+
+    def close(self) -> None:
+        pass
+
+    def _deliver(self, keys: list[str], tags: list[str]) -> None:
+        if not keys and not tags:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber(keys, tags)
+            except Exception:
+                logger.exception("Cache invalidation subscriber failed")
+
+
+class RedisInvalidationBus(LocalInvalidationBus):
+    """
+    Invalidation bus shared by every worker and node through a Redis pub/sub channel.
+
+    Local caches are evicted synchronously on publish; the message then reaches the
+    other processes through a listener thread, which ignores this process's own messages.
+    """
+
+    def __init__(self, url: str = CACHE_BUS_URL, channel: str = CACHE_BUS_CHANNEL, client=None):
+        if redis is None:
+            raise RuntimeError("CACHE_BUS_URL requires the redis package to be installed")
+        super().__init__()
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._client = client or redis.Redis.from_url(url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{channel: self._on_message})
+        self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, keys: Iterable[str] = (), tags: Iterable[str] = ()) -> None:
+        keys, tags = list(keys), list(tags)
+        self._deliver(keys, tags)
+        message = json.dumps({"origin": self.origin, "keys": keys, "tags": tags})
+        try:
+            self._client.publish(self.channel, message)
+        except redis.RedisError:
+            # Other workers keep their entries until they expire (caches are TTL-bounded)
+            logger.exception("Could not publish cache invalidation")
+
+    def close(self) -> None:
+        self._listener.stop()
+        self._pubsub.close()
+        self._client.close()
+
+    def _on_message(self, message) -> None:
+        payload = json.loads(message["data"])
+        if payload.get("origin") != self.origin:
+            self._deliver(payload.get("keys", []), payload.get("tags", []))
+
+
+_bus: Optional[LocalInvalidationBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_invalidation_bus() -> LocalInvalidationBus:
+    """Process-wide bus: Redis pub/sub when CACHE_BUS_URL is set, in-process otherwise."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = RedisInvalidationBus(CACHE_BUS_URL) if CACHE_BUS_URL else LocalInvalidationBus()
+        return _bus
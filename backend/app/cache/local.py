@@ -0,0 +1,93 @@
+# cache/local.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+from app.cache.bus import LocalInvalidationBus, get_invalidation_bus
+
+_MISSING = object()
+
+# Every LocalCache created, so tests can start from empty caches
+_registry: list["LocalCache"] = []
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with a per-entry TTL and tags.
+
+    Entries are evicted by key or by tag when a message arrives on the invalidation
+    bus, so a write on any worker clears the matching entries on every worker. The TTL
+    bounds staleness if a message is ever lost.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60.0, bus: Optional[LocalInvalidationBus] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        (bus or get_invalidation_bus()).subscribe(self._on_invalidate)
+        _registry.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        key = str(key)
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        key, tags = str(key), tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def evict(self, keys: Iterable[str] = (), tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            for key in keys:
+                self._remove(str(key))
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _on_invalidate(self, keys: list[str], tags: list[str]) -> None:
+        self.evict(keys, tags)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            tagged = self._tags.get(tag)
+            if tagged is not None:
+                tagged.discard(key)
+                if not tagged:
+                    del self._tags[tag]
+
+
+def clear_all_caches() -> None:
+    for cache in _registry:
+        cache.clear()
@@ -0,0 +1,124 @@
+# cache/remote.py
+import logging
+import os
+import threading
+import uuid
+from typing import Iterable, Optional
+from dotenv import load_dotenv
+
+try:
+    import redis
+except ImportError:  # only needed when CACHE_STORE_URL points at a Redis server
+    redis = None
+
+load_dotenv()
+# Redis-protocol server (Redis, Valkey, KeyDB...) shared by all workers; empty keeps caches in-process only
+CACHE_STORE_URL = os.getenv("CACHE_STORE_URL", "")
+CACHE_STORE_PREFIX = os.getenv("CACHE_STORE_PREFIX", "judging-app:cache:")
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCacheStore:
+    """
+    Second cache tier, shared by every worker and node.
+
+    Stores entries already serialized by the caller (as JSON, never pickle: anyone who
+    can write to the server must not be able to run code in the workers). Each tag is
+    a Redis set of the keys carrying it, so evicting a tag deletes every one of them.
+    Redis errors are logged and treated as misses: the in-process tier and the
+    database keep serving.
+    """
+
+    def __init__(self, url: str = CACHE_STORE_URL, prefix: str = CACHE_STORE_PREFIX, client=None):
+        if client is None and redis is None:
+            raise RuntimeError("CACHE_STORE_URL requires the redis package to be installed")
+        self.prefix = prefix
+        self._client = client or redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Entry stored under `key`, or None."""
+        try:
+            return self._client.get(self.prefix + key)
+        except redis.RedisError:
+            logger.exception("Cache store read failed")
+            return None
+
+    def set(self, key: str, data: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        """Stores `data` under `key` for `ttl` seconds, evicted along with any of `tags`."""
+        ttl_ms = int(ttl * 1000)
+        try:
+            with self._client.pipeline() as pipe:
+                pipe.set(self.prefix + key, data, px=ttl_ms)
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), key)
+                    # The tag outlives its newest entry; stale members only cost a no-op DEL
+                    pipe.pexpire(self._tag_key(tag), ttl_ms, gt=True)
+                    pipe.pexpire(self._tag_key(tag), ttl_ms, nx=True)
+                pipe.execute()
+        except redis.RedisError:
+            logger.exception("Cache store write failed")
+
+    def evict(self, keys: Iterable[str] = (), tags: Iterable[str] = ()) -> None:
+        try:
+            doomed = [self.prefix + key for key in keys]
+            for tag in tags:
+                doomed.extend(self.prefix + key.decode() for key in self._client.smembers(self._tag_key(tag)))
+                doomed.append(self._tag_key(tag))
+            if doomed:
+                self._client.delete(*doomed)
+        except redis.RedisError:
+            # Entries elsewhere expire on their own (every entry has a TTL)
+            logger.exception("Cache store eviction failed")
+
+    def acquire(self, key: str, ttl: float) -> Optional[str]:
+        """Token of a short lock on `key` (one loader across workers), or None when another worker holds it."""
+        token = uuid.uuid4().hex
+        try:
+            return token if self._client.set(self._lock_key(key), token, nx=True, px=int(ttl * 1000)) else None
+        except redis.RedisError:
+            logger.exception("Cache store lock failed")
+            return token  # without the store, every worker loads on its own
+
+    def release(self, key: str, token: str) -> None:
+        lock_key = self._lock_key(key)
+        try:
+            with self._client.pipeline() as pipe:
+                # Deleted only while still ours: after its TTL another worker may hold it
+                pipe.watch(lock_key)
+                if pipe.get(lock_key) == token.encode():
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+        except redis.RedisError:
+            logger.exception("Cache store unlock failed")
+
+    def close(self) -> None:
+        self._client.close()
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}lock:{key}"
+
+
+_store: Optional[RedisCacheStore] = None
+_store_lock = threading.Lock()
+
+
+def get_cache_store() -> Optional[RedisCacheStore]:
+    """Process-wide shared store when CACHE_STORE_URL is set, otherwise None."""
+    global _store
+    if not CACHE_STORE_URL:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = RedisCacheStore(CACHE_STORE_URL)
+        return _store
@@ -0,0 +1,54 @@
+# cache/single_flight.py
+import asyncio
+from typing import Any, Callable, Hashable, Optional
+from starlette.concurrency import run_in_threadpool
+from app.utils.metrics_util import metrics
+
+metrics.describe("single_flight_calls", "counter", "Coalesced reads by role (leader ran the read, shared waited on it)")
+
+
+class SingleFlight:
+    """
+    Shares one in-flight computation among concurrent callers with the same key.
+
+    The first caller (the leader) runs the blocking function in the threadpool; callers
+    that arrive with the same key while it runs await the same result instead of
+    repeating the work. Nothing is kept once the computation finishes, so this never
+    serves a result computed before the caller arrived (callers fold versions into the
+    key when they must not join a read that started before a write).
+
+    A read that needs the database gets a session of its own from `session_factory`,
+    open for exactly as long as the read: the leader's request session is closed when
+    the leader's request ends (or its client goes away), while others still wait.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[..., Any], *args,
+                 session_factory: Optional[Callable[[], Any]] = None) -> Any:
+        """Result of `func(*args)`, or of `func(session, *args)` with a session from `session_factory`."""
+        call = self._calls.get(key)
+        if call is None:
+            metrics.inc("single_flight_calls", flight=self.name, role="leader")
+            if session_factory is not None:
+                func, args = _with_session, (session_factory, func, *args)
+            call = asyncio.ensure_future(run_in_threadpool(func, *args))
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            metrics.inc("single_flight_calls", flight=self.name, role="shared")
+        # A caller that goes away must not cancel the read for the others
+        return await asyncio.shield(call)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+def _with_session(session_factory: Callable[[], Any], func: Callable[..., Any], *args) -> Any:
+    session = session_factory()
+    try:
+        return func(session, *args)
+    finally:
+        session.close()
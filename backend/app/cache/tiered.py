@@ -0,0 +1,144 @@
+# cache/tiered.py
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable, Iterable, Optional
+from pydantic import TypeAdapter, ValidationError
+from app.cache.bus import LocalInvalidationBus, get_invalidation_bus
+from app.cache.local import LocalCache
+from app.cache.remote import RedisCacheStore, get_cache_store
+from app.utils.metrics_util import metrics
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+metrics.describe("cache_requests", "counter", "Cache lookups by cache and outcome (local_hit, remote_hit, miss)")
+metrics.describe("cache_loads", "counter", "Values computed by the loader after a miss")
+metrics.describe("cache_load_waits", "counter", "Misses served by waiting for another worker's load")
+
+
+class TieredCache:
+    """
+    Bounded in-process LRU/TTL tier in front of an optional shared Redis-protocol tier.
+
+    Reads try this process first, then the shared store (refilling this process).
+    `invalidate` evicts keys and tags from the shared store and, through the
+    invalidation bus, from every worker's in-process tier.
+
+    `get_or_load` protects against stampedes: in a process, one thread per key runs
+    the loader while the others wait for it; across workers, a short lock in the store
+    lets one worker load while the rest poll the store for the result. A load that
+    races a write can cache the old value, so callers either publish after commit (the
+    entry is evicted again) or accept staleness up to the TTL.
+
+    Values are stored in the shared tier as JSON of `value_type` and validated back
+    into it when read, so e.g. pydantic models come back as models.
+    """
+    LOCK_SECONDS = 5.0
+    WAIT_SECONDS = 2.0
+    POLL_SECONDS = 0.02
+    STRIPES = 64
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60.0, remote_ttl: Optional[float] = None,
+                 store: Optional[RedisCacheStore] = None, bus: Optional[LocalInvalidationBus] = None,
+                 value_type: Any = Any):
+        self.name = name
+        self.remote_ttl = remote_ttl if remote_ttl is not None else ttl
+        self._bus = bus or get_invalidation_bus()
+        self.local = LocalCache(name, maxsize=maxsize, ttl=ttl, bus=self._bus)
+        self.store = store if store is not None else get_cache_store()
+        self._codec = TypeAdapter(tuple[value_type, tuple[str, ...]])
+        # Striped so concurrent loads of different keys rarely wait on each other
+        self._load_locks = [threading.Lock() for _ in range(self.STRIPES)]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        key = str(key)
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            metrics.inc("cache_requests", cache=self.name, outcome="local_hit")
+            return value
+        if self.store is not None:
+            entry = self._decode(self.store.get(self._remote_key(key)))
+            if entry is not None:
+                value, tags = entry
+                self.local.set(key, value, tags=tags)
+                metrics.inc("cache_requests", cache=self.name, outcome="remote_hit")
+                return value
+        metrics.inc("cache_requests", cache=self.name, outcome="miss")
+        return default
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        key, tags = str(key), tuple(tags)
+        self.local.set(key, value, tags=tags)
+        if self.store is not None:
+            self.store.set(self._remote_key(key), self._codec.dump_json((value, tags)), self.remote_ttl, tags=tags)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], tags: Iterable[str] = ()) -> Any:
+        """Cached value of `key`, computing it with `loader()` once on a miss."""
+        key = str(key)
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._load_locks[hash(key) % self.STRIPES]:
+            # Another thread may have loaded it while this one waited
+            value = self.local.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            if self.store is None:
+                return self._load(key, loader, tags)
+            token = self.store.acquire(self._remote_key(key), self.LOCK_SECONDS)
+            if token is None:
+                value = self._wait_for_load(key)
+                if value is not _MISSING:
+                    metrics.inc("cache_load_waits", cache=self.name)
+                    return value
+                return self._load(key, loader, tags)  # the other worker is too slow or died
+            try:
+                return self._load(key, loader, tags)
+            finally:
+                self.store.release(self._remote_key(key), token)
+
+    def invalidate(self, keys: Iterable[Hashable] = (), tags: Iterable[str] = ()) -> None:
+        """Evicts keys and tags everywhere. Call after the write commits, so no worker reloads the old rows."""
+        keys, tags = [str(key) for key in keys], list(tags)
+        if self.store is not None:
+            self.store.evict([self._remote_key(key) for key in keys], tags)
+        self._bus.publish(keys=keys, tags=tags)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _load(self, key: str, loader: Callable[[], Any], tags: Iterable[str]) -> Any:
+        metrics.inc("cache_loads", cache=self.name)
+        value = loader()
+        self.set(key, value, tags)
+        return value
+
+    def _wait_for_load(self, key: str) -> Any:
+        deadline = time.monotonic() + self.WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(self.POLL_SECONDS)
+            entry = self._decode(self.store.get(self._remote_key(key)))
+            if entry is not None:
+                value, tags = entry
+                self.local.set(key, value, tags=tags)
+                return value
+        return _MISSING
+
+    def _decode(self, data: Optional[bytes]) -> Optional[tuple[Any, tuple[str, ...]]]:
+        if data is None:
+            return None
+        try:
+            return self._codec.validate_json(data)
+        except ValidationError:
+            # Written by another version of the app, or not by it at all: a miss
+            logger.warning("Ignoring unreadable %s cache entry", self.name)
+            return None
+
+    def _remote_key(self, key: str) -> str:
+        return f"{self.name}:{key}"
@@ -1,16 +1,28 @@
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import debugpy
 import logging
-from app.api.v1 import auth_api, posters_api
+from app.api.v1 import auth_api, events_api, posters_api, assets_api, exports_api, metrics_api, profiling_api, scores_api
+from app.services.activity_service import activity_recorder
+from app.services.asset_service import asset_renderer
+from app.services.housekeeping_service import HousekeepingService
+from app.services.score_log_service import ScoreLogService, score_log
+from app.services.scheduler_service import JobScheduler, SCHEDULER_ENABLED
+from app.utils.compression_util import CompressionMiddleware
+from app.utils.profiling_util import ProfilingMiddleware, PROFILING_ENABLED
+from app.utils.tracing_util import setup_tracing
+from app.utils.query_util import QueryStatsMiddleware
+from app.models.core_db import engine, replica_set
 
 
 load_dotenv() 
 REACT_APP_URL = os.getenv("REACT_APP_URL")
 API_VERSION_STR = os.getenv("API_VERSION_STR", "/api/v1")
+HOUSEKEEPING_INTERVAL_SECONDS = float(os.getenv("HOUSEKEEPING_INTERVAL_SECONDS", "600"))
 
 logger = logging.getLogger()
 logger.setLevel(os.getenv("LOG_LEVEL", "WARNING").upper())
@@ -21,7 +33,31 @@ if ACTIVATE_DEBUG:
     debugpy.listen(("0.0.0.0", 58979))
     logger.info("Waiting for debugger to attach...")
 
-app = FastAPI()
+# Every worker runs the scheduler; a lease in the database lets only one of them run each job
+scheduler = JobScheduler()
+scheduler.add_job("clear_expired_magic_links", HOUSEKEEPING_INTERVAL_SECONDS,
+                  lambda db: HousekeepingService(db).clear_expired_magic_links())
+scheduler.add_job("delete_expired_idempotency_keys", HOUSEKEEPING_INTERVAL_SECONDS,
+                  lambda db: HousekeepingService(db).delete_expired_idempotency_keys())
+scheduler.add_job("resubmit_stale_asset_renders", HOUSEKEEPING_INTERVAL_SECONDS, asset_renderer.resubmit_stale)
+scheduler.add_job("snapshot_score_logs", HOUSEKEEPING_INTERVAL_SECONDS, lambda db: ScoreLogService(db).snapshot_due())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    activity_recorder.start()
+    score_log.start()
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+    yield
+    scheduler.stop()
+    asset_renderer.stop()
+    # Buffered activity and score events are written before the worker exits
+    activity_recorder.stop()
+    score_log.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 # CORS middleware configuration
@@ -33,10 +69,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["ETag"],  # Lets the React app revalidate cached poster pages
 )
+# Statement counts and timings per request (Server-Timing header, metrics, N+1 warnings)
+app.add_middleware(QueryStatsMiddleware)
+# Poster lists and exports compress well, and judges are often on slow conference Wi-Fi
+app.add_middleware(CompressionMiddleware)
+# Profiles requests that carry an admin's profile token (X-Profile-Token); unlike debugpy it never blocks
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 app.include_router(auth_api.router, prefix=f"{API_VERSION_STR}/auth", tags=["Authentication"])
+app.include_router(events_api.router, prefix=f"{API_VERSION_STR}", tags=["Events"])
 app.include_router(posters_api.router, prefix=f"{API_VERSION_STR}", tags=["Posters"])
+app.include_router(assets_api.router, prefix=f"{API_VERSION_STR}", tags=["Poster files"])
+app.include_router(exports_api.router, prefix=f"{API_VERSION_STR}", tags=["Exports"])
+app.include_router(metrics_api.router, tags=["Metrics"])
+app.include_router(profiling_api.router, prefix=f"{API_VERSION_STR}", tags=["Profiling"])
+app.include_router(scores_api.router, prefix=f"{API_VERSION_STR}", tags=["Score log"])
+
+# Spans for routes, SQL statements, AuthService, hashing, JWTs and SMTP, when TRACING_ENABLED is set
+setup_tracing(app, [engine, *replica_set.engines])
 
 
 
@@ -1,6 +1,21 @@
 from .base import Base
 from .user import UserModel
+from .event import EventModel
+from .poster import PosterModel
+from .idempotency_key import IdempotencyKeyModel
+from .version import VersionModel
+from .job_lock import JobLockModel
+from .poster_asset import PosterAssetModel
+from .score_event import ScoreEventModel, ScoreSnapshotModel
 
 __all__ = [
     UserModel,
+    EventModel,
+    PosterModel,
+    IdempotencyKeyModel,
+    VersionModel,
+    JobLockModel,
+    PosterAssetModel,
+    ScoreEventModel,
+    ScoreSnapshotModel,
 ]
\ No newline at end of file
@@ -1,13 +1,116 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.sql.dml import UpdateBase
+from fastapi import Depends
+from typing import Callable, Optional
+import itertools
+import logging
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from app.utils.query_util import instrument_engine
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL","")
+# Comma-separated read replica URLs; empty means every query goes to the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+MAX_REPLICA_LAG_SECONDS = float(os.getenv("MAX_REPLICA_LAG_SECONDS", "5"))
+REPLICA_CHECK_SECONDS = float(os.getenv("REPLICA_CHECK_SECONDS", "5"))
+
+logger = logging.getLogger(__name__)
+
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# ---------------------------
+# Read replicas
+# ---------------------------
+# Zero when the replica has replayed everything it received, otherwise the age of the last replayed transaction
+POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaSet:
+    """
+    Read replicas with health and lag checks.
+
+    Each replica is checked at most every REPLICA_CHECK_SECONDS; one that fails the check
+    or lags more than MAX_REPLICA_LAG_SECONDS behind the primary is left out until a
+    later check passes. Healthy replicas are handed out round-robin.
+    """
+
+    def __init__(self, engines: list[Engine], max_lag_seconds: float = MAX_REPLICA_LAG_SECONDS,
+                 check_seconds: float = REPLICA_CHECK_SECONDS):
+        self.engines = engines
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self._healthy: list[Engine] = []
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+
+    def choose(self) -> Optional[Engine]:
+        if not self.engines:
+            return None
+        if time.monotonic() - self._checked_at >= self.check_seconds and self._lock.acquire(blocking=False):
+            try:
+                self._healthy = [replica for replica in self.engines if self._lag(replica) <= self.max_lag_seconds]
+                self._checked_at = time.monotonic()
+            finally:
+                self._lock.release()
+        healthy = self._healthy
+        return healthy[next(self._turn) % len(healthy)] if healthy else None
+
+    def _lag(self, replica: Engine) -> float:
+        try:
+            with replica.connect() as conn:
+                if replica.dialect.name == "postgresql":
+                    return float(conn.execute(POSTGRES_LAG_SQL).scalar() or 0)
+                conn.execute(text("SELECT 1"))
+                return 0.0
+        except Exception:
+            logger.warning("Read replica %s failed its health check", replica.url.render_as_string(hide_password=True))
+            return float("inf")
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica and writes to the primary.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary. Once the
+    session has written, every later read goes to the primary too, so it reads its own writes.
+    """
+
+    def __init__(self, *args, replica: Engine, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+        self.wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.wrote = True
+        return engine if self.wrote else self.replica
+
+
+replica_set = ReplicaSet([create_engine(url, pool_pre_ping=True) for url in DATABASE_REPLICA_URLS])
+for replica_engine in replica_set.engines:
+    instrument_engine(replica_engine)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+
+def session_factory_for(db: Session) -> Callable[[], Session]:
+    """Opens new sessions on the database `db` uses (its replica, when it reads from one)."""
+    if isinstance(db, RoutingSession):
+        return lambda: ReadSessionLocal(replica=db.replica, info={"replica": True})
+    return lambda: SessionLocal(bind=db.get_bind())
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -15,5 +118,20 @@ def get_db():
         yield db
     finally:
         db.close()
-        
-        
\ No newline at end of file
+
+
+def get_read_db(db: Session = Depends(get_db)):
+    """
+    Session for read-mostly endpoints: served by a healthy replica when one is configured.
+    Without one, it is the request's primary session.
+    """
+    replica = replica_set.choose()
+    if replica is None:
+        yield db
+        return
+    read_db = ReadSessionLocal(replica=replica)
+    read_db.info["replica"] = True
+    try:
+        yield read_db
+    finally:
+        read_db.close()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from datetime import datetime, date
+
+from sqlalchemy import String, Integer, Boolean, Date, TIMESTAMP, func, text
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class EventModel(Base):
+    __tablename__ = 'events'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True,  nullable=False)
+    name: Mapped[str] = mapped_column(String,  nullable=False)
+    starts_on: Mapped[date | None] = mapped_column(Date, nullable=True )
+    ends_on: Mapped[date | None] = mapped_column(Date, nullable=True )
+    is_active: Mapped[bool] = mapped_column(Boolean, server_default=text("false"), index=True,  nullable=False)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(),  nullable=False)
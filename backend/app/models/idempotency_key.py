@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, JSON, TIMESTAMP, ForeignKey, UniqueConstraint, func
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# Outcome of a client write stored under the client's idempotency key, so replays return it unchanged
+class IdempotencyKeyModel(Base):
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_id_key"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True,  nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"),  nullable=False)
+    key: Mapped[str] = mapped_column(String,  nullable=False)
+    result: Mapped[dict] = mapped_column(JSON,  nullable=False)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), index=True,  nullable=False)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, TIMESTAMP
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# Lease on a scheduled job: only the worker holding an unexpired lease runs the job
+class JobLockModel(Base):
+    __tablename__ = 'job_locks'
+
+    name: Mapped[str] = mapped_column(String, primary_key=True,  nullable=False)
+    holder: Mapped[str] = mapped_column(String,  nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True),  nullable=False)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from sqlalchemy import String, Integer, Float, Text, ForeignKey, Index, DDL, event, text
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class PosterModel(Base):
+    __tablename__ = 'posters'
+    # Every poster query is event-scoped, so event_id leads each index and
+    # past events never have to be read to serve the current one
+    __table_args__ = (
+        # Judges page through their own posters in id order
+        Index("ix_posters_event_id_judge_id_id", "event_id", "judge_id", "id"),
+        Index("ix_posters_event_id_session", "event_id", "session"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True,  nullable=False)
+    event_id: Mapped[int] = mapped_column(Integer, ForeignKey("events.id", ondelete="CASCADE"),  nullable=False)
+    judge_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"),  nullable=False)
+    session: Mapped[str | None] = mapped_column(String, nullable=True )
+    title: Mapped[str] = mapped_column(String,  nullable=False)
+    author: Mapped[str] = mapped_column(String,  nullable=False)
+    abstract: Mapped[str | None] = mapped_column(Text, nullable=True )
+    score: Mapped[float] = mapped_column(Float, server_default=text("0"),  nullable=False)
+    # Every ORM UPDATE of a poster is conditional on the version it read (optimistic concurrency).
+    # Writers bump it themselves, so several changes in one flush each get their own version.
+    version: Mapped[int] = mapped_column(Integer, server_default=text("1"),  nullable=False)
+
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+
+
+# ---------------------------
+# Search indexes
+# ---------------------------
+# Postgres: a weighted tsvector kept up to date by the database, plus trigram
+# indexes for typo-tolerant matching on title and author.
+for statement in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE posters ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(author, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(abstract, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_posters_search_vector ON posters USING GIN (search_vector)",
+    "CREATE INDEX ix_posters_title_trgm ON posters USING GIN (lower(title) gin_trgm_ops)",
+    "CREATE INDEX ix_posters_author_trgm ON posters USING GIN (lower(author) gin_trgm_ops)",
+):
+    event.listen(PosterModel.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+# SQLite (tests and local runs): an external-content FTS5 table kept in sync by
+# triggers, and a vocabulary view used to correct misspelled terms.
+for statement in (
+    """
+    CREATE VIRTUAL TABLE posters_fts USING fts5(
+        title, author, abstract, content='posters', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    "CREATE VIRTUAL TABLE posters_fts_vocab USING fts5vocab(posters_fts, 'row')",
+    """
+    CREATE TRIGGER posters_fts_insert AFTER INSERT ON posters BEGIN
+        INSERT INTO posters_fts(rowid, title, author, abstract) VALUES (new.id, new.title, new.author, new.abstract);
+    END
+    """,
+    """
+    CREATE TRIGGER posters_fts_delete AFTER DELETE ON posters BEGIN
+        INSERT INTO posters_fts(posters_fts, rowid, title, author, abstract) VALUES ('delete', old.id, old.title, old.author, old.abstract);
+    END
+    """,
+    """
+    CREATE TRIGGER posters_fts_update AFTER UPDATE OF title, author, abstract ON posters BEGIN
+        INSERT INTO posters_fts(posters_fts, rowid, title, author, abstract) VALUES ('delete', old.id, old.title, old.author, old.abstract);
+        INSERT INTO posters_fts(rowid, title, author, abstract) VALUES (new.id, new.title, new.author, new.abstract);
+    END
+    """,
+):
+    event.listen(PosterModel.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+for statement in ("DROP TABLE IF EXISTS posters_fts_vocab", "DROP TABLE IF EXISTS posters_fts"):
+    event.listen(PosterModel.__table__, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
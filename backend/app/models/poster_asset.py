@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, BigInteger, TIMESTAMP, ForeignKey, func
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# The PDF or image of a poster. Files are stored once per content hash, so posters
+# uploaded twice (or shared between events) take the space of one.
+class PosterAssetModel(Base):
+    __tablename__ = 'poster_assets'
+
+    poster_id: Mapped[int] = mapped_column(Integer, ForeignKey("posters.id", ondelete="CASCADE"), primary_key=True,  nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), index=True,  nullable=False)
+    content_type: Mapped[str] = mapped_column(String,  nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger,  nullable=False)
+    filename: Mapped[str] = mapped_column(String,  nullable=False)
+    # pending until the renderer has made the thumbnail and preview; none when the file cannot be rendered
+    render_status: Mapped[str] = mapped_column(String, server_default="pending",  nullable=False)
+    thumbnail_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True )
+    preview_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True )
+    uploaded_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(),  nullable=False)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, BigInteger, Float, JSON, TIMESTAMP, ForeignKey, Index, DDL, event, func
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+# SQLite only auto-increments an INTEGER PRIMARY KEY
+EventIdType = BigInteger().with_variant(Integer, "sqlite")
+
+
+# One change of one score: the log is append-only and outlives the posters it
+# describes, so poster and judge ids are deliberately not foreign keys.
+class ScoreEventModel(Base):
+    __tablename__ = 'score_events'
+    __table_args__ = (
+        # Replays read an event's log in id order
+        Index("ix_score_events_event_id_id", "event_id", "id"),
+        Index("ix_score_events_poster_id_id", "poster_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(EventIdType, primary_key=True,  nullable=False)
+    event_id: Mapped[int] = mapped_column(Integer,  nullable=False)
+    poster_id: Mapped[int] = mapped_column(Integer,  nullable=False)
+    judge_id: Mapped[int] = mapped_column(Integer,  nullable=False)
+    criterion: Mapped[str] = mapped_column(String, server_default="score",  nullable=False)
+    old_value: Mapped[float | None] = mapped_column(Float, nullable=True )
+    # None when the poster was deleted
+    new_value: Mapped[float | None] = mapped_column(Float, nullable=True )
+    # update, batch, delete, rebuild, or baseline for scores that predate the log
+    source: Mapped[str] = mapped_column(String,  nullable=False)
+    # User who made the change: the judge, or the admin of a rebuild (None for baseline)
+    changed_by: Mapped[int | None] = mapped_column(Integer, nullable=True )
+    # When the change was made, not when the batched writer stored it; the id gives the log's order
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True),  nullable=False)
+
+
+# Replayed state of an event's log up to event `through_id`, so replays only
+# read the events stored after it. `through_at` is the latest change it includes.
+class ScoreSnapshotModel(Base):
+    __tablename__ = 'score_snapshots'
+    __table_args__ = (
+        Index("ix_score_snapshots_event_id_through_id", "event_id", "through_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True,  nullable=False)
+    event_id: Mapped[int] = mapped_column(Integer, ForeignKey("events.id", ondelete="CASCADE"),  nullable=False)
+    through_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True),  nullable=False)
+    through_id: Mapped[int] = mapped_column(BigInteger,  nullable=False)
+    event_count: Mapped[int] = mapped_column(BigInteger,  nullable=False)
+    state: Mapped[dict] = mapped_column(JSON,  nullable=False)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(),  nullable=False)
+
+
+# ---------------------------
+# Append-only enforcement
+# ---------------------------
+# Updates and deletes are refused by the database itself, whoever connects.
+for statement in (
+    """
+    CREATE OR REPLACE FUNCTION score_events_append_only() RETURNS trigger AS $$
+    BEGIN
+        RAISE EXCEPTION 'score_events is append-only';
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER score_events_append_only BEFORE UPDATE OR DELETE ON score_events
+    FOR EACH ROW EXECUTE FUNCTION score_events_append_only()
+    """,
+):
+    event.listen(ScoreEventModel.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+for statement in (
+    """
+    CREATE TRIGGER score_events_no_update BEFORE UPDATE ON score_events BEGIN
+        SELECT RAISE(ABORT, 'score_events is append-only');
+    END
+    """,
+    """
+    CREATE TRIGGER score_events_no_delete BEFORE DELETE ON score_events BEGIN
+        SELECT RAISE(ABORT, 'score_events is append-only');
+    END
+    """,
+):
+    event.listen(ScoreEventModel.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
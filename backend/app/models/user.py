@@ -22,9 +22,10 @@ class UserModel(Base):
     organization: Mapped[str | None] = mapped_column(String, nullable=True )
     is_verified: Mapped[bool] = mapped_column(Boolean, server_default=text("false"),  nullable=False)
     magic_link_token: Mapped[str | None] = mapped_column(String, nullable=True )
-    magic_link_expires_at: Mapped[str | None] = mapped_column(String, nullable=True )
+    magic_link_expires_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), index=True, nullable=True )
     registered_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now(),  nullable=False)
-    last_login_at: Mapped[str | None] = mapped_column(String, nullable=True )
+    last_login_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), index=True, nullable=True )
+    last_seen_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), index=True, nullable=True )
     role: Mapped[str] = mapped_column(String, server_default=text("'user'"),  nullable=False)
 
      # Relationships
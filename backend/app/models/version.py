@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import String, Integer
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# Change counter per cached resource; kept in the database so every worker process agrees on it
+class VersionModel(Base):
+    __tablename__ = 'versions'
+
+    key: Mapped[str] = mapped_column(String, primary_key=True,  nullable=False)
+    version: Mapped[int] = mapped_column(Integer,  nullable=False)
@@ -5,6 +5,25 @@ from .user import (
       UserRead, 
       UserUpdate,
 )
+from .event import (
+      EventBase,
+      EventCreate,
+      EventRead,
+)
+from .poster import (
+      PosterBase,
+      PosterCreate,
+      PosterRead,
+      PosterUpdate,
+      PosterPage,
+      PosterDeleted,
+      ScoreChange,
+      ScoreBatch,
+      ScoreChangeResult,
+      ScoreBatchResult,
+      PosterSearchHit,
+      PosterSearchResult,
+)
 
 
 UserRead.model_rebuild()
@@ -15,6 +34,21 @@ __all__ = [
     "UserCreate", 
     "UserRead", 
     "UserUpdate",
+    "EventBase",
+    "EventCreate",
+    "EventRead",
+    "PosterBase",
+    "PosterCreate",
+    "PosterRead",
+    "PosterUpdate",
+    "PosterPage",
+    "PosterDeleted",
+    "ScoreChange",
+    "ScoreBatch",
+    "ScoreChangeResult",
+    "ScoreBatchResult",
+    "PosterSearchHit",
+    "PosterSearchResult",
  
 
 ]
\ No newline at end of file
@@ -0,0 +1,17 @@
+from typing import Optional
+from datetime import date, datetime
+
+from .base import BaseSchema, BaseCreateSchema, BaseReadSchema
+
+class EventBase(BaseSchema):
+    name: str
+    starts_on: Optional[date] = None
+    ends_on: Optional[date] = None
+    is_active: bool = False
+
+
+class EventCreate(EventBase, BaseCreateSchema):
+    pass
+
+class EventRead(EventBase, BaseReadSchema):
+    created_at: datetime
@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+from pydantic import Field, field_validator
+
+from .base import BaseSchema, BaseCreateSchema, BaseReadSchema, BaseUpdateSchema
+
+class PosterBase(BaseSchema):
+    title: str
+    author: str
+    score: float
+    session: Optional[str] = None
+    abstract: Optional[str] = None
+
+
+class PosterCreate(PosterBase, BaseCreateSchema):
+    event_id: int
+    judge_id: int
+
+class PosterRead(PosterBase, BaseReadSchema):
+    event_id: int
+    version: int = 1  # results stored for idempotency keys before versioning have none
+
+
+class PosterUpdate(PosterBase, BaseUpdateSchema):
+    title: Optional[str] = None
+    author: Optional[str] = None
+    score: Optional[float] = None
+    session: Optional[str] = None
+    abstract: Optional[str] = None
+    version: Optional[int] = None  # the version the client read; when set, the update only applies to it
+
+    @field_validator("title", "author", "score")
+    @classmethod
+    def not_null(cls, value):
+        # May be left out of a partial update, but the poster always has one
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+class PosterPage(BaseSchema):
+    data: List[PosterRead]
+    total: int
+
+
+class PosterDeleted(PosterPage):
+    deleted: PosterRead
+
+
+class ScoreChange(BaseSchema):
+    idempotency_key: str = Field(min_length=1, max_length=128)
+    poster_id: int
+    score: float
+    version: Optional[int] = None  # when set, the change only applies to this version of the poster
+
+
+class ScoreBatch(BaseSchema):
+    changes: List[ScoreChange] = Field(max_length=500)
+
+
+class ScoreChangeResult(BaseSchema):
+    idempotency_key: str
+    poster_id: int
+    status: Literal["applied", "not_found", "conflict"]
+    replayed: bool = False  # True when the key was seen before and the stored result is returned
+    poster: Optional[PosterRead] = None  # for a conflict, the poster's current state
+
+
+class ScoreBatchResult(BaseSchema):
+    results: List[ScoreChangeResult]
+
+
+class PosterSearchHit(PosterRead):
+    rank: float  # higher is more relevant
+
+
+class PosterSearchResult(BaseSchema):
+    query: str
+    data: List[PosterSearchHit]
+
+
+class PosterAssetRead(BaseSchema):
+    poster_id: int
+    sha256: str
+    content_type: str
+    size: int
+    filename: str
+    render_status: Literal["pending", "ready", "none", "failed"]
+
+
+class ScoreEventRead(BaseSchema):
+    id: int
+    poster_id: int
+    judge_id: int
+    criterion: str
+    old_value: Optional[float] = None
+    new_value: Optional[float] = None  # None when the poster was deleted
+    source: Literal["update", "batch", "delete", "rebuild", "baseline"]
+    changed_by: Optional[int] = None  # the judge, or the admin of a rebuild
+    created_at: datetime
+
+
+class JudgeAggregate(BaseSchema):
+    count: int
+    mean: float
+
+
+class ScoreReplay(BaseSchema):
+    as_of: Optional[datetime] = None  # time of the last event replayed
+    events: int
+    count: int
+    mean: Optional[float] = None
+    judges: Dict[int, JudgeAggregate]
+    scores: Dict[int, float]
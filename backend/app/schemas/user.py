@@ -13,8 +13,9 @@ class UserBase(BaseSchema):
     password: Optional[str] = None
     organization: Optional[str] = None
     magic_link_token: Optional[str] = None
-    magic_link_expires_at: Optional[str] = None
-    last_login_at: Optional[str] = None
+    magic_link_expires_at: Optional[datetime] = None
+    last_login_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
 
 
 class UserCreate(UserBase, BaseCreateSchema):
@@ -35,9 +36,10 @@ class UserUpdate(UserBase, BaseUpdateSchema):
     organization: Optional[str] = None
     is_verified: Optional[bool] = None
     magic_link_token: Optional[str] = None
-    magic_link_expires_at: Optional[str] = None
+    magic_link_expires_at: Optional[datetime] = None
     registered_at: Optional[datetime] = None
-    last_login_at: Optional[str] = None
+    last_login_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
     role: Optional[str] = None
 
 
@@ -50,5 +52,14 @@ class LoginRequest(BaseModel):
 class LoginResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
-    user: UserRead 
+    user: Optional[UserRead] = None  # omitted when tokens are refreshed
+
+class JudgeInvite(BaseModel):
+    first_name: str
+    last_name: str
+    email: str
+    organization: Optional[str] = None
+
+class BulkInviteRequest(BaseModel):
+    invites: List[JudgeInvite]
 #-- Preserve Custom code END   --#
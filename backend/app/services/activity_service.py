@@ -0,0 +1,154 @@
+# services/activity_service.py
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from sqlalchemy import Integer, TIMESTAMP, bindparam, cast, column, func, update, values
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+from app.models.core_db import SessionLocal
+from app.models.user import UserModel
+
+load_dotenv()
+ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", "5"))
+ACTIVITY_MAX_PENDING = int(os.getenv("ACTIVITY_MAX_PENDING", "10000"))
+
+logger = logging.getLogger(__name__)
+
+users = UserModel.__table__
+
+
+class ActivityRecorder:
+    """
+    Write-behind recorder for "user seen at" events.
+
+    Logins and judge requests only touch an in-memory buffer holding the latest
+    timestamps per user. A background thread flushes the buffer every few seconds
+    as a single batched UPDATE, so no request pays for a write or a row lock.
+    The buffer is bounded: when it is full, events for users not already in it are
+    dropped (and counted) until the next flush. Activity is best-effort; a failed
+    flush is logged and its events are discarded.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        flush_seconds: float = ACTIVITY_FLUSH_SECONDS,
+        max_pending: int = ACTIVITY_MAX_PENDING,
+    ):
+        self.session_factory = session_factory
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.dropped = 0
+        # user id -> [last login or None, last seen]
+        self._pending: dict[int, list[Optional[datetime]]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------------------------
+    # Recording
+    # ---------------------------
+    def record(self, user_id: int, login: bool = False, at: Optional[datetime] = None) -> None:
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._pending.get(user_id)
+            if entry is None:
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    return
+                entry = self._pending[user_id] = [None, at]
+            entry[1] = max(entry[1], at)
+            if login:
+                entry[0] = max(entry[0], at) if entry[0] else at
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # ---------------------------
+    # Flushing
+    # ---------------------------
+    def flush(self) -> int:
+        """Writes the buffered events in one statement. Returns the number of users written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            rows = [
+                {"user_id": user_id, "login_at": login_at, "seen_at": seen_at}
+                for user_id, (login_at, seen_at) in batch.items()
+            ]
+            db = self.session_factory()
+            try:
+                self._write(db, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception("Could not flush activity for %d users", len(rows))
+                return 0
+            finally:
+                db.close()
+            return len(rows)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the flush thread and writes whatever is still buffered."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.flush_seconds):
+            self.flush()
+
+    def _write(self, db: Session, rows: list[dict]) -> None:
+        if db.get_bind().dialect.name == "postgresql":
+            # UPDATE users ... FROM (VALUES (...), ...) AS activity: one statement for the whole batch
+            activity = values(
+                column("user_id", Integer),
+                column("login_at", TIMESTAMP(timezone=True)),
+                column("seen_at", TIMESTAMP(timezone=True)),
+                name="activity",
+            ).data([(row["user_id"], row["login_at"], row["seen_at"]) for row in rows])
+            db.execute(
+                update(users)
+                .where(users.c.id == activity.c.user_id)
+                .values(
+                    # A column of NULLs only would otherwise come back typed as text
+                    last_login_at=func.coalesce(cast(activity.c.login_at, TIMESTAMP(timezone=True)), users.c.last_login_at),
+                    last_seen_at=func.greatest(activity.c.seen_at, users.c.last_seen_at),
+                )
+            )
+        else:
+            # SQLite cannot alias the columns of a VALUES list; an executemany is the next best thing
+            login_at = bindparam("login_at", type_=TIMESTAMP(timezone=True))
+            seen_at = bindparam("seen_at", type_=TIMESTAMP(timezone=True))
+            db.execute(
+                update(users)
+                .where(users.c.id == bindparam("user_id"))
+                .values(
+                    last_login_at=func.coalesce(login_at, users.c.last_login_at),
+                    # Never moved backwards by a late flush (scalar max() is NULL if either side is)
+                    last_seen_at=func.max(seen_at, func.coalesce(users.c.last_seen_at, seen_at)),
+                ),
+                rows,
+            )
+
+
+# Process-wide recorder, started and stopped with the app
+activity_recorder = ActivityRecorder()
@@ -0,0 +1,238 @@
+# services/asset_service.py
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+from app.models.core_db import SessionLocal
+from app.models.poster import PosterModel
+from app.models.poster_asset import PosterAssetModel
+from app.schemas.poster import PosterAssetRead
+from app.utils.render_util import render_images
+from app.utils.storage_util import blob_key, get_asset_storage
+
+load_dotenv()
+ASSET_MAX_BYTES = int(os.getenv("ASSET_MAX_BYTES", str(50 * 1024 * 1024)))
+ASSET_RENDER_PROCESSES = int(os.getenv("ASSET_RENDER_PROCESSES", "2"))
+
+logger = logging.getLogger(__name__)
+
+# Leading bytes of the accepted formats; the client's Content-Type is not trusted
+SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+
+
+class AssetTooLarge(ValueError):
+    pass
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+@dataclass
+class StagedUpload:
+    path: str
+    sha256: str
+    size: int
+    content_type: str
+
+
+class AssetUpload:
+    """
+    Upload being received chunk by chunk: each chunk is hashed and appended to a
+    temporary file, so memory use does not grow with the file.
+    """
+
+    def __init__(self, max_bytes: int = ASSET_MAX_BYTES, directory: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._head = b""
+        self._file = tempfile.NamedTemporaryFile(dir=directory, suffix=".upload", delete=False)
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise AssetTooLarge(f"Poster files are limited to {self.max_bytes // (1024 * 1024)} MB")
+        if len(self._head) < 16:
+            self._head += chunk[:16]
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def finish(self) -> StagedUpload:
+        self._file.close()
+        content_type = sniff_content_type(self._head)
+        if content_type is None:
+            raise ValueError("Poster files must be PDF, PNG, JPEG or WebP")
+        return StagedUpload(self._file.name, self._hash.hexdigest(), self.size, content_type)
+
+    def discard(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self._file.name)
+        except FileNotFoundError:
+            pass
+
+
+class AssetRenderer:
+    """
+    Renders thumbnails and previews off the request path.
+
+    Renders are queued on a few dispatch threads; each fetches the file (from S3 if
+    needed) and hands the CPU-heavy decoding to a process pool, so neither the event
+    loop nor other requests wait on it. The outputs are stored like any asset and set
+    on every poster sharing the file.
+    """
+    STALE_PENDING = timedelta(minutes=10)
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, storage=None,
+                 processes: int = ASSET_RENDER_PROCESSES):
+        self.session_factory = session_factory
+        self.storage = storage
+        self.processes = processes
+        self._dispatch: Optional[ThreadPoolExecutor] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, sha256: str, content_type: str) -> Future:
+        with self._lock:
+            if self._dispatch is None:
+                self._dispatch = ThreadPoolExecutor(max_workers=self.processes, thread_name_prefix="asset-render")
+                # Spawned, not forked: forking a threaded server process can deadlock the child
+                self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._dispatch.submit(self._render, sha256, content_type)
+
+    def resubmit_stale(self, db: Session) -> int:
+        """Queues renders left pending by a worker that exited. Returns the number queued."""
+        cutoff = datetime.now(timezone.utc) - self.STALE_PENDING
+        files = db.execute(
+            select(PosterAssetModel.sha256, PosterAssetModel.content_type)
+            .where(PosterAssetModel.render_status == "pending", PosterAssetModel.uploaded_at < cutoff)
+            .distinct()
+        ).all()
+        for sha256, content_type in files:
+            self.submit(sha256, content_type)
+        return len(files)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._dispatch is not None:
+                self._dispatch.shutdown(wait=True)
+                self._pool.shutdown(wait=True)
+                self._dispatch = self._pool = None
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _render(self, sha256: str, content_type: str) -> str:
+        storage = self.storage or get_asset_storage()
+        values = {}
+        with tempfile.TemporaryDirectory() as work_dir:
+            try:
+                source = storage.local_path(blob_key(sha256))
+                if source is None:
+                    source = os.path.join(work_dir, "source")
+                    storage.download(blob_key(sha256), source)
+                outputs = self._pool.submit(render_images, source, content_type, work_dir).result()
+                for kind, path in outputs.items():
+                    values[f"{kind}_sha256"] = _store_file(storage, path)
+                values["render_status"] = "ready" if outputs else "none"
+            except Exception:
+                logger.exception("Rendering poster file %s failed", sha256)
+                values = {"render_status": "failed"}
+        db = self.session_factory()
+        try:
+            db.execute(update(PosterAssetModel).where(PosterAssetModel.sha256 == sha256).values(**values))
+            db.commit()
+        finally:
+            db.close()
+        return values["render_status"]
+
+
+asset_renderer = AssetRenderer()
+
+
+class AssetService:
+    """
+    Stores poster files by content hash and looks them up for serving.
+    """
+
+    def __init__(self, db: Session, storage=None, renderer: Optional[AssetRenderer] = None):
+        self.db = db
+        self.storage = storage or get_asset_storage()
+        self.renderer = renderer or asset_renderer
+
+    def attach(self, event_id: int, poster_id: int, upload: StagedUpload, filename: str) -> PosterAssetRead:
+        """Stores an uploaded file (once per content hash) as the poster's file, replacing any earlier one."""
+        poster = self.db.scalar(select(PosterModel.id).where(PosterModel.id == poster_id, PosterModel.event_id == event_id))
+        if poster is None:
+            os.remove(upload.path)
+            raise ValueError("Poster not found")
+
+        key = blob_key(upload.sha256)
+        if self.storage.exists(key):
+            os.remove(upload.path)  # the same file is already stored
+        else:
+            self.storage.put_file(key, upload.path)
+
+        # Another poster with the same file already has its renders
+        rendered = self.db.execute(
+            select(PosterAssetModel.render_status, PosterAssetModel.thumbnail_sha256, PosterAssetModel.preview_sha256)
+            .where(PosterAssetModel.sha256 == upload.sha256, PosterAssetModel.render_status.in_(("ready", "none")))
+            .limit(1)
+        ).first()
+        asset = self.db.get(PosterAssetModel, poster_id) or PosterAssetModel(poster_id=poster_id)
+        asset.sha256 = upload.sha256
+        asset.content_type = upload.content_type
+        asset.size = upload.size
+        asset.filename = os.path.basename(filename).replace('"', "") or "poster"
+        asset.render_status, asset.thumbnail_sha256, asset.preview_sha256 = rendered or ("pending", None, None)
+        asset.uploaded_at = datetime.now(timezone.utc)
+        self.db.add(asset)
+        self.db.commit()
+        if rendered is None:
+            self.renderer.submit(upload.sha256, upload.content_type)
+        return PosterAssetRead.model_validate(asset)
+
+    def get(self, event_id: int, poster_id: int, judge_id: Optional[int] = None) -> PosterAssetModel:
+        """The poster's file; with `judge_id`, only if the poster is assigned to that judge."""
+        stmt = (
+            select(PosterAssetModel)
+            .join(PosterModel, PosterModel.id == PosterAssetModel.poster_id)
+            .where(PosterModel.id == poster_id, PosterModel.event_id == event_id)
+        )
+        if judge_id is not None:
+            stmt = stmt.where(PosterModel.judge_id == judge_id)
+        asset = self.db.scalar(stmt)
+        if asset is None:
+            raise ValueError("Poster file not found")
+        return asset
+
+
+def _store_file(storage, path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    sha256 = digest.hexdigest()
+    if not storage.exists(blob_key(sha256)):
+        storage.put_file(blob_key(sha256), path)
+    return sha256
@@ -1,24 +1,52 @@
 # services/authenticate_service.py
+import os
 from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from passlib.context import CryptContext
+from app.cache import TieredCache
 from app.models.user import UserModel
-from app.schemas.user import UserCreate, UserRead
+from app.services.activity_service import activity_recorder
+from app.schemas.user import UserCreate, UserRead, JudgeInvite
 from app.utils.email_util import send_email_verification, send_magic_link
 import re
-from dateutil import parser
 from app.utils.jwt_util import create_token, decode_token
+from app.utils.tracing_util import span, traced
 
 
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+load_dotenv()
+
+
+def _argon2_settings() -> dict:
+    """argon2 costs from ARGON2_TIME_COST / ARGON2_MEMORY_COST (KiB) / ARGON2_PARALLELISM; unset ones keep the library default.
+    Pick them with `python -m benchmarks.calibrate_argon2` on the deployment host."""
+    settings = {}
+    for name in ("time_cost", "memory_cost", "parallelism"):
+        value = os.getenv(f"ARGON2_{name.upper()}")
+        if value:
+            settings[f"argon2__{name}"] = int(value)
+    return settings
+
+
+# Hashes made with other costs still verify, and are replaced on the user's next sign in
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto", **_argon2_settings())
+
+# Roles checked on every admin-only request, evicted on every worker when the user changes
+user_roles = TieredCache("user_roles", maxsize=4096, ttl=60.0, value_type=str)
+
+
+def _user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
 
 class AuthService:
     """
     Handles user authentication and registration logic.
     """
     MAGIC_LINK_EXPIRY_MINUTES = 15  # token valid for 15 minutes
+    INVITE_EXPIRY_MINUTES = 7 * 24 * 60  # invitations are valid for 7 days
 
     def __init__(self, db: Session):
         self.db = db
@@ -26,6 +54,7 @@ class AuthService:
     # ---------------------------
     # Register
     # ---------------------------
+    @traced("AuthService.register")
     def register(self, user_data: UserCreate) -> UserRead:
         
         # Required fields
@@ -36,11 +65,12 @@ class AuthService:
             raise ValueError("Your Password must be at least 8 characters")
         
         # Check if email exists (case-insensitive)
-        existing_user = self.db.query(UserModel).filter(UserModel.email.ilike(user_data.email)).first()
-        if existing_user:
+        existing_user = self.db.scalar(select(UserModel.id).where(UserModel.email.ilike(user_data.email)))
+        if existing_user is not None:
             raise ValueError(f"This Email ({user_data.email}) is already registered. Please log in or use a different email.")
 
-        hashed_password = pwd_context.hash(user_data.password) if user_data.password else None
+        with span("argon2.hash"):
+            hashed_password = pwd_context.hash(user_data.password) if user_data.password else None
 
         verification_token = create_token(
             subject= user_data.first_name,
@@ -48,22 +78,22 @@ class AuthService:
             expires_delta=timedelta(minutes=self.MAGIC_LINK_EXPIRY_MINUTES),
             token_type="magic-link")
 
-        user = UserModel(
-            first_name = user_data.first_name,
-            last_name = user_data.last_name,
-            email = user_data.email,
-            password = hashed_password,
-            organization = user_data.organization,
-            magic_link_token = verification_token,
-            magic_link_expires_at = self._generate_timestamp_str(minutes=self.MAGIC_LINK_EXPIRY_MINUTES),
-            last_login_at = self._generate_timestamp_str(),
-            is_verified=False
-        )
-
         try:
-            self.db.add(user)
+            # INSERT ... RETURNING hands back the server defaults, so no refresh is needed
+            user = UserRead.model_validate(self.db.scalar(
+                insert(UserModel).values(
+                    first_name = user_data.first_name,
+                    last_name = user_data.last_name,
+                    email = user_data.email,
+                    password = hashed_password,
+                    organization = user_data.organization,
+                    magic_link_token = verification_token,
+                    magic_link_expires_at = self._utc_now(minutes=self.MAGIC_LINK_EXPIRY_MINUTES),
+                    last_login_at = self._utc_now(),
+                    is_verified=False
+                ).returning(UserModel)
+            ))
             self.db.commit()
-            self.db.refresh(user)
         except IntegrityError:
             self.db.rollback()
             raise ValueError("Email already exists")
@@ -71,151 +101,214 @@ class AuthService:
         # Send verification email (mock)
         send_email_verification(user.email, verification_token, user.first_name)
 
-        return UserRead.model_validate(user)
+        return user
+
+    # ---------------------------
+    # Bulk invite judges
+    # ---------------------------
+    @traced("AuthService.bulk_invite")
+    def bulk_invite(self, invites: list[JudgeInvite]) -> tuple[list[UserRead], list[str]]:
+        """
+        Creates passwordless accounts for a panel of judges in a single multi-row insert.
+        Each account gets a magic link token that activates it through `verify`.
+        Returns the created users and the emails that were skipped because they already exist.
+        """
+        # Keep the first occurrence of each email (case-insensitive)
+        unique_invites = {}
+        for invite in invites:
+            unique_invites.setdefault(invite.email.strip().lower(), invite)
+
+        if not unique_invites:
+            return [], []
+
+        existing = set(
+            self.db.scalars(
+                select(func.lower(UserModel.email)).where(func.lower(UserModel.email).in_(list(unique_invites)))
+            )
+        )
+        skipped = [unique_invites[email].email for email in unique_invites if email in existing]
+
+        expires_at = self._utc_now(minutes=self.INVITE_EXPIRY_MINUTES)
+        now = self._utc_now()
+        rows = [
+            {
+                "first_name": invite.first_name,
+                "last_name": invite.last_name,
+                "email": invite.email,
+                "password": None,  # passwordless, no hashing needed
+                "organization": invite.organization,
+                "magic_link_token": create_token(
+                    subject=invite.first_name,
+                    email=invite.email,
+                    expires_delta=timedelta(minutes=self.INVITE_EXPIRY_MINUTES),
+                    token_type="magic-link"),
+                "magic_link_expires_at": expires_at,
+                "last_login_at": now,
+                "is_verified": False,
+            }
+            for email, invite in unique_invites.items() if email not in existing
+        ]
+        if not rows:
+            return [], skipped
+
+        try:
+            created = self.db.scalars(insert(UserModel).returning(UserModel), rows).all()
+            users = [UserRead.model_validate(user) for user in created]
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise ValueError("One or more emails were registered while the invitations were being created. Please retry.")
+
+        return users, skipped
 
     # ---------------------------
     # Verify magic link
     # ---------------------------
+    @traced("AuthService.verify")
     def verify(self, magic_link_token: str) -> UserRead:
         if not magic_link_token:
             raise ValueError("Invalid token")
 
-        # Case-insensitive lookup
-        found_user = (
-            self.db.query(UserModel)
-            .filter(UserModel.magic_link_token.ilike(magic_link_token))
-            .first()
+        now = self._utc_now()
+        # One statement: case-insensitive lookup, expiry check and marking the user as verified
+        found_user = self.db.scalar(
+            self._returning(
+                update(UserModel)
+                .where(
+                    UserModel.magic_link_token.ilike(magic_link_token),
+                    UserModel.magic_link_expires_at > now,
+                )
+                .values(
+                    is_verified=True,
+                    magic_link_token=None,  # Invalidate token after use
+                    magic_link_expires_at=None,
+                    last_login_at=now,
+                )
+            )
         )
 
         if not found_user:
-            # If we don't find a user with that token the user may have already verified
-            # so we decode the token to get the email and check if that user is verified
-            
-            token_payload = decode_token(magic_link_token)  # Will raise ValueError if invalid
-            token_payload_type = token_payload.get("token_type")
-            if token_payload_type != "magic-link":
-                raise ValueError("Invalid token type")
-            
-            email = token_payload.get("email")
-            found_user = self.db.query(UserModel).filter(UserModel.email == email).first()
-            if found_user and found_user.is_verified:
-                expires_at_ts = token_payload.get("exp",0)
-                dt_utc = datetime.fromtimestamp(expires_at_ts, tz=timezone.utc)
-                # We still define expires_at_str 
-                # The user can use this token multiple time until it expires with out any issue
-                expires_at_str = dt_utc.isoformat(timespec="microseconds").replace("+00:00", "Z")
-            else:
-                # If we still can't find a verified user, the token is invalid
-                raise ValueError("Invalid or expired verification link. Please reset your password to generate a new link.")        
-        else:
-            expires_at_str = found_user.magic_link_expires_at
-
-        
-        expires_at = parser.parse(expires_at_str) if expires_at_str else None
-
-        now = datetime.now(timezone.utc)
-
-        # print("DEBUG expires_at:", expires_at.isoformat() if expires_at else None)
-        # print("DEBUG        now:", now.isoformat())
-        # if expires_at:
-        #     delta = expires_at - now
-        #     seconds = int(delta.total_seconds())
-        #     mins, secs = divmod(abs(seconds), 60)
-
-        #     # Positive = still time left, Negative = expired already
-        #     sign = "" if seconds >= 0 else "-"
-        #     print(f"DEBUG Time before expires: {sign}{mins} min {secs} sec")
-        # else:
-        #     print("DEBUG expires_at is None")
+            found_user = self._verify_used_token(magic_link_token, now)
 
-        if not expires_at or expires_at < now:
-            raise ValueError("Your Verification link has expired. Please reset your password to generate a new link.")
-
-        # Mark user as verified
-        found_user.is_verified = True
-        found_user.magic_link_token = None  # Invalidate token after use
-        found_user.magic_link_expires_at = None # Invalidate token after use
-        found_user.last_login_at = self._generate_timestamp_str()
-        
+        user = UserRead.model_validate(found_user)
         self.db.commit()
-        self.db.refresh(found_user)
+        self._publish_change(user.id)
+        return user
+
 
-        return UserRead.model_validate(found_user)
-    
-    
     # ---------------------------
     # Sign in
     # ---------------------------
+    @traced("AuthService.signin")
     def signin(self, email: str, password: str) -> UserRead:
         
-        user = self.db.query(UserModel).filter(UserModel.email == email).first()
+        user = self.db.scalar(select(UserModel).where(UserModel.email == email))
         if not user or not user.password:
             raise ValueError("Invalid credentials")
         
-        if not pwd_context.verify(password, user.password):
+        with span("argon2.verify"):
+            valid, new_hash = pwd_context.verify_and_update(password, user.password)
+        if not valid:
             raise ValueError("Invalid credentials")
 
-        user.last_login_at = self._generate_timestamp_str()
-        self.db.commit()
-        self.db.refresh(user)
+        # Written behind: the login does not wait for an UPDATE or hold a row lock
+        now = self._utc_now()
+        activity_recorder.record(user.id, login=True, at=now)
+        user_read = UserRead.model_validate(user).model_copy(update={"last_login_at": now, "last_seen_at": now})
+
+        if new_hash:
+            # Hashed with older argon2 costs: upgrade it now that we know the password.
+            # Conditional, so a password reset that lands first is not overwritten.
+            self.db.execute(
+                update(UserModel)
+                .where(UserModel.id == user.id, UserModel.password == user.password)
+                .values(password=new_hash)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
 
-        return UserRead.model_validate(user)
+        return user_read
 
 
 
+    @traced("AuthService.send_magic_link")
     def send_magic_link(self, email: str) -> UserRead:
         """
         Sets a new magic link token and expiration for a user, given their email.
         Returns the generated token.
         """
-        user = self.db.query(UserModel).filter(UserModel.email.ilike(email)).first()
-        if not user:
+        # The token embeds the stored name and email, so they are read first
+        found = self.db.execute(
+            select(UserModel.id, UserModel.first_name, UserModel.email).where(UserModel.email.ilike(email))
+        ).first()
+        if not found:
             raise ValueError("User not found")
 
         # Generate a secure random token
         token = create_token(
-            subject= user.first_name,
-            email=user.email,
+            subject= found.first_name,
+            email=found.email,
             expires_delta=timedelta(minutes=self.MAGIC_LINK_EXPIRY_MINUTES),
             token_type="magic-link")
                 
         # Set token and expiry
-        user.magic_link_token = token
-        user.magic_link_expires_at = self._generate_timestamp_str(minutes=self.MAGIC_LINK_EXPIRY_MINUTES)
-
+        user = UserRead.model_validate(self.db.scalar(
+            self._returning(
+                update(UserModel)
+                .where(UserModel.id == found.id)
+                .values(
+                    magic_link_token=token,
+                    magic_link_expires_at=self._utc_now(minutes=self.MAGIC_LINK_EXPIRY_MINUTES),
+                )
+            )
+        ))
         self.db.commit()
-        self.db.refresh(user)
+        self._publish_change(user.id)
 
         # Send verification email (mock)
         send_magic_link(user.email, token, user.first_name)
 
-        return UserRead.model_validate(user)
+        return user
     
     # ---------------------------
     # Password reset
     # ---------------------------
+    @traced("AuthService.password_reset")
     def password_reset(self, email: str, new_password: str):
-        user = self.db.query(UserModel).filter(UserModel.email == email).first()
-        if not user:
+        with span("argon2.hash"):
+            hashed_password = pwd_context.hash(new_password)
+        user_id = self.db.scalar(
+            update(UserModel)
+            .where(UserModel.email == email)
+            .values(password=hashed_password)
+            .returning(UserModel.id)
+        )
+        if user_id is None:
             raise ValueError("User not found")
-
-        user.password = pwd_context.hash(new_password)
         self.db.commit()
-        self.db.refresh(user)
+        self._publish_change(user_id)
 
         # Optionally send confirmation email
         # send_password_reset_confirmation(user.email)
         return True
 
+    def is_admin(self, user_id: int) -> bool:
+        role = user_roles.get(user_id)
+        if role is None:
+            user = self.db.get(UserModel, user_id)
+            if not user:
+                return False
+            role = user.role
+            user_roles.set(user_id, role, tags=[_user_tag(user_id)])
+        return role == "admin"
+
     def active_login_minutes(self, email: int):
         minutes_logged_in = -1 # -1 = never logged in
-        user = self.db.query(UserModel).filter(UserModel.email == email).first()
+        user = self.db.scalar(select(UserModel).where(UserModel.email == email))
         if not user:
             raise ValueError("User not found")
         if user.last_login_at:
-            last_login_dt = parser.parse(user.last_login_at)
-            now = datetime.now(timezone.utc)
-            delta = now - last_login_dt 
+            delta = self._utc_now() - self._as_utc(user.last_login_at)
             minutes_logged_in = int(delta.total_seconds() // 60)
         return minutes_logged_in
     
@@ -223,7 +316,49 @@ class AuthService:
     # Internal helpers
     # ---------------------------
     
-    def _generate_timestamp_str(self, minutes: int = 0) -> str:
-        now_dt=datetime.now(timezone.utc) + timedelta(minutes=minutes)
-        now_str = now_dt.isoformat(timespec="microseconds").replace("+00:00", "Z")
-        return now_str
+    def _verify_used_token(self, magic_link_token: str, now: datetime) -> UserModel:
+        # Only reached when no unexpired row holds the token: it expired, was already used, or is bogus
+        expired = self.db.scalar(
+            select(UserModel.id).where(UserModel.magic_link_token.ilike(magic_link_token))
+        )
+        if expired is not None:
+            raise ValueError("Your Verification link has expired. Please reset your password to generate a new link.")
+
+        # If we don't find a user with that token the user may have already verified
+        # so we decode the token to get the email and check if that user is verified
+        
+        token_payload = decode_token(magic_link_token)  # Will raise ValueError if invalid
+        token_payload_type = token_payload.get("token_type")
+        if token_payload_type != "magic-link":
+            raise ValueError("Invalid token type")
+
+        # The user can use this token multiple time until it expires with out any issue
+        expires_at = datetime.fromtimestamp(token_payload.get("exp", 0), tz=timezone.utc)
+        if expires_at < now:
+            raise ValueError("Your Verification link has expired. Please reset your password to generate a new link.")
+
+        found_user = self.db.scalar(
+            self._returning(
+                update(UserModel)
+                .where(UserModel.email == token_payload.get("email"), UserModel.is_verified.is_(True))
+                .values(last_login_at=now)
+            )
+        )
+        if not found_user:
+            # If we still can't find a verified user, the token is invalid
+            raise ValueError("Invalid or expired verification link. Please reset your password to generate a new link.")
+        return found_user
+
+    def _returning(self, stmt):
+        # UPDATE ... RETURNING the whole row: the statement's result replaces db.refresh()
+        return stmt.returning(UserModel).execution_options(synchronize_session=False)
+
+    def _publish_change(self, user_id: int) -> None:
+        user_roles.invalidate(tags=[_user_tag(user_id)])
+
+    def _utc_now(self, minutes: int = 0) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(minutes=minutes)
+
+    def _as_utc(self, value: datetime) -> datetime:
+        # SQLite hands timestamps back without a zone; every stored value is UTC
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,51 @@
+# services/event_service.py
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models.event import EventModel
+from app.schemas.event import EventCreate, EventRead
+
+
+class EventService:
+    """
+    Handles events (symposia). Posters, assignments and scores all belong to one event.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_events(self) -> list[EventRead]:
+        events = self.db.scalars(select(EventModel).order_by(EventModel.id.desc())).all()
+        return [EventRead.model_validate(event) for event in events]
+
+    def create_event(self, event_data: EventCreate) -> EventRead:
+        if event_data.is_active:
+            self._deactivate_all()
+        event = EventModel(**event_data.model_dump())
+        self.db.add(event)
+        self.db.commit()
+        self.db.refresh(event)
+        return EventRead.model_validate(event)
+
+    def activate_event(self, event_id: int) -> EventRead:
+        event = self.db.get(EventModel, event_id)
+        if not event:
+            raise ValueError("Event not found")
+        self._deactivate_all()
+        event.is_active = True
+        self.db.commit()
+        self.db.refresh(event)
+        return EventRead.model_validate(event)
+
+    def current_event_id(self) -> Optional[int]:
+        """Id of the active event, used when a request does not name one."""
+        return self.db.scalar(
+            select(EventModel.id).where(EventModel.is_active.is_(True)).order_by(EventModel.id.desc()).limit(1)
+        )
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _deactivate_all(self):
+        self.db.execute(update(EventModel).where(EventModel.is_active.is_(True)).values(is_active=False))
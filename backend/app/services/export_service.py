@@ -0,0 +1,215 @@
+# services/export_service.py
+import csv
+import json
+from enum import Enum
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from app.models.poster import PosterModel
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet exports are optional
+    pa = None
+    pq = None
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+# Column name and python type, in output order
+SCORE_COLUMNS = [
+    ("event_id", int),
+    ("poster_id", int),
+    ("judge_id", int),
+    ("session", str),
+    ("title", str),
+    ("author", str),
+    ("score", float),
+]
+
+RANKING_COLUMNS = [
+    ("event_id", int),
+    ("session", str),
+    ("rank", int),
+    ("title", str),
+    ("author", str),
+    ("mean_score", float),
+    ("num_scores", int),
+]
+
+
+class ExportService:
+    """
+    Streams score and ranking data out of the database without materializing it.
+
+    Rows are read through a server-side cursor `CHUNK_ROWS` at a time and each
+    chunk is encoded and handed to the caller before the next one is fetched, so
+    memory use depends on the chunk size rather than on the size of the event.
+    """
+    CHUNK_ROWS = 1000
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ---------------------------
+    # Row sources
+    # ---------------------------
+    def score_rows(self, event_id: Optional[int] = None, judge_id: Optional[int] = None, session: Optional[str] = None) -> Iterator[dict]:
+        stmt = (
+            select(
+                PosterModel.event_id,
+                PosterModel.id.label("poster_id"),
+                PosterModel.judge_id,
+                PosterModel.session,
+                PosterModel.title,
+                PosterModel.author,
+                PosterModel.score,
+            )
+            .order_by(PosterModel.event_id, PosterModel.judge_id, PosterModel.id)
+        )
+        stmt = self._filter(stmt, event_id, judge_id, session)
+        return self._stream(stmt)
+
+    def ranking_rows(self, event_id: Optional[int] = None, judge_id: Optional[int] = None, session: Optional[str] = None) -> Iterator[dict]:
+        mean_score = func.avg(PosterModel.score)
+        stmt = (
+            select(
+                PosterModel.event_id,
+                PosterModel.session,
+                func.rank().over(
+                    partition_by=(PosterModel.event_id, PosterModel.session), order_by=mean_score.desc()
+                ).label("rank"),
+                PosterModel.title,
+                PosterModel.author,
+                mean_score.label("mean_score"),
+                func.count(PosterModel.id).label("num_scores"),
+            )
+            .group_by(PosterModel.event_id, PosterModel.session, PosterModel.title, PosterModel.author)
+            .order_by(PosterModel.event_id, PosterModel.session, mean_score.desc(), PosterModel.title)
+        )
+        stmt = self._filter(stmt, event_id, judge_id, session)
+        return self._stream(stmt)
+
+    # ---------------------------
+    # Encoders
+    # ---------------------------
+    def encode(self, rows: Iterable[dict], columns: list, export_format: ExportFormat) -> Iterator[bytes]:
+        if export_format == ExportFormat.CSV:
+            return self._encode_csv(rows, columns)
+        if export_format == ExportFormat.NDJSON:
+            return self._encode_ndjson(rows)
+        if export_format == ExportFormat.PARQUET:
+            if pa is None:
+                raise ValueError("Parquet export requires pyarrow to be installed")
+            return self._encode_parquet(rows, columns)
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _filter(self, stmt, event_id: Optional[int], judge_id: Optional[int], session: Optional[str]):
+        if event_id is not None:
+            stmt = stmt.where(PosterModel.event_id == event_id)
+        if judge_id is not None:
+            stmt = stmt.where(PosterModel.judge_id == judge_id)
+        if session is not None:
+            stmt = stmt.where(PosterModel.session == session)
+        return stmt
+
+    def _stream(self, stmt) -> Iterator[dict]:
+        # yield_per turns on stream_results, i.e. a server-side cursor on Postgres
+        result = self.db.execute(stmt.execution_options(yield_per=self.CHUNK_ROWS))
+        for row in result.mappings():
+            yield dict(row)
+
+    def _chunks(self, rows: Iterable[dict]) -> Iterator[list[dict]]:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.CHUNK_ROWS:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _encode_csv(self, rows: Iterable[dict], columns: list) -> Iterator[bytes]:
+        buffer = _ChunkBuffer()
+        writer = csv.writer(_TextAdapter(buffer))
+        writer.writerow([name for name, _ in columns])
+        for chunk in self._chunks(rows):
+            writer.writerows([[row[name] for name, _ in columns] for row in chunk])
+            yield buffer.drain()
+        tail = buffer.drain()
+        if tail:
+            yield tail
+
+    def _encode_ndjson(self, rows: Iterable[dict]) -> Iterator[bytes]:
+        for chunk in self._chunks(rows):
+            yield "".join(json.dumps(row) + "\n" for row in chunk).encode("utf-8")
+
+    def _encode_parquet(self, rows: Iterable[dict], columns: list) -> Iterator[bytes]:
+        arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+        schema = pa.schema([(name, arrow_types[kind]) for name, kind in columns])
+        buffer = _ChunkBuffer()
+        # One row group per chunk; the footer is written when the writer closes
+        with pq.ParquetWriter(buffer, schema) as writer:
+            for chunk in self._chunks(rows):
+                writer.write_batch(pa.RecordBatch.from_pylist(chunk, schema=schema))
+                yield buffer.drain()
+        tail = buffer.drain()
+        if tail:
+            yield tail
+
+
+class _ChunkBuffer:
+    """Write-only binary sink whose contents are drained after every chunk."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+class _TextAdapter:
+    """Lets csv.writer write text straight into a _ChunkBuffer."""
+
+    def __init__(self, buffer: _ChunkBuffer):
+        self._buffer = buffer
+
+    def write(self, text: str) -> int:
+        return self._buffer.write(text.encode("utf-8"))
@@ -0,0 +1,70 @@
+# services/housekeeping_service.py
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+from app.models.idempotency_key import IdempotencyKeyModel
+from app.models.user import UserModel
+
+load_dotenv()
+IDEMPOTENCY_KEY_RETENTION_DAYS = int(os.getenv("IDEMPOTENCY_KEY_RETENTION_DAYS", "7"))
+
+
+class HousekeepingService:
+    """
+    Removes data nobody can use anymore.
+
+    Work is done in small chunks, each selected through an index and committed on
+    its own, so no statement holds row locks for long.
+    """
+    CHUNK_ROWS = 500
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def clear_expired_magic_links(self) -> int:
+        """Clears magic link tokens past their expiry. Returns the number of users updated."""
+        now = datetime.now(timezone.utc)
+        return self._in_chunks(
+            lambda: update(UserModel)
+            .where(
+                UserModel.id.in_(
+                    select(UserModel.id)
+                    .where(UserModel.magic_link_expires_at < now)  # ix_users_magic_link_expires_at
+                    .limit(self.CHUNK_ROWS)
+                    .scalar_subquery()
+                )
+            )
+            .values(magic_link_token=None, magic_link_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    def delete_expired_idempotency_keys(self, retention: timedelta = timedelta(days=IDEMPOTENCY_KEY_RETENTION_DAYS)) -> int:
+        """Deletes idempotency keys older than the retention period. Returns the number deleted."""
+        cutoff = datetime.now(timezone.utc) - retention
+        return self._in_chunks(
+            lambda: delete(IdempotencyKeyModel)
+            .where(
+                IdempotencyKeyModel.id.in_(
+                    select(IdempotencyKeyModel.id)
+                    .where(IdempotencyKeyModel.created_at < cutoff)  # ix_idempotency_keys_created_at
+                    .limit(self.CHUNK_ROWS)
+                    .scalar_subquery()
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _in_chunks(self, make_statement) -> int:
+        total = 0
+        while True:
+            rows = self.db.execute(make_statement()).rowcount
+            self.db.commit()
+            total += rows
+            if rows < self.CHUNK_ROWS:
+                return total
@@ -0,0 +1,340 @@
+# services/poster_service.py
+from datetime import datetime, timezone
+from typing import Callable, Optional, TypeVar
+from sqlalchemy import case, select, func, insert, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from app.models.idempotency_key import IdempotencyKeyModel
+from app.models.poster import PosterModel
+from app.schemas.poster import PosterRead, PosterUpdate, ScoreChange, ScoreChangeResult
+from app.services.score_log_service import ScoreLog, ScoreLogService, score_log
+from app.cache import TieredCache
+from app.utils.etag_util import VersionCounter
+
+T = TypeVar("T")
+
+# Version of each judge's poster set per event, bumped on every write (drives ETags on GET /posters)
+poster_versions = VersionCounter("posters")
+
+
+# Pages of a judge's posters, evicted on every worker (and from the shared store) when any of those posters change
+poster_pages = TieredCache("poster_pages", maxsize=4096, ttl=30.0, value_type=tuple[list[PosterRead], int])
+
+
+def _version_key(event_id: int, judge_id: int) -> str:
+    return f"{event_id}:{judge_id}"
+
+
+def _posters_tag(event_id: int, judge_id: int) -> str:
+    return f"posters:{event_id}:{judge_id}"
+
+
+class VersionConflict(ValueError):
+    """The poster changed after the version the client based its write on."""
+
+    def __init__(self, current: PosterRead):
+        super().__init__("Poster was changed by someone else")
+        self.current = current
+
+
+class BatchConflict(ValueError):
+    """A score batch lost every attempt to concurrent writes; the client can safely resend it."""
+
+
+class ScoreLogBehind(ValueError):
+    """Score changes are still waiting to be written to the log, so replaying it would revert them."""
+
+
+class PosterService:
+    """
+    Handles the posters assigned to a judge and the scores they give them.
+    Every score change is appended to the score log once it commits.
+
+    Writes are optimistic: each UPDATE only applies to the version of the poster
+    it read, so no row is locked while a judge edits, and a concurrent write is
+    never overwritten. Writes based on a version the client names fail with
+    VersionConflict; the others are retried on the newer version.
+    """
+    WRITE_ATTEMPTS = 3
+
+    def __init__(self, db: Session, log: Optional[ScoreLog] = None):
+        self.db = db
+        self.score_log = log or score_log
+
+    # ---------------------------
+    # Read (paginated)
+    # ---------------------------
+    def version(self, event_id: int, judge_id: int) -> int:
+        """Current version of a judge's poster set: a single primary-key lookup."""
+        return poster_versions.get(self.db, _version_key(event_id, judge_id))
+
+    def list_posters(self, event_id: int, judge_id: int, page: int = 1, limit: int = 10,
+                     version: Optional[int] = None) -> tuple[list[PosterRead], int]:
+        """
+        A page of the judge's posters, cached under the version of the poster set
+        (read first when not given). A load that races a write can only store its
+        rows under the version it started from, never under the newer one.
+        """
+        if version is None:
+            version = self.version(event_id, judge_id)
+        return poster_pages.get_or_load(
+            (event_id, judge_id, version, page, limit),
+            lambda: self._load_page(event_id, judge_id, page, limit),
+            tags=[_posters_tag(event_id, judge_id)],
+        )
+
+    def all_posters(self, event_id: int, judge_id: int) -> list[PosterRead]:
+        posters = self.db.scalars(
+            select(PosterModel).where(PosterModel.event_id == event_id, PosterModel.judge_id == judge_id).order_by(PosterModel.id)
+        ).all()
+        return [PosterRead.model_validate(poster) for poster in posters]
+
+    # ---------------------------
+    # Update
+    # ---------------------------
+    def update_poster(self, event_id: int, judge_id: int, poster_id: int, updated: PosterUpdate) -> PosterRead:
+        """Applies `updated`; when it carries a `version`, only if the poster is still at that version."""
+        def attempt() -> PosterRead:
+            poster = self._get_poster(event_id, judge_id, poster_id)
+            if updated.version is not None and poster.version != updated.version:
+                raise VersionConflict(PosterRead.model_validate(poster))
+            old_score = poster.score
+            for field, value in updated.model_dump(exclude_unset=True, exclude={"version"}).items():
+                setattr(poster, field, value)
+            new_score = poster.score
+            poster.version += 1
+            poster_versions.bump(self.db, _version_key(event_id, judge_id))
+            self.db.commit()
+            self._publish_change(event_id, judge_id)
+            if new_score != old_score:
+                self.score_log.record(event_id, poster_id, judge_id, old_score, new_score, "update")
+            self.db.refresh(poster)
+            return PosterRead.model_validate(poster)
+
+        return self._write(attempt)
+
+    # ---------------------------
+    # Batched score submission
+    # ---------------------------
+    def apply_score_batch(self, event_id: int, judge_id: int, changes: list[ScoreChange]) -> list[ScoreChangeResult]:
+        """
+        Applies a batch of score changes queued by an offline client in one transaction.
+        Every change carries a client-generated idempotency key; a key that was already
+        processed returns its stored result instead of being applied again.
+        Results are returned in request order. A change naming a `version` the poster
+        is no longer at is not applied and returns the poster's current state.
+        """
+        for _ in range(self.WRITE_ATTEMPTS):
+            try:
+                return self._apply_score_batch(event_id, judge_id, changes)
+            except (IntegrityError, StaleDataError):
+                # A concurrent replay recorded some of the same keys first (they are duplicates now),
+                # or a poster changed after it was read (its changes are checked again)
+                self.db.rollback()
+        raise BatchConflict("Scores kept changing while the batch was applied; send it again")
+
+    def _apply_score_batch(self, event_id: int, judge_id: int, changes: list[ScoreChange]) -> list[ScoreChangeResult]:
+        keys = list({change.idempotency_key for change in changes})
+        stored = {
+            row.key: ScoreChangeResult.model_validate(row.result).model_copy(update={"replayed": True})
+            for row in self.db.scalars(
+                select(IdempotencyKeyModel).where(
+                    IdempotencyKeyModel.user_id == judge_id, IdempotencyKeyModel.key.in_(keys)
+                )
+            )
+        }
+
+        pending = [change for change in changes if change.idempotency_key not in stored]
+        posters = {
+            poster.id: poster
+            for poster in self.db.scalars(
+                select(PosterModel).where(
+                    PosterModel.event_id == event_id, PosterModel.judge_id == judge_id,
+                    PosterModel.id.in_(list({change.poster_id for change in pending})),
+                )
+            )
+        } if pending else {}
+
+        # Changes are applied to copies; the rows are written by one conditional UPDATE below
+        current = {poster_id: PosterRead.model_validate(poster) for poster_id, poster in posters.items()}
+        results: dict[str, ScoreChangeResult] = {}
+        logged = []
+        for change in pending:
+            if change.idempotency_key in results:
+                # The same key twice in one batch: only the first occurrence counts
+                continue
+            poster = current.get(change.poster_id)
+            if poster and change.version is not None and poster.version != change.version:
+                result = ScoreChangeResult(
+                    idempotency_key=change.idempotency_key, poster_id=change.poster_id,
+                    status="conflict", poster=poster,
+                )
+            elif poster:
+                if poster.score != change.score:
+                    logged.append({
+                        "event_id": event_id, "poster_id": poster.id, "judge_id": judge_id, "criterion": "score",
+                        "old_value": poster.score, "new_value": change.score, "source": "batch",
+                        "changed_by": judge_id, "created_at": datetime.now(timezone.utc),
+                    })
+                poster = current[poster.id] = poster.model_copy(update={"score": change.score, "version": poster.version + 1})
+                result = ScoreChangeResult(
+                    idempotency_key=change.idempotency_key, poster_id=change.poster_id,
+                    status="applied", poster=poster,
+                )
+            else:
+                result = ScoreChangeResult(
+                    idempotency_key=change.idempotency_key, poster_id=change.poster_id, status="not_found",
+                )
+            results[change.idempotency_key] = result
+
+        if results:
+            self.db.execute(
+                insert(IdempotencyKeyModel),
+                [
+                    {"user_id": judge_id, "key": key, "result": result.model_dump(mode="json")}
+                    for key, result in results.items()
+                ],
+            )
+            changed = [poster for poster_id, poster in current.items() if poster.version != posters[poster_id].version]
+            if changed:
+                self._write_scores(posters, changed)
+            applied = any(result.status == "applied" for result in results.values())
+            if applied:
+                poster_versions.bump(self.db, _version_key(event_id, judge_id))
+            self.db.commit()
+            if applied:
+                self._publish_change(event_id, judge_id)
+            self.score_log.record_many(logged)
+
+        replayed_in_batch = {key: result.model_copy(update={"replayed": True}) for key, result in results.items()}
+        seen = set()
+        ordered = []
+        for change in changes:
+            key = change.idempotency_key
+            if key in stored:
+                ordered.append(stored[key])
+            elif key in seen:
+                ordered.append(replayed_in_batch[key])
+            else:
+                ordered.append(results[key])
+            seen.add(key)
+        return ordered
+
+    # ---------------------------
+    # Delete
+    # ---------------------------
+    def delete_poster(self, event_id: int, judge_id: int, poster_id: int) -> PosterRead:
+        def attempt() -> PosterRead:
+            poster = self._get_poster(event_id, judge_id, poster_id)
+            deleted = PosterRead.model_validate(poster)
+            self.db.delete(poster)
+            poster_versions.bump(self.db, _version_key(event_id, judge_id))
+            self.db.commit()
+            self._publish_change(event_id, judge_id)
+            self.score_log.record(event_id, poster_id, judge_id, deleted.score, None, "delete")
+            return deleted
+
+        return self._write(attempt)
+
+    # ---------------------------
+    # Rebuild from the score log
+    # ---------------------------
+    def rebuild_scores(self, event_id: int, admin_id: int, until: Optional[datetime] = None) -> int:
+        """
+        Sets every logged poster's score to its value replayed from the score log
+        (as of `until`, default now). Posters the log knows nothing about are left
+        alone. Each change is logged as a `rebuild` by `admin_id`, so later replays
+        include it. Returns the number of posters changed.
+
+        The log is flushed first: a change still buffered would otherwise be reverted
+        and the revert logged as intended. Only this worker's buffer can be flushed;
+        other workers' buffers are at most one flush interval behind.
+        """
+        self.score_log.flush()
+        if self.score_log.pending():
+            raise ScoreLogBehind("Score changes could not be written to the log yet; try again")
+        log = ScoreLogService(self.db)
+        latest_at = log.latest_at(event_id)
+        if until is not None and latest_at is not None and until > latest_at:
+            until = latest_at  # nothing stored is newer; later points in time are not known yet
+        scores = log.replay(event_id, until=until).scores()
+
+        def attempt() -> int:
+            posters = self.db.scalars(
+                select(PosterModel).where(PosterModel.event_id == event_id, PosterModel.id.in_(list(scores)))
+            ).all() if scores else []
+            logged = []
+            changed_judges = set()
+            for poster in posters:
+                if poster.score != scores[poster.id]:
+                    logged.append({
+                        "event_id": event_id, "poster_id": poster.id, "judge_id": poster.judge_id, "criterion": "score",
+                        "old_value": poster.score, "new_value": scores[poster.id], "source": "rebuild",
+                        "changed_by": admin_id, "created_at": datetime.now(timezone.utc),
+                    })
+                    poster.score = scores[poster.id]
+                    poster.version += 1
+                    changed_judges.add(poster.judge_id)
+            for judge_id in changed_judges:
+                poster_versions.bump(self.db, _version_key(event_id, judge_id))
+            self.db.commit()
+            for judge_id in changed_judges:
+                self._publish_change(event_id, judge_id)
+            self.score_log.record_many(logged)
+            return len(logged)
+
+        return self._write(attempt)
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _write(self, attempt: Callable[[], T]) -> T:
+        """Runs `attempt` (read, change, commit) again when a poster it changed was changed by someone else first."""
+        for _ in range(self.WRITE_ATTEMPTS - 1):
+            try:
+                return attempt()
+            except StaleDataError:
+                self.db.rollback()
+        return attempt()
+
+    def _write_scores(self, read: dict[int, PosterModel], changed: list[PosterRead]) -> None:
+        """One UPDATE for every changed poster, each only if it is still at the version that was read."""
+        updated = set(self.db.scalars(
+            update(PosterModel)
+            .where(tuple_(PosterModel.id, PosterModel.version).in_([(poster.id, read[poster.id].version) for poster in changed]))
+            .values(
+                score=case({poster.id: poster.score for poster in changed}, value=PosterModel.id),
+                version=case({poster.id: poster.version for poster in changed}, value=PosterModel.id),
+            )
+            .returning(PosterModel.id)
+            .execution_options(synchronize_session=False)
+        ))
+        if len(updated) != len(changed):
+            raise StaleDataError("Posters changed after they were read")
+
+    def _publish_change(self, event_id: int, judge_id: int) -> None:
+        # Published after the commit so no worker can refill its cache with the old rows
+        poster_pages.invalidate(tags=[_posters_tag(event_id, judge_id)])
+
+    def _load_page(self, event_id: int, judge_id: int, page: int, limit: int) -> tuple[list[PosterRead], int]:
+        total = self.db.scalar(
+            select(func.count(PosterModel.id)).where(PosterModel.event_id == event_id, PosterModel.judge_id == judge_id)
+        )
+        posters = self.db.scalars(
+            select(PosterModel)
+            .where(PosterModel.event_id == event_id, PosterModel.judge_id == judge_id)
+            .order_by(PosterModel.id)
+            .offset((page - 1) * limit)
+            .limit(limit)
+        ).all()
+        return [PosterRead.model_validate(poster) for poster in posters], total
+
+    def _get_poster(self, event_id: int, judge_id: int, poster_id: int) -> PosterModel:
+        poster = self.db.scalar(
+            select(PosterModel).where(PosterModel.id == poster_id, PosterModel.event_id == event_id, PosterModel.judge_id == judge_id)
+        )
+        if not poster:
+            raise ValueError("Poster not found")
+        return poster
@@ -0,0 +1,126 @@
+# services/scheduler_service.py
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+from app.models.core_db import SessionLocal
+from app.models.job_lock import JobLockModel
+from app.utils.metrics_util import metrics
+
+load_dotenv()
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "TRUE").upper() == "TRUE"
+
+logger = logging.getLogger(__name__)
+
+metrics.describe("job_runs", "counter", "Scheduled job runs by outcome (ok, failed, skipped when another worker holds the lease)")
+metrics.describe("job_duration_seconds", "summary", "Time spent running scheduled jobs")
+metrics.describe("job_rows", "counter", "Rows removed or cleared by scheduled jobs")
+metrics.describe("job_last_success_timestamp_seconds", "gauge", "Unix time of the last successful run")
+
+# Receives a session and returns the number of rows it touched
+JobFunc = Callable[[Session], int]
+
+
+@dataclass
+class Job:
+    name: str
+    interval_seconds: float
+    func: JobFunc
+    next_run: float = field(default=0.0)  # monotonic clock
+
+
+class JobScheduler:
+    """
+    Runs periodic jobs in a background thread of every worker.
+
+    Before each run a worker takes a lease on the job in the `job_locks` table, so
+    only one worker (across processes and nodes) runs a given job. The lease lasts
+    two intervals and is renewed by its holder on each run; if the holder dies,
+    another worker takes the job over once the lease expires.
+    """
+    TICK_SECONDS = 1.0
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.jobs: list[Job] = []
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_job(self, name: str, interval_seconds: float, func: JobFunc) -> None:
+        self.jobs.append(Job(name, interval_seconds, func, next_run=time.monotonic() + interval_seconds))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run_pending(self) -> None:
+        now = time.monotonic()
+        for job in self.jobs:
+            if job.next_run <= now:
+                job.next_run = now + job.interval_seconds
+                self.run_job(job)
+
+    def run_job(self, job: Job) -> Optional[int]:
+        """Runs a job if this worker gets its lease. Returns the rows touched, or None if skipped or failed."""
+        db = self.session_factory()
+        try:
+            if not self._acquire_lease(db, job):
+                metrics.inc("job_runs", job=job.name, outcome="skipped")
+                return None
+            started = time.perf_counter()
+            try:
+                rows = job.func(db)
+            except Exception:
+                db.rollback()
+                metrics.inc("job_runs", job=job.name, outcome="failed")
+                logger.exception("Scheduled job %s failed", job.name)
+                return None
+            finally:
+                metrics.observe("job_duration_seconds", time.perf_counter() - started, job=job.name)
+            metrics.inc("job_runs", job=job.name, outcome="ok")
+            metrics.inc("job_rows", rows, job=job.name)
+            metrics.set("job_last_success_timestamp_seconds", time.time(), job=job.name)
+            return rows
+        finally:
+            db.close()
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.TICK_SECONDS):
+            self.run_pending()
+
+    def _acquire_lease(self, db: Session, job: Job) -> bool:
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=2 * job.interval_seconds)
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(JobLockModel).values(name=job.name, holder=self.worker_id, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobLockModel.name],
+            set_={"holder": self.worker_id, "expires_at": expires_at},
+            # Taken over only when the lease ran out, or renewed by its holder
+            where=(JobLockModel.expires_at < now) | (JobLockModel.holder == self.worker_id),
+        )
+        holder = db.scalar(stmt.returning(JobLockModel.holder))
+        db.commit()
+        return holder == self.worker_id
@@ -0,0 +1,117 @@
+# services/search_service.py
+import difflib
+import re
+from functools import reduce
+from typing import Optional
+from sqlalchemy import select, func, or_, literal, literal_column, table, column
+from sqlalchemy.orm import Session
+from app.models.poster import PosterModel
+from app.schemas.poster import PosterRead, PosterSearchHit
+
+# Words only: keeps the query safe to splice into tsquery / FTS5 MATCH syntax
+TERM_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+posters_fts = table("posters_fts", column("rowid"))
+posters_fts_vocab = table("posters_fts_vocab", column("term"))
+
+
+class PosterSearchService:
+    """
+    Ranked full-text search over poster title, author and abstract.
+
+    Terms match as prefixes ("Autoph" finds "Autophagy") and a misspelled
+    term still finds the word it was meant to be. Postgres uses the
+    `search_vector` GIN index and pg_trgm word similarity; SQLite uses FTS5
+    with bm25 ranking and corrects typos against the FTS5 vocabulary.
+    """
+    MAX_TERMS = 8
+    MAX_CORRECTIONS = 3  # alternative spellings tried per misspelled term
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(self, query: str, event_id: Optional[int] = None, judge_id: Optional[int] = None, limit: int = 20) -> list[PosterSearchHit]:
+        terms = [term.lower() for term in TERM_PATTERN.findall(query)][: self.MAX_TERMS]
+        if not terms:
+            return []
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            stmt = self._postgresql_statement(terms)
+        else:
+            stmt = self._sqlite_statement(terms)
+
+        if event_id is not None:
+            stmt = stmt.where(PosterModel.event_id == event_id)
+        if judge_id is not None:
+            stmt = stmt.where(PosterModel.judge_id == judge_id)
+        stmt = stmt.order_by(literal_column("rank").desc(), PosterModel.id).limit(limit)
+
+        return [self._hit(poster, rank) for poster, rank in self.db.execute(stmt)]
+
+    # ---------------------------
+    # Postgres
+    # ---------------------------
+    def _postgresql_statement(self, terms: list[str]):
+        search_vector = literal_column("posters.search_vector")
+        # Title and author are indexed unstemmed ('simple'), the abstract stemmed ('english'):
+        # each term matches either way, so "pathways" also finds the abstract's "pathway"
+        tsquery = reduce(lambda left, right: left.op("&&")(right), (
+            func.to_tsquery("simple", f"{term}:*").op("||")(func.to_tsquery("english", f"{term}:*"))
+            for term in terms
+        ))
+        phrase = literal(" ".join(terms))
+        title = func.lower(PosterModel.title)
+        author = func.lower(PosterModel.author)
+        rank = (
+            func.ts_rank(search_vector, tsquery)
+            + func.greatest(func.word_similarity(phrase, title), func.word_similarity(phrase, author))
+        )
+        return select(PosterModel, rank.label("rank")).where(
+            or_(
+                search_vector.op("@@")(tsquery),
+                # `<%` is served by the trigram indexes and tolerates typos
+                phrase.op("<%")(title),
+                phrase.op("<%")(author),
+            )
+        )
+
+    # ---------------------------
+    # SQLite FTS5
+    # ---------------------------
+    def _sqlite_statement(self, terms: list[str]):
+        match = " AND ".join(self._fts5_term(term) for term in terms)
+        # bm25 is lower-is-better; title and author weigh more than the abstract
+        rank = -func.bm25(literal_column("posters_fts"), 10.0, 10.0, 1.0)
+        return (
+            select(PosterModel, rank.label("rank"))
+            .join(posters_fts, posters_fts.c.rowid == PosterModel.id)
+            .where(literal_column("posters_fts").op("MATCH")(match))
+        )
+
+    def _fts5_term(self, term: str) -> str:
+        prefix_hit = self.db.scalar(
+            select(posters_fts_vocab.c.term)
+            .where(posters_fts_vocab.c.term >= term, posters_fts_vocab.c.term < term + "\uffff")
+            .limit(1)
+        )
+        if prefix_hit is not None:
+            return f'"{term}"*'
+
+        # No word starts with the term: look for close spellings sharing its first letter
+        candidates = self.db.scalars(
+            select(posters_fts_vocab.c.term).where(
+                posters_fts_vocab.c.term >= term[0],
+                posters_fts_vocab.c.term < term[0] + "\uffff",
+                func.length(posters_fts_vocab.c.term).between(len(term) - 2, len(term) + 2),
+            )
+        ).all()
+        corrections = difflib.get_close_matches(term, candidates, n=self.MAX_CORRECTIONS, cutoff=0.75)
+        alternatives = [f'"{term}"*'] + [f'"{correction}"' for correction in corrections]
+        return "(" + " OR ".join(alternatives) + ")"
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _hit(self, poster: PosterModel, rank: float) -> PosterSearchHit:
+        return PosterSearchHit(**PosterRead.model_validate(poster).model_dump(), rank=float(rank))
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import zlib
+from typing import Callable, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from dotenv import load_dotenv
+from app.cache.local import LocalCache
+from app.utils.metrics_util import metrics
+
+try:
+    import brotli
+except ImportError:  # br is offered only when brotli is installed
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # zstd is offered only when zstandard is installed
+    zstandard = None
+
+load_dotenv()
+# Smaller bodies go out as they are; compressing them saves less than the header costs
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "500"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+
+# Tried in this order when the client accepts several with the same q-value
+ENCODINGS = tuple(
+    encoding for encoding, available in (("zstd", zstandard), ("br", brotli), ("gzip", zlib)) if available
+)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml", "application/javascript", "image/svg+xml")
+
+metrics.describe("compression_cache", "counter", "Lookups of precompressed response bodies by outcome")
+
+# Compressed bodies of responses that carry an ETag, keyed by encoding and body digest
+compressed_bodies = LocalCache("compressed_bodies", maxsize=256, ttl=300.0)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Content coding to answer with for an Accept-Encoding header, or None to send the body as is."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compressor(encoding: str) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """(compress, finish) pair of a streaming compressor for `encoding`."""
+    if encoding == "zstd":
+        stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        return stream.compress, stream.flush
+    if encoding == "br":
+        stream = brotli.Compressor(quality=BROTLI_QUALITY)
+        return stream.process, stream.finish
+    stream = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    return stream.compress, stream.flush
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        # One-shot frames record the content size, which lets clients size their buffer
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    compress_chunk, finish = compressor(encoding)
+    return compress_chunk(body) + finish()
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the best coding the client accepts (zstd, br or gzip).
+
+    Bodies sent in one piece are compressed only from `minimum_size` bytes on. Streamed
+    bodies are compressed chunk by chunk as they go out, without buffering. The compressed
+    body of a response with an ETag is kept in `compressed_bodies`, so identical hot
+    payloads are compressed once rather than on every request.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.minimum_size).send)
+
+
+class _CompressingSender:
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self._start: Optional[Message] = None
+        self._passthrough = False
+        self._compress: Optional[Callable[[bytes], bytes]] = None
+        self._finish: Optional[Callable[[], bytes]] = None
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+        elif message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            if not self._compressible(message["status"], headers):
+                self._passthrough = True
+                await self._send(message)
+            else:
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+        elif message["type"] != "http.response.body":
+            await self._send(message)
+        elif self._compress is not None:
+            await self._send_chunk(message)
+        elif message.get("more_body", False):
+            await self._start_stream(message)
+        else:
+            await self._send_whole(message)
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _compressible(self, status: int, headers: Headers) -> bool:
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        content_length = headers.get("content-length")
+        if content_length is not None and int(content_length) < self.minimum_size:
+            return False
+        return headers.get("content-type", "").lower().startswith(COMPRESSIBLE_TYPES)
+
+    def _encoded_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self._start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        # The compressed bytes differ from the identity ones, so the validator can only be weak
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        return headers
+
+    async def _send_whole(self, message: Message) -> None:
+        body = message.get("body", b"")
+        if len(body) < self.minimum_size:
+            await self._send(self._start)
+            await self._send(message)
+            return
+        cacheable = self._start["status"] == 200 and "etag" in Headers(raw=self._start["headers"])
+        compressed = None
+        if cacheable:
+            key = (self.encoding, hashlib.blake2b(body, digest_size=16).hexdigest())
+            compressed = compressed_bodies.get(key)
+            metrics.inc("compression_cache", outcome="miss" if compressed is None else "hit")
+        if compressed is None:
+            compressed = compress(body, self.encoding)
+            if cacheable:
+                compressed_bodies.set(key, compressed)
+        headers = self._encoded_headers()
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+    async def _start_stream(self, message: Message) -> None:
+        headers = self._encoded_headers()
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        self._compress, self._finish = compressor(self.encoding)
+        await self._send(self._start)
+        await self._send_chunk(message)
+
+    async def _send_chunk(self, message: Message) -> None:
+        more_body = message.get("more_body", False)
+        chunk = self._compress(message.get("body", b""))
+        if not more_body:
+            chunk += self._finish()
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,68 @@
+import base64
+import html
+import random
+import sys
+from email.header import Header
+from string import Formatter
+from typing import Optional
+
+
+def _header_value(value: str) -> str:
+    # RFC 2047-encode only when needed; plain ASCII goes out as is
+    return value if value.isascii() else Header(value, "utf-8").encode()
+
+
+class EmailTemplate:
+    """
+    HTML email compiled once and rendered per recipient.
+
+    The HTML is split into literal chunks and `{field}` names up front, and every
+    MIME header and part boundary is rendered once. Rendering a message only fills
+    in the fields (HTML-escaped), base64-encodes the body and joins the cached pieces,
+    instead of parsing a format string and building and flattening a MIMEMultipart
+    for each recipient.
+    """
+
+    def __init__(self, subject: str, sender: str, message_html: str):
+        self.subject = subject
+        self.sender = sender
+        self._chunks: list[tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(message_html):
+            if spec or conversion:
+                raise ValueError(f"Unsupported format in email template field {{{field}}}")
+            self._chunks.append((literal, field))
+        self.fields = frozenset(field for _, field in self._chunks if field is not None)
+
+        # The body is base64, so it can never contain the boundary
+        boundary = f"==============={random.randrange(sys.maxsize):019d}=="
+        self._head = (
+            f'Content-Type: multipart/mixed; boundary="{boundary}"\n'
+            "MIME-Version: 1.0\n"
+            f"Subject: {_header_value(subject)}\n"
+        )
+        self._between = (
+            f"From: {_header_value(sender)}\n"
+            "\n"
+            "I am not using a MIME-aware mail reader.\n"
+            "\n"
+            f"--{boundary}\n"
+            'Content-Type: text/html; charset="utf-8"\n'
+            "MIME-Version: 1.0\n"
+            "Content-Transfer-Encoding: base64\n"
+            "\n"
+        )
+        self._tail = f"\n--{boundary}--\n"
+
+    def render_html(self, **values) -> str:
+        missing = self.fields - values.keys()
+        if missing:
+            raise ValueError(f"Missing email template fields: {', '.join(sorted(missing))}")
+        return "".join(
+            literal if field is None else literal + html.escape(str(values[field]))
+            for literal, field in self._chunks
+        )
+
+    def render(self, receiver: str, **values) -> str:
+        """Complete message, ready for `smtplib.SMTP.sendmail`."""
+        body = base64.encodebytes(self.render_html(**values).encode("utf-8")).decode("ascii")
+        return f"{self._head}To: {_header_value(receiver)}\n{self._between}{body}{self._tail}"
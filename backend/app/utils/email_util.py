@@ -9,7 +9,9 @@ import logging
 import os
 from datetime import datetime
 from dotenv import load_dotenv
+from app.utils.email_template_util import EmailTemplate
 from app.utils.geolocation import get_geolocation
+from app.utils.tracing_util import span, traced
  
 load_dotenv()
 
@@ -41,99 +43,44 @@ def email_results(receiver, the_file, message_text=None):
     send_message_ssl(sender, receiver, message)
 
 def send_email_verification(receiver, verification_token, first_name):
-    subject = 'Please Verify your email'
-    sender = "judging_app@gmail.com"
     redirect_url = f"{REACT_APP_URL}/verify/{verification_token}"
-    
-    message_html = VERIFICATION_MESSAGE.format(first_name=first_name, redirect_url=redirect_url)
-    
-    message = construct_message_with_html(subject, sender, receiver, message_html=message_html)
-    send_message_ssl(sender, receiver, message)
+    message = VERIFICATION_EMAIL.render(receiver, first_name=first_name, redirect_url=redirect_url)
+    send_message_ssl(VERIFICATION_EMAIL.sender, receiver, message)
 
 def send_magic_link(receiver, verification_token, first_name):
-    subject = 'Please Verify your email'
-    sender = "judging_app@gmail.com"
     redirect_url = f"{REACT_APP_URL}/verify/{verification_token}"
-    
-    message_html = MAGIC_LINK_MESSAGE.format(first_name=first_name, redirect_url=redirect_url)
-    
-    message = construct_message_with_html(subject, sender, receiver, message_html=message_html)
-    send_message_ssl(sender, receiver, message)
+    message = MAGIC_LINK_EMAIL.render(receiver, first_name=first_name, redirect_url=redirect_url)
+    send_message_ssl(MAGIC_LINK_EMAIL.sender, receiver, message)
+
+def send_judge_invitations(invitations):
+    """Send judge invitations over one SMTP connection.
+
+    `invitations` is an iterable of (receiver, verification_token, first_name).
+    Yields (receiver, sent) for every invitation so callers can report progress.
+    """
+    def messages():
+        for receiver, verification_token, first_name in invitations:
+            redirect_url = f"{REACT_APP_URL}/verify/{verification_token}"
+            yield receiver, JUDGE_INVITATION_EMAIL.render(receiver, first_name=first_name, redirect_url=redirect_url)
+
+    yield from send_messages_ssl(JUDGE_INVITATION_EMAIL.sender, messages())
 
 def reset_password_email(receiver, verification_token, first_name, requesting_ip):
     now = datetime.now()
     request_time = now.strftime("%b %d %Y %I:%M:%S %p")
     geolocation = get_geolocation(requesting_ip)
         
-    subject = 'Reset Password Request'
-    sender = "llm_researcher@gmail.com"
-    
-    message_html = f"""
-    <html>
-    <style>
-        .container {{
-            display: table;
-            width: 100%;
-            border-collapse: collapse;
-        }}
-
-        .row {{
-            display: table-row;
-        }}
-
-        .cell {{
-            display: table-cell;
-            padding: 8px;
-            border: 1px solid #ccc;
-        }}
-
-        .label {{
-            font-weight: bold;
-        }}
-    </style>
-        <body>
-            <h1>Reset your password</h1>
-            <p>Dear { first_name },</p>
-            <p>You are receiving this email as there has been a request to reset your password.</p>
-            <div>
-                <a href="REDIRECT_URL/reset-password/{verification_token}">
-                <button style="background-color: #4CAF50; color: white; padding: 10px 20px; border: none; border-radius: 5px; cursor: pointer;">
-                    Reset Password
-                </button>
-                </a>
-            </div>
-            <div>
-            <p>The request came from the following location. If this was not you, you can safely ignore this email.</p>
-            </div>
-            <div class="container">
-                <div class="row">
-                    <div class="cell label">IP</div>
-                    <div class="cell value">{requesting_ip}</div>
-                </div>
-                <div class="row">
-                    <div class="cell label">Time</div>
-                    <div class="cell value">{request_time}</div>
-                </div>
-                <div class="row">
-                    <div class="cell label">City</div>
-                    <div class="cell value">{geolocation['city']}</div>
-                </div>
-                <div class="row">
-                    <div class="cell label">Region</div>
-                    <div class="cell value">{geolocation['region']}</div>
-                </div>
-                <div class="row">
-                    <div class="cell label">Country</div>
-                    <div class="cell value">{geolocation['country']}</div>
-                </div>
-            </div>
-            <p>Thanks,</p>
-            <p>Dan</p>
-        </body>
-    </html>
-    """
-    message = construct_message_with_html(subject, sender, receiver, message_html=message_html)
-    send_message_ssl(sender, receiver, message)
+    message = RESET_PASSWORD_EMAIL.render(
+        receiver,
+        first_name=first_name,
+        redirect_url=f"{REACT_APP_URL}/reset-password/{verification_token}",
+        requesting_ip=requesting_ip,
+        request_time=request_time,
+        city=geolocation['city'],
+        region=geolocation['region'],
+        country=geolocation['country'],
+    )
+    send_message_ssl(RESET_PASSWORD_EMAIL.sender, receiver, message)
 
 def construct_message_with_html(subject, sender, receiver, message_text=None, message_html=None):
     the_message = MIMEMultipart()
@@ -170,6 +117,7 @@ def construct_message_with_attachment(subject, sender, receiver, message_text, t
     return the_message.as_string()
 
 
+@traced("smtp.send")
 def send_message(sender, receiver, message):
     try:
         port = 587
@@ -188,6 +136,7 @@ def send_message(sender, receiver, message):
         logging.debug("SMTP sent to: {}".format(receiver))
 
 
+@traced("smtp.send")
 def send_message_ssl(sender, receiver, message):
     try:
         port = 465
@@ -205,6 +154,57 @@ def send_message_ssl(sender, receiver, message):
         logging.debug("SMTP sent to: {}".format(receiver))
 
 
+def send_messages_ssl(sender, messages):
+    """Send many messages over a single authenticated SMTP connection.
+
+    `messages` is an iterable of (receiver, message). Yields (receiver, sent) per
+    message. The connection is reopened once if the server drops it mid-batch.
+    """
+    server = None
+    unreachable = False
+    try:
+        for receiver, message in messages:
+            sent = False
+            for _attempt in range(0 if unreachable else 2):
+                try:
+                    if server is None:
+                        server = _open_smtp_ssl()
+                    with span("smtp.sendmail"):
+                        server.sendmail(sender, receiver, message)
+                    sent = True
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    logging.debug("SMTP connection dropped, reconnecting")
+                    server = None
+                except (gaierror, ConnectionRefusedError):
+                    logging.debug("Failed to connect to the server. Bad connection settings?")
+                    unreachable = True
+                    break
+                except smtplib.SMTPException as e:
+                    logging.debug("SMTP error occurred: {}".format(str(e)))
+                    # A failure while connecting/logging in will not fix itself for the next receiver
+                    unreachable = server is None
+                    break
+            if sent:
+                logging.debug("SMTP sent to: {}".format(receiver))
+            yield receiver, sent
+    finally:
+        if server is not None:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                pass
+
+
+@traced("smtp.connect")
+def _open_smtp_ssl():
+    port = 465
+    context = ssl.create_default_context()
+    server = smtplib.SMTP_SSL(SMTP_SERVER, port, context=context)
+    server.login(SMTP_LOGIN, SMTP_PASSWD)
+    return server
+
+
 VERIFICATION_MESSAGE = """
 <html>
   <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; background-color: #f9f9f9; padding: 20px;">
@@ -306,3 +306,121 @@ MAGIC_LINK_MESSAGE = """
   </body>
 </html>
 """
+
+JUDGE_INVITATION_MESSAGE = """
+<html>
+  <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; background-color: #f9f9f9; padding: 20px;">
+    <div style="max-width: 600px; margin: auto; background: #fff; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); padding: 30px;">
+
+      <!-- Header / Logo -->
+      <h1 style="color:#09a1ec; text-align: center;">You are invited to judge on the Judging App!</h1>
+
+      <!-- Greeting -->
+      <p>Dear {first_name},</p>
+
+      <!-- Welcome message -->
+      <p>
+        You have been added to the judging panel.
+        Click the button below to activate your account and see the posters assigned to you.
+        This link is valid for 7 days.
+      </p>
+
+      <!-- Call-to-action button -->
+      <div style="text-align: center; margin: 30px 0;">
+        <a href="{redirect_url}"
+           style="display: inline-block; background-color: #09a1ec; color: white; text-decoration: none; 
+                  padding: 12px 25px; border-radius: 5px; font-weight: bold;">
+          Start Judging
+        </a>
+      </div>
+
+      <!-- Fallback link -->
+      <p>If the button above doesn’t work, copy and paste the following link into your browser:</p>
+      <p style="word-break: break-all;">
+        <a href="{redirect_url}" style="color:#09a1ec;">{redirect_url}</a>
+      </p>
+
+      <p>Best regards,<br>Dan</p>
+
+      <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
+
+      <!-- Footer / support -->
+      <p style="font-size: 12px; color: #999; text-align: center;">
+        If you were not expecting this invitation, please ignore this email or contact our support team.
+      </p>
+
+    </div>
+  </body>
+</html>
+"""
+
+RESET_PASSWORD_MESSAGE = """
+<html>
+<style>
+    .container {{
+        display: table;
+        width: 100%;
+        border-collapse: collapse;
+    }}
+
+    .row {{
+        display: table-row;
+    }}
+
+    .cell {{
+        display: table-cell;
+        padding: 8px;
+        border: 1px solid #ccc;
+    }}
+
+    .label {{
+        font-weight: bold;
+    }}
+</style>
+    <body>
+        <h1>Reset your password</h1>
+        <p>Dear {first_name},</p>
+        <p>You are receiving this email as there has been a request to reset your password.</p>
+        <div>
+            <a href="{redirect_url}">
+            <button style="background-color: #4CAF50; color: white; padding: 10px 20px; border: none; border-radius: 5px; cursor: pointer;">
+                Reset Password
+            </button>
+            </a>
+        </div>
+        <div>
+        <p>The request came from the following location. If this was not you, you can safely ignore this email.</p>
+        </div>
+        <div class="container">
+            <div class="row">
+                <div class="cell label">IP</div>
+                <div class="cell value">{requesting_ip}</div>
+            </div>
+            <div class="row">
+                <div class="cell label">Time</div>
+                <div class="cell value">{request_time}</div>
+            </div>
+            <div class="row">
+                <div class="cell label">City</div>
+                <div class="cell value">{city}</div>
+            </div>
+            <div class="row">
+                <div class="cell label">Region</div>
+                <div class="cell value">{region}</div>
+            </div>
+            <div class="row">
+                <div class="cell label">Country</div>
+                <div class="cell value">{country}</div>
+            </div>
+        </div>
+        <p>Thanks,</p>
+        <p>Dan</p>
+    </body>
+</html>
+"""
+
+# Compiled once at import; see EmailTemplate
+VERIFICATION_EMAIL = EmailTemplate('Please Verify your email', "judging_app@gmail.com", VERIFICATION_MESSAGE)
+MAGIC_LINK_EMAIL = EmailTemplate('Please Verify your email', "judging_app@gmail.com", MAGIC_LINK_MESSAGE)
+JUDGE_INVITATION_EMAIL = EmailTemplate('You are invited to judge', "judging_app@gmail.com", JUDGE_INVITATION_MESSAGE)
+RESET_PASSWORD_EMAIL = EmailTemplate('Reset Password Request', "llm_researcher@gmail.com", RESET_PASSWORD_MESSAGE)
@@ -0,0 +1,46 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.version import VersionModel
+
+
+class VersionCounter:
+    """
+    Monotonic version number per key, bumped whenever the data behind the key changes.
+
+    Versions live in the `versions` table rather than in process memory, so every
+    worker sees the same number and an ETag issued by one worker validates on another.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def get(self, db: Session, key) -> int:
+        return db.scalar(select(VersionModel.version).where(VersionModel.key == self._key(key))) or 0
+
+    def bump(self, db: Session, key) -> None:
+        """Increments the version within the caller's transaction, so it changes together with the data."""
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(VersionModel).values(key=self._key(key), version=1)
+        db.execute(
+            stmt.on_conflict_do_update(index_elements=[VersionModel.key], set_={"version": VersionModel.version + 1})
+        )
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag built from the given parts."""
+    return '"' + ".".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header matches `etag` (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
@@ -1,20 +1,46 @@
+import logging
 import requests
 import os
 from dotenv import load_dotenv 
+from app.cache import TieredCache
 
 load_dotenv()
 GEOLOCATION_TOKEN  = os.getenv('GEOLOCATION_TOKEN')
+# The lookup only decorates the reset-password email; never hold the request up for long
+GEOLOCATION_TIMEOUT_SECONDS = float(os.getenv('GEOLOCATION_TIMEOUT_SECONDS', '3'))
 
-def get_geolocation(ip_address: str):    
+logger = logging.getLogger(__name__)
+
+# An address rarely moves; one lookup per address per day spares ipinfo and the reset-password request
+geolocations = TieredCache("geolocations", maxsize=1024, ttl=3600.0, remote_ttl=86400.0, value_type=dict[str, str])
+
+
+def get_geolocation(ip_address: str):
+    try:
+        return geolocations.get_or_load(ip_address, lambda: _lookup(ip_address))
+    except (requests.RequestException, ValueError):
+        # Failed lookups are not cached, so the next request for the address tries again
+        logger.warning("Geolocation lookup failed for %s", ip_address, exc_info=True)
+        return _location(ip_address, {})
+
+
+def _lookup(ip_address: str):
     # IPinfo API endpoint
     url = f"https://ipinfo.io/{ip_address}/json?token={GEOLOCATION_TOKEN}"
     
     # Make the request to the API
-    response = requests.get(url)
+    response = requests.get(url, timeout=GEOLOCATION_TIMEOUT_SECONDS)
+    # Errors (bad token, rate limit...) raise rather than being cached as a location
+    response.raise_for_status()
     
     # Parse the response to JSON
     data = response.json()
-    
+    if "error" in data:
+        raise ValueError(f"ipinfo error: {data['error']}")
+    return _location(ip_address, data)
+
+
+def _location(ip_address: str, data: dict):
     # Extract relevant information
     location = data.get("loc", "Location not found").split(',')
     city = data.get("city", "City not found")
@@ -8,13 +8,16 @@ from fastapi import Depends, Header, HTTPException
 from fastapi import Depends, Request, Response
 from enum import Enum
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
+from app.schemas.user import UserRead
+from app.utils.response_util import FastJSONResponse
+from app.utils.tracing_util import span
 
 REFRESH_TOKEN = "refresh_token"
 
 class TokenType(str, Enum):
     ACCESS = "access"
     REFRESH = "refresh"
+    PROFILE = "profile"  # lets an admin have single requests profiled
 
     def __str__(self) -> str:
         return self.value
@@ -40,12 +43,14 @@ def create_token(subject: str, email: str, expires_delta: timedelta, token_type:
         "iat"  : int(issued_at.timestamp()),
         "exp"  : int(expires_at.timestamp()),
     }
-    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    with span("jwt.encode", token_type=str(token_type)):
+        return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
 def decode_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with span("jwt.decode"):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError as e:
         raise ValueError("Invalid token. Please reset your password to generate a new link.") from e
@@ -78,7 +83,7 @@ def get_token_email(authorization: Optional[str] = Header(None)):
         token_subject = payload["sub"]
         return token_subject
     
-def issue_tokens(user_id: str, user_email: str, user_dict: Optional[dict] = None):
+def issue_tokens(user_id: str, user_email: str, user: Optional[UserRead] = None):
     """Generate access/refresh tokens, build LoginResponse, and set HttpOnly cookie."""
     
     access_token = create_token(
@@ -95,10 +100,10 @@ def issue_tokens(user_id: str, user_email: str, user_dict: Optional[dict] = None
     )
 
     content: dict[str, Any] ={"access_token": access_token, "token_type": "bearer"}
-    if user_dict:
-        content["user"] = user_dict
+    if user:
+        content["user"] = user  # serialized once, by pydantic-core
         
-    response = JSONResponse(content=content)
+    response = FastJSONResponse(content=content)
         
     response.set_cookie(
         key="refresh_token",
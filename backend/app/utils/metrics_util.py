@@ -0,0 +1,92 @@
+import os
+import threading
+from typing import Optional
+from dotenv import load_dotenv
+
+# Read before prometheus_client is imported: it picks its value storage at import time
+load_dotenv()
+# Directory shared by all worker processes (run_prod.sh sets and empties it on start)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Summary, disable_created_metrics, generate_latest  # noqa: E402
+from prometheus_client import multiprocess  # noqa: E402
+
+disable_created_metrics()
+
+
+class Metrics:
+    """
+    Small facade over prometheus_client, rendered in the Prometheus text format.
+
+    With several worker processes behind one port a scrape reaches one of them, so
+    with PROMETHEUS_MULTIPROC_DIR set every process writes its values to files in
+    that directory and `render` aggregates all of them: counters and summaries are
+    summed (including workers that have exited), gauges report the most recent value.
+    Metrics are created on first use with the label names they are used with.
+    """
+
+    def __init__(self, multiprocess_dir: str = PROMETHEUS_MULTIPROC_DIR):
+        self.multiprocess_dir = multiprocess_dir
+        self._registry = CollectorRegistry()
+        self._metrics: dict[str, object] = {}
+        # This process's values, for `get`
+        self._values: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._types: dict[str, str] = {}
+        self._help: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, metric_type: str, help_text: str) -> None:
+        self._types[name] = metric_type
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        with self._lock:
+            self._child(name, labels, "counter").inc(value)
+            key = (name, tuple(sorted(labels.items())))
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._child(name, labels, "gauge").set(value)
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Adds one observation to a summary (exported as <name>_count and <name>_sum)."""
+        with self._lock:
+            self._child(name, labels, "summary").observe(seconds)
+            for suffix, value in (("_count", 1), ("_sum", seconds)):
+                key = (name + suffix, tuple(sorted(labels.items())))
+                self._values[key] = self._values.get(key, 0) + value
+
+    def get(self, name: str, **labels) -> Optional[float]:
+        """This process's value (counters and summaries: since it started)."""
+        return self._values.get((name, tuple(sorted(labels.items()))))
+
+    def render(self) -> str:
+        if self.multiprocess_dir:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry, path=self.multiprocess_dir)
+            return generate_latest(registry).decode()
+        return generate_latest(self._registry).decode()
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _child(self, name: str, labels: dict, default_type: str):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric_type = self._types.get(name, default_type)
+            kwargs = {"labelnames": sorted(labels), "registry": self._registry}
+            if metric_type == "gauge":
+                metric = Gauge(name, self._help.get(name, name), multiprocess_mode="mostrecent", **kwargs)
+            elif metric_type == "summary":
+                metric = Summary(name, self._help.get(name, name), **kwargs)
+            else:
+                metric = Counter(name, self._help.get(name, name), **kwargs)
+            self._metrics[name] = metric
+        return metric.labels(**labels) if labels else metric
+
+
+# Process-wide registry
+metrics = Metrics()
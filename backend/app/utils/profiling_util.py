@@ -0,0 +1,140 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from dotenv import load_dotenv
+from app.utils.jwt_util import TokenType, decode_token
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # without pyinstrument, reports come from cProfile
+    Profiler = None
+
+load_dotenv()
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "TRUE").upper() == "TRUE"
+# Fraction of all requests profiled without a token (continuous profiling); 0 turns it off
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+# Shared by the workers of a host, so any worker can serve a report
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "judging-app-profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))
+PROFILE_TOKEN_HEADER = "x-profile-token"
+
+REPORT_ID = re.compile(r"^\d{14}-[0-9a-f]{8}$")
+
+
+def profile_token_valid(token: str) -> bool:
+    """True when `token` is an unexpired profile token signed with SECRET_KEY."""
+    try:
+        return decode_token(token).get("token_type") == TokenType.PROFILE
+    except ValueError:
+        return False
+
+
+def report_path(report_id: str) -> Optional[str]:
+    """Path of a stored report, or None when there is no such report."""
+    if not REPORT_ID.match(report_id):
+        return None
+    for extension in ("html", "txt"):
+        path = os.path.join(PROFILE_DIR, f"{report_id}.{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class _RequestProfiler:
+    """pyinstrument when installed (it follows the request's task across awaits), else cProfile."""
+
+    def __init__(self):
+        if Profiler is not None:
+            self._profiler = Profiler(interval=0.001, async_mode="enabled")
+        else:
+            self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        if Profiler is not None:
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> tuple[str, str]:
+        """Stops profiling; returns (file extension, report)."""
+        if Profiler is not None:
+            self._profiler.stop()
+            return "html", self._profiler.output_html()
+        self._profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(60)
+        return "txt", out.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests on demand.
+
+    A request carrying a valid profile token in the X-Profile-Token header (issued to
+    admins by POST /profiling/token) is profiled. Its response gets an X-Profile-Id
+    header naming the report, which admins fetch from GET /profiling/reports/{id}.
+    With PROFILING_SAMPLE_RATE above zero, that fraction of all requests is profiled
+    too. Requests that are not profiled cost one header lookup and one random draw.
+    One request per worker is profiled at a time; others go through unprofiled.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = PROFILING_SAMPLE_RATE, report_dir: str = PROFILE_DIR):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.report_dir = report_dir
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        report_id = f"{time.strftime('%Y%m%d%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_report_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(raw=message["headers"])["X-Profile-Id"] = report_id
+            await send(message)
+
+        profiler = _RequestProfiler()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_report_id)
+        finally:
+            extension, report = profiler.stop()
+            self._busy.release()
+            self._store(report_id, extension, report)
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _wanted(self, scope: Scope) -> bool:
+        token = Headers(scope=scope).get(PROFILE_TOKEN_HEADER)
+        if token is not None:
+            return profile_token_valid(token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _store(self, report_id: str, extension: str, report: str) -> None:
+        os.makedirs(self.report_dir, exist_ok=True)
+        with open(os.path.join(self.report_dir, f"{report_id}.{extension}"), "w") as f:
+            f.write(report)
+        # Report ids start with their UTC time, so name order is age order
+        reports = sorted(os.listdir(self.report_dir))
+        for name in reports[:max(0, len(reports) - PROFILE_KEEP)]:
+            try:
+                os.remove(os.path.join(self.report_dir, name))
+            except FileNotFoundError:  # another worker pruned it first
+                pass
@@ -0,0 +1,169 @@
+import contextlib
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from dotenv import load_dotenv
+from app.utils.metrics_util import metrics
+
+load_dotenv()
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Statements per request above which the request is logged
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "30"))
+# The same statement run this many times in one request is logged as a likely N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+logger = logging.getLogger(__name__)
+
+metrics.describe("db_statements", "summary", "SQL statements per request, by route")
+metrics.describe("db_time_seconds", "summary", "Time spent in SQL statements per request, by route")
+metrics.describe("db_slow_statements", "counter", "Statements slower than SLOW_QUERY_MS")
+
+
+@dataclass
+class QueryStats:
+    """Statements run in one request (or one `track_queries` block)."""
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """Statements run at least `threshold` times: with bound parameters, an N+1 shows up as one text repeated."""
+        return {statement: n for statement, n in self.statements.items() if n >= threshold}
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Counts and times the engine's statements, and logs slow ones with their plan. Safe to call twice."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextlib.contextmanager
+def track_queries(*engines: Engine) -> Iterator[QueryStats]:
+    """Collects the statements run inside the block (on the given engines, instrumented if needed)."""
+    for engine in engines:
+        instrument_engine(engine)
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def assert_queries(*engines: Engine, max_statements: Optional[int] = None,
+                   max_repeats: int = N_PLUS_ONE_THRESHOLD - 1) -> Iterator[QueryStats]:
+    """
+    Test helper: fails when the block runs more than `max_statements` statements, or
+    any single statement more than `max_repeats` times (an N+1).
+    """
+    with track_queries(*engines) as stats:
+        yield stats
+    if max_statements is not None and stats.count > max_statements:
+        raise AssertionError(f"{stats.count} statements run, budget is {max_statements}:\n" + _listing(stats.statements))
+    repeated = stats.repeated(max_repeats + 1)
+    if repeated:
+        raise AssertionError("Statements repeated (N+1?):\n" + _listing(repeated))
+
+
+class QueryStatsMiddleware:
+    """
+    Tracks the statements of each request.
+
+    The totals go to the db_statements and db_time_seconds metrics and to a
+    Server-Timing header (visible in browser dev tools). Requests over QUERY_BUDGET
+    statements, or repeating one statement N_PLUS_ONE_THRESHOLD times, are logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and stats.count:
+                MutableHeaders(raw=message["headers"]).append(
+                    "Server-Timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} statements"'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._report(scope, stats)
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        route = scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        metrics.observe("db_statements", stats.count, route=path)
+        metrics.observe("db_time_seconds", stats.seconds, route=path)
+        if stats.count > QUERY_BUDGET:
+            logger.warning("%s %s ran %d statements (budget %d) in %.1f ms",
+                           scope["method"], path, stats.count, QUERY_BUDGET, stats.seconds * 1000)
+        repeated = stats.repeated()
+        if repeated:
+            logger.warning("%s %s repeated statements, likely an N+1:\n%s", scope["method"], path, _listing(repeated))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - context._query_started
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, seconds)
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        metrics.inc("db_slow_statements")
+        plan = None if executemany else _explain(conn, statement, parameters)
+        logger.warning("Slow statement (%.1f ms): %s%s", seconds * 1000, statement,
+                       f"\nPlan:\n{plan}" if plan else "")
+
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    # Only SELECTs: they just ran, so EXPLAIN cannot fail and abort the transaction
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+        finally:
+            cursor.close()
+    except Exception:
+        logger.debug("Could not explain slow statement", exc_info=True)
+        return None
+
+
+def _listing(statements: dict[str, int]) -> str:
+    return "\n".join(f"  {n} x {statement}" for statement, n in sorted(statements.items(), key=lambda item: -item[1]))
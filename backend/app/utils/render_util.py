@@ -0,0 +1,46 @@
+"""
+Thumbnail and preview rendering, run in the asset renderer's worker processes.
+
+Kept free of app imports, so a spawned worker starts without loading the app.
+"""
+import os
+
+THUMBNAIL_PX = 320
+PREVIEW_PX = 1600
+
+
+def render_images(source_path: str, content_type: str, work_dir: str) -> dict[str, str]:
+    """
+    Renders the first page (PDF) or the image as JPEG thumbnail and preview files in
+    `work_dir`. Returns {"thumbnail": path, "preview": path}, or {} when no renderer
+    for the content type is installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return {}
+    if content_type == "application/pdf":
+        try:
+            import pypdfium2
+        except ImportError:
+            return {}
+        pdf = pypdfium2.PdfDocument(source_path)
+        try:
+            page = pdf[0]
+            width, height = page.get_size()
+            image = page.render(scale=PREVIEW_PX / max(width, height)).to_pil()
+        finally:
+            pdf.close()
+    else:
+        image = Image.open(source_path)
+        image.draft("RGB", (PREVIEW_PX, PREVIEW_PX))  # JPEGs decode at a reduced size directly
+    image = image.convert("RGB")
+
+    outputs = {}
+    for kind, px in (("preview", PREVIEW_PX), ("thumbnail", THUMBNAIL_PX)):
+        copy = image.copy()
+        copy.thumbnail((px, px))
+        path = os.path.join(work_dir, f"{kind}.jpg")
+        copy.save(path, "JPEG", quality=82, optimize=True)
+        outputs[kind] = path
+    return outputs
@@ -0,0 +1,17 @@
+from typing import Any
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core.
+
+    Pydantic models, datetimes and containers of them are written straight to
+    JSON bytes in native code, without a jsonable_encoder pass or json.dumps.
+    Use it for handlers that build their Response themselves; handlers that
+    return data should declare a response_model instead, which FastAPI then
+    serializes through the same pydantic-core path.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
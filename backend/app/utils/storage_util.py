@@ -0,0 +1,127 @@
+import os
+import shutil
+import threading
+from typing import Optional
+from dotenv import load_dotenv
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # only needed when ASSET_S3_BUCKET is set
+    boto3 = None
+
+load_dotenv()
+ASSET_DIR = os.getenv("ASSET_DIR", "assets")
+# S3-compatible object storage (AWS S3, MinIO, R2...); when unset, assets are kept in ASSET_DIR
+ASSET_S3_BUCKET = os.getenv("ASSET_S3_BUCKET", "")
+ASSET_S3_ENDPOINT_URL = os.getenv("ASSET_S3_ENDPOINT_URL") or None
+ASSET_URL_EXPIRE_SECONDS = int(os.getenv("ASSET_URL_EXPIRE_SECONDS", "300"))
+
+
+def blob_key(sha256: str) -> str:
+    # Two levels of fan-out keep directories (and S3 listings) small
+    return f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+class LocalStorage:
+    """Content-addressed files under a directory, served straight from disk."""
+
+    def __init__(self, root: str = ASSET_DIR):
+        self.root = root
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put_file(self, key: str, source_path: str) -> None:
+        """Moves `source_path` into the store under `key`."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Moved next to the target, then renamed into place, so readers never see a partial file
+        staging = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        shutil.move(source_path, staging)
+        os.replace(staging, path)
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Path to serve the file from (with sendfile), or None when it is not on local disk."""
+        return self._path(key)
+
+    def staging_dir(self) -> Optional[str]:
+        """Where uploads are received: on the same filesystem, so storing them is a rename."""
+        path = os.path.join(self.root, "staging")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        return None
+
+    def download(self, key: str, target_path: str) -> None:
+        shutil.copyfile(self._path(key), target_path)
+
+    # ---------------------------
+    # Internal helpers
+    # ---------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+
+class S3Storage:
+    """
+    Content-addressed objects in an S3-compatible bucket.
+
+    Files are uploaded from disk in multipart chunks. They are served through
+    short-lived presigned URLs, so their bytes never pass through a worker.
+    """
+
+    def __init__(self, bucket: str = ASSET_S3_BUCKET, client=None, endpoint_url: Optional[str] = ASSET_S3_ENDPOINT_URL):
+        if client is None and boto3 is None:
+            raise RuntimeError("ASSET_S3_BUCKET requires the boto3 package to be installed")
+        self.bucket = bucket
+        self._client = client or boto3.client("s3", endpoint_url=endpoint_url)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def put_file(self, key: str, source_path: str) -> None:
+        self._client.upload_file(source_path, self.bucket, key)
+        os.remove(source_path)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    def staging_dir(self) -> Optional[str]:
+        return None  # the system temp directory
+
+    def url(self, key: str, filename: str, content_type: str) -> Optional[str]:
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentType": content_type,
+                "ResponseContentDisposition": f'inline; filename="{filename}"',
+            },
+            ExpiresIn=ASSET_URL_EXPIRE_SECONDS,
+        )
+
+    def download(self, key: str, target_path: str) -> None:
+        self._client.download_file(self.bucket, key, target_path)
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_asset_storage():
+    """Process-wide asset storage: S3 when ASSET_S3_BUCKET is set, ASSET_DIR otherwise."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = S3Storage() if ASSET_S3_BUCKET else LocalStorage()
+        return _storage
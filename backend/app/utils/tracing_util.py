@@ -0,0 +1,143 @@
+import contextlib
+import functools
+import logging
+import os
+import threading
+from typing import Sequence
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from dotenv import load_dotenv
+
+try:
+    from opentelemetry import trace
+except ImportError:  # spans are no-ops without opentelemetry-api
+    trace = None
+try:
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+except ImportError:  # the SDK is only needed once TRACING_ENABLED is set
+    SpanExporter, SpanExportResult = object, None
+
+load_dotenv()
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "FALSE").upper() == "TRUE"
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "judging-app")
+# Spans go to this OTLP/HTTP collector when set, otherwise to TRACE_FILE as JSON lines
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+LOG_FORMAT = "%(asctime)s %(levelname)s [trace_id=%(trace_id)s span_id=%(span_id)s] %(name)s: %(message)s"
+
+_tracer = trace.get_tracer("app") if trace is not None else None
+
+
+def span(name: str, **attributes):
+    """
+    Context manager timing a block as a child of the current span.
+
+    Until `setup_tracing` installs a tracer provider, the OpenTelemetry API hands out
+    non-recording spans, so instrumented code costs next to nothing with tracing off.
+    """
+    if _tracer is None:
+        return contextlib.nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def traced(name: str):
+    """Decorator running the function inside `span(name)`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds the current trace and span ids to log records (zeros outside a span)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = trace.get_current_span().get_span_context() if trace is not None else None
+        record.trace_id = format(context.trace_id, "032x") if context else "0" * 32
+        record.span_id = format(context.span_id, "016x") if context else "0" * 16
+        return True
+
+
+def setup_tracing(app, engines: Sequence) -> bool:
+    """
+    Sends spans for the app's routes, the given SQLAlchemy engines and the `span` blocks
+    to the configured exporter, and puts trace ids in log lines. Returns False when
+    tracing is off or the OpenTelemetry SDK is not installed.
+    """
+    if not TRACING_ENABLED:
+        return False
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    except ImportError:
+        logging.getLogger(__name__).warning("TRACING_ENABLED is set but the OpenTelemetry SDK is not installed")
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(provider)
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=provider, excluded_urls="metrics")
+    for engine in engines:
+        trace_statements(engine)
+
+    root = logging.getLogger()
+    if not root.handlers:
+        logging.basicConfig(format=LOG_FORMAT)
+    for handler in root.handlers:
+        handler.addFilter(TraceContextFilter())
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return True
+
+
+def trace_statements(engine: Engine) -> None:
+    """Times every statement the engine runs in a `db.<VERB>` span under the current span."""
+    system = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_span(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        context._trace_span = _tracer.start_span(
+            f"db.{verb}", attributes={"db.system": system, "db.statement": statement[:2000], "db.executemany": executemany}
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def end_span(conn, cursor, statement, parameters, context, executemany):
+        context._trace_span.set_attribute("db.rowcount", cursor.rowcount)
+        context._trace_span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def fail_span(exception_context):
+        current = getattr(exception_context.execution_context, "_trace_span", None)
+        if current is not None:
+            current.record_exception(exception_context.original_exception)
+            current.set_status(trace.Status(trace.StatusCode.ERROR))
+            current.end()
+
+
+def _exporter():
+    if OTEL_EXPORTER_OTLP_ENDPOINT:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=f"{OTEL_EXPORTER_OTLP_ENDPOINT.rstrip('/')}/v1/traces")
+    return JsonLinesSpanExporter(TRACE_FILE)
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
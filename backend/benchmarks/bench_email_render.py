@@ -0,0 +1,41 @@
+"""
+Benchmark: rendering 10,000 judge invitation emails.
+
+Compares the old path (str.format on the template, then a new MIMEMultipart
+flattened with as_string() per recipient) with the precompiled EmailTemplate,
+which only fills in the fields and base64-encodes the body. Nothing is sent.
+
+Run from backend/:  python -m benchmarks.bench_email_render
+"""
+import time
+
+from app.utils.email_util import JUDGE_INVITATION_EMAIL, JUDGE_INVITATION_MESSAGE, construct_message_with_html
+
+MESSAGES = 10_000
+RECIPIENTS = [
+    (f"judge{i:05d}@example.com", f"https://judging.example.com/verify/token-{i:05d}", f"Judge {i:05d}")
+    for i in range(MESSAGES)
+]
+
+
+def before():
+    for receiver, redirect_url, first_name in RECIPIENTS:
+        message_html = JUDGE_INVITATION_MESSAGE.format(first_name=first_name, redirect_url=redirect_url)
+        construct_message_with_html("You are invited to judge", "judging_app@gmail.com", receiver, message_html=message_html)
+
+
+def after():
+    for receiver, redirect_url, first_name in RECIPIENTS:
+        JUDGE_INVITATION_EMAIL.render(receiver, first_name=first_name, redirect_url=redirect_url)
+
+
+def main():
+    for name, render in (("before", before), ("after", after)):
+        start = time.perf_counter()
+        render()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<8} {elapsed * 1000:8.1f} ms for {MESSAGES} messages  ({elapsed / MESSAGES * 1e6:6.1f} µs/message)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: serializing a 1,000-poster page through FastAPI.
+
+Compares the old path (no response_model, so FastAPI runs jsonable_encoder and
+then json.dumps) with the new path (declared response_model, serialized once by
+pydantic-core). Requests are driven straight through the ASGI interface so the
+numbers reflect the app, not an HTTP client.
+
+Run from backend/:  python -m benchmarks.bench_json_response
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from app.schemas.poster import PosterPage, PosterRead
+from app.utils.response_util import FastJSONResponse
+
+POSTERS = [
+    PosterRead(id=i, event_id=1, title=f"{i:04d} Neural Networks in C. elegans", author="Alice", score=95.5, session="A")
+    for i in range(1, 1001)
+]
+ITERATIONS = 300
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before")
+    async def before():
+        return {"data": POSTERS, "total": len(POSTERS)}
+
+    @app.get("/after", response_model=PosterPage)
+    async def after():
+        return {"data": POSTERS, "total": len(POSTERS)}
+
+    @app.get("/after-response-class", response_class=FastJSONResponse)
+    async def after_response_class():
+        return FastJSONResponse({"data": POSTERS, "total": len(POSTERS)})
+
+    return app
+
+
+async def call(app, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def main():
+    app = build_app()
+    for path in ("/before", "/after", "/after-response-class"):
+        payload = await call(app, path)  # warm up
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            await call(app, path)
+        elapsed = (time.perf_counter() - start) / ITERATIONS * 1000
+        print(f"{path:<24} {elapsed:7.2f} ms/request  ({len(payload)} bytes)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark: poster search latency over a 50,000-poster archive.
+
+Builds an SQLite database of ten events with the FTS5 index (the schema the tests use) and
+times prefix, author, multi-term and misspelled queries through
+PosterSearchService. Titles and abstracts are drawn from a synthetic
+vocabulary of a few thousand words; the well-known topics below are planted
+in about 1% of posters each, which is roughly how often a real research topic
+recurs across several years of symposia. BROAD_QUERY hits a word that appears
+in a third of the archive and shows the worst case, where every match has to
+be ranked.
+
+Run from backend/:  python -m benchmarks.bench_poster_search
+"""
+import random
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, PosterModel
+from app.services.search_service import PosterSearchService
+
+POSTERS = 50_000
+EVENTS = 10
+JUDGES = 300
+VOCABULARY = 4_000
+ITERATIONS = 50
+TOPICS = ["Neural Networks in C. elegans", "Autophagy Pathways", "Mitochondrial Stress"]
+QUERIES = ["Autoph", "Charlie", "mitochondrial stress", "Autophgy Pathwys", "neural elegans"]
+BROAD_QUERY = "cells"
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ro", "ta", "vi", "su", "de", "pa", "gen", "tor", "lin", "mor", "zin", "qua"]
+NAMES = ["Alice", "Bob", "Charlie", "Dana", "Eve", "Frank", "Grace", "Henry", "Ivy", "Jack"]
+
+
+def build_words(rng: random.Random) -> list[str]:
+    words = set()
+    while len(words) < VOCABULARY:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+def main():
+    rng = random.Random(7)
+    words = build_words(rng)
+    surnames = [word.capitalize() for word in words[:500]]
+
+    def phrase(k: int) -> str:
+        return " ".join(rng.choices(words, k=k))
+
+    rows = []
+    for _ in range(POSTERS):
+        title = phrase(rng.randint(3, 6))
+        if rng.random() < 0.03:
+            title = f"{rng.choice(TOPICS)} {title}"
+        abstract = phrase(20)
+        if rng.random() < 0.33:
+            abstract += " cells"
+        rows.append({
+            "event_id": rng.randint(1, EVENTS),
+            "judge_id": rng.randint(1, JUDGES),
+            "title": title,
+            "author": f"{rng.choice(NAMES) if rng.random() < 0.01 else rng.choice(words).capitalize()} {rng.choice(surnames)}",
+            "abstract": abstract,
+            "score": rng.uniform(50, 100),
+        })
+
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        db.execute(insert(PosterModel), rows)
+        db.commit()
+
+        service = PosterSearchService(db)
+        for query in QUERIES + [BROAD_QUERY]:
+            for event_id in (None, 1):
+                hits = service.search(query, event_id=event_id)  # warm up
+                start = time.perf_counter()
+                for _ in range(ITERATIONS):
+                    service.search(query, event_id=event_id)
+                elapsed = (time.perf_counter() - start) / ITERATIONS * 1000
+                scope = "all events" if event_id is None else f"event {event_id}"
+                print(f"{query!r:<24} {scope:<12} {elapsed:7.2f} ms  ({len(hits)} hits)")
+
+
+if __name__ == "__main__":
+    main()
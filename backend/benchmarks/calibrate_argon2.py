@@ -0,0 +1,76 @@
+"""
+Calibration: argon2 costs for this host.
+
+Finds the strongest argon2id settings whose sign-in latency stays under a target
+while CONCURRENCY logins hash at the same time (argon2-cffi releases the GIL, so
+concurrent hashes compete for cores and memory bandwidth, as they do in production).
+Parallelism is fixed at 1: under concurrent logins every core is already busy, and
+extra lanes only add contention. Memory costs that would exceed the memory budget
+with CONCURRENCY hashes in flight are not tried.
+
+Run on the deployment host, from backend/:
+    python -m benchmarks.calibrate_argon2 [--target-ms 250] [--concurrency 8] [--memory-budget-mib 1024]
+then put the printed ARGON2_* lines in the environment. Existing hashes keep
+working and are upgraded on each user's next sign in.
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.hash import argon2
+
+MEMORY_COSTS_MIB = (256, 128, 96, 64, 46, 32, 19)  # 19 MiB is the OWASP floor for argon2id
+MAX_TIME_COST = 10
+PASSWORD = "correct horse battery staple"
+
+
+def p95_ms(time_cost: int, memory_cost_kib: int, concurrency: int, rounds: int) -> float:
+    handler = argon2.using(type="ID", time_cost=time_cost, memory_cost=memory_cost_kib, parallelism=1)
+
+    def timed_hash(_):
+        start = time.perf_counter()
+        handler.hash(PASSWORD)
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed_hash, range(concurrency)))  # warm up
+        samples = list(pool.map(timed_hash, range(concurrency * rounds)))
+    return statistics.quantiles(samples, n=20)[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="p95 hash latency to stay under")
+    parser.add_argument("--concurrency", type=int, default=8, help="logins hashing at the same time")
+    parser.add_argument("--memory-budget-mib", type=int, default=1024, help="memory argon2 may use across concurrent logins")
+    parser.add_argument("--rounds", type=int, default=4, help="samples per concurrent slot")
+    args = parser.parse_args()
+
+    best = None  # (memory_cost * time_cost, time_cost, memory_cost_kib, p95)
+    for memory_mib in MEMORY_COSTS_MIB:
+        if memory_mib * args.concurrency > args.memory_budget_mib:
+            continue
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            latency = p95_ms(time_cost, memory_mib * 1024, args.concurrency, args.rounds)
+            print(f"m={memory_mib:>3} MiB  t={time_cost:>2}  p95 {latency:8.1f} ms")
+            if latency > args.target_ms:
+                break
+            strength = memory_mib * time_cost
+            if best is None or strength > best[0]:
+                best = (strength, time_cost, memory_mib * 1024, latency)
+
+    if best is None:
+        print(f"\nNo setting meets {args.target_ms:.0f} ms at concurrency {args.concurrency}; "
+              f"raise --target-ms or lower --concurrency")
+        return
+    _, time_cost, memory_cost_kib, latency = best
+    print(f"\nStrongest setting under {args.target_ms:.0f} ms p95 with {args.concurrency} concurrent logins "
+          f"({latency:.1f} ms):")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost_kib}")
+    print("ARGON2_PARALLELISM=1")
+
+
+if __name__ == "__main__":
+    main()
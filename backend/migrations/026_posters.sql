@@ -0,0 +1,15 @@
+-- Posters move from the in-process fake_db into the database, so exports can stream them with a cursor.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS posters (
+    id serial PRIMARY KEY,
+    judge_id integer NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    session varchar,
+    title varchar NOT NULL,
+    author varchar NOT NULL,
+    score double precision NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_posters_judge_id_id ON posters (judge_id, id);
+CREATE INDEX IF NOT EXISTS ix_posters_session ON posters (session);
+
+COMMIT;
@@ -0,0 +1,14 @@
+-- Stored results of batched score changes, one per client idempotency key.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id serial PRIMARY KEY,
+    user_id integer NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    key varchar NOT NULL,
+    result json NOT NULL,
+    created_at timestamp NOT NULL DEFAULT now(),
+    CONSTRAINT uq_idempotency_keys_user_id_key UNIQUE (user_id, key)
+);
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_created_at ON idempotency_keys (created_at);
+
+COMMIT;
@@ -0,0 +1,17 @@
+-- Poster abstracts, plus the full-text and trigram indexes behind GET /posters/search.
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE posters ADD COLUMN IF NOT EXISTS abstract text;
+ALTER TABLE posters ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(author, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(abstract, '')), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_posters_search_vector ON posters USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS ix_posters_title_trgm ON posters USING GIN (lower(title) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_posters_author_trgm ON posters USING GIN (lower(author) gin_trgm_ops);
+
+COMMIT;
@@ -0,0 +1,31 @@
+-- Events (symposia); every poster belongs to one. Existing posters move to the current event.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS events (
+    id serial PRIMARY KEY,
+    name varchar NOT NULL,
+    starts_on date,
+    ends_on date,
+    is_active boolean NOT NULL DEFAULT false,
+    created_at timestamp NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_events_is_active ON events (is_active);
+
+-- The current event: the one already active, or a new one holding the posters judged so far
+INSERT INTO events (name, is_active)
+SELECT 'Current event', true
+WHERE NOT EXISTS (SELECT 1 FROM events WHERE is_active);
+
+ALTER TABLE posters ADD COLUMN IF NOT EXISTS event_id integer REFERENCES events (id) ON DELETE CASCADE;
+UPDATE posters
+SET event_id = (SELECT id FROM events WHERE is_active ORDER BY id LIMIT 1)
+WHERE event_id IS NULL;
+ALTER TABLE posters ALTER COLUMN event_id SET NOT NULL;
+
+-- Every poster query is event-scoped, so event_id leads each index
+DROP INDEX IF EXISTS ix_posters_judge_id_id;
+DROP INDEX IF EXISTS ix_posters_session;
+CREATE INDEX IF NOT EXISTS ix_posters_event_id_judge_id_id ON posters (event_id, judge_id, id);
+CREATE INDEX IF NOT EXISTS ix_posters_event_id_session ON posters (event_id, session);
+
+COMMIT;
@@ -0,0 +1,9 @@
+-- Change counters behind the ETags of GET /posters, shared by every worker process.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS versions (
+    key varchar PRIMARY KEY,
+    version integer NOT NULL
+);
+
+COMMIT;
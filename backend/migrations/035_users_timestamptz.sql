@@ -0,0 +1,13 @@
+-- Store users.magic_link_expires_at and users.last_login_at as timestamptz instead of ISO text,
+-- so expiry and activity checks can run (and use an index) in SQL.
+-- Existing values were written as UTC ISO-8601 strings ("2025-08-25T15:13:53.000000Z").
+BEGIN;
+
+ALTER TABLE users
+    ALTER COLUMN magic_link_expires_at TYPE timestamptz USING NULLIF(magic_link_expires_at, '')::timestamptz,
+    ALTER COLUMN last_login_at TYPE timestamptz USING NULLIF(last_login_at, '')::timestamptz;
+
+CREATE INDEX IF NOT EXISTS ix_users_magic_link_expires_at ON users (magic_link_expires_at);
+CREATE INDEX IF NOT EXISTS ix_users_last_login_at ON users (last_login_at);
+
+COMMIT;
@@ -0,0 +1,7 @@
+-- Judge activity, written behind in batches by the activity recorder.
+BEGIN;
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS last_seen_at timestamptz;
+CREATE INDEX IF NOT EXISTS ix_users_last_seen_at ON users (last_seen_at);
+
+COMMIT;
@@ -0,0 +1,8 @@
+-- Store idempotency_keys.created_at as timestamptz, so the housekeeping sweep compares it
+-- with its UTC cutoff unambiguously. Existing values were written by now() in UTC.
+BEGIN;
+
+ALTER TABLE idempotency_keys
+    ALTER COLUMN created_at TYPE timestamptz USING created_at AT TIME ZONE 'UTC';
+
+COMMIT;
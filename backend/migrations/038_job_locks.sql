@@ -0,0 +1,10 @@
+-- Leases that let only one worker run each scheduled job.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS job_locks (
+    name varchar PRIMARY KEY,
+    holder varchar NOT NULL,
+    expires_at timestamptz NOT NULL
+);
+
+COMMIT;
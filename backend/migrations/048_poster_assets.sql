@@ -0,0 +1,17 @@
+-- Poster files (PDF or image), stored by content hash, with rendered thumbnails and previews.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS poster_assets (
+    poster_id integer PRIMARY KEY REFERENCES posters (id) ON DELETE CASCADE,
+    sha256 varchar(64) NOT NULL,
+    content_type varchar NOT NULL,
+    size bigint NOT NULL,
+    filename varchar NOT NULL,
+    render_status varchar NOT NULL DEFAULT 'pending',
+    thumbnail_sha256 varchar(64),
+    preview_sha256 varchar(64),
+    uploaded_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_poster_assets_sha256 ON poster_assets (sha256);
+
+COMMIT;
@@ -0,0 +1,46 @@
+-- Append-only log of score changes, with snapshots of its replayed state.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS score_events (
+    id bigserial PRIMARY KEY,
+    event_id integer NOT NULL,
+    poster_id integer NOT NULL,
+    judge_id integer NOT NULL,
+    criterion varchar NOT NULL DEFAULT 'score',
+    old_value double precision,
+    new_value double precision,
+    source varchar NOT NULL,
+    changed_by integer,
+    created_at timestamptz NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_score_events_event_id_id ON score_events (event_id, id);
+CREATE INDEX IF NOT EXISTS ix_score_events_poster_id_id ON score_events (poster_id, id);
+
+CREATE OR REPLACE FUNCTION score_events_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'score_events is append-only';
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS score_events_append_only ON score_events;
+CREATE TRIGGER score_events_append_only BEFORE UPDATE OR DELETE ON score_events
+FOR EACH ROW EXECUTE FUNCTION score_events_append_only();
+
+CREATE TABLE IF NOT EXISTS score_snapshots (
+    id serial PRIMARY KEY,
+    event_id integer NOT NULL REFERENCES events (id) ON DELETE CASCADE,
+    through_at timestamptz NOT NULL,
+    through_id bigint NOT NULL,
+    event_count bigint NOT NULL,
+    state json NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_score_snapshots_event_id_through_id ON score_snapshots (event_id, through_id);
+
+-- Scores given before the log existed become its first events, so replays start from them
+INSERT INTO score_events (event_id, poster_id, judge_id, criterion, old_value, new_value, source, created_at)
+SELECT p.event_id, p.id, p.judge_id, 'score', NULL, p.score, 'baseline', now()
+FROM posters p
+WHERE NOT EXISTS (SELECT 1 FROM score_events e WHERE e.poster_id = p.id);
+
+COMMIT;
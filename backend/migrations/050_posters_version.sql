@@ -0,0 +1,6 @@
+-- Version of each poster, checked by every update (optimistic concurrency).
+BEGIN;
+
+ALTER TABLE posters ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+
+COMMIT;
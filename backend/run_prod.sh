@@ -0,0 +1,31 @@
+#!/bin/bash
+# Production launcher: several uvicorn worker processes sharing one listening socket.
+# All mutable state (posters, scores, ETag versions, idempotency keys) lives in the
+# database, so any worker can serve any request.
+#
+#   kill -HUP <parent pid>   restarts the workers one at a time (graceful reload)
+#   kill -TERM <parent pid>  lets in-flight requests finish, then stops
+HOST=${HOST:-0.0.0.0}
+PORT=${PORT:-8000}
+# One worker per core unless told otherwise
+WORKERS=${WORKERS:-$(python -c "import os; print(os.cpu_count() or 1)")}
+# Each worker exits after this many requests and is replaced, bounding slow memory growth
+MAX_REQUESTS=${MAX_REQUESTS:-10000}
+GRACEFUL_TIMEOUT=${GRACEFUL_TIMEOUT:-30}
+
+# The debugger listens on a fixed port, which several workers cannot share
+export ACTIVATE_DEBUG=FALSE
+
+# Every worker writes its metrics here so GET /metrics reports all of them; emptied on each start
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/judging-app-metrics}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+echo "Starting ${WORKERS} workers on ${HOST}:${PORT}"
+exec uvicorn app.main:app \
+    --host "$HOST" --port "$PORT" \
+    --workers "$WORKERS" \
+    --loop uvloop --http httptools \
+    --limit-max-requests "$MAX_REQUESTS" \
+    --timeout-graceful-shutdown "$GRACEFUL_TIMEOUT" \
+    --proxy-headers \
+    --no-access-log
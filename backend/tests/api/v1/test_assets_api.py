@@ -0,0 +1,159 @@
+import io
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.assets_api import router
+from app.models import Base, EventModel, PosterModel, UserModel
+from app.models.core_db import get_db, get_read_db
+from app.services import asset_service
+from app.services.asset_service import AssetRenderer
+from app.utils import storage_util
+from app.utils.jwt_util import get_token_subject
+from app.utils.storage_util import LocalStorage
+
+ADMIN, JUDGE, OTHER_JUDGE = "1", "2", "3"
+
+app = FastAPI()
+app.include_router(router)
+
+client = TestClient(app)
+
+
+def png_bytes(width=1200, height=900):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (30, 120, 200)).save(out, "PNG")
+    return out.getvalue()
+
+
+def pdf_bytes():
+    out = io.BytesIO()
+    Image.new("RGB", (842, 1191), (250, 250, 250)).save(out, "PDF")
+    return out.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def override_dependencies(tmp_path, monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as session:
+        session.add_all([
+            UserModel(id=1, first_name="Ada", last_name="Admin", email="admin@example.com", role="admin"),
+            UserModel(id=2, first_name="Jo", last_name="Judge", email="jo@example.com"),
+            UserModel(id=3, first_name="Sam", last_name="Judge", email="sam@example.com"),
+            EventModel(id=1, name="Spring Symposium", is_active=True),
+            PosterModel(id=1, event_id=1, judge_id=2, title="Neural Networks in C. elegans", author="Alice"),
+            PosterModel(id=2, event_id=1, judge_id=3, title="Autophagy Pathways", author="Bob"),
+        ])
+        session.commit()
+
+    def get_test_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    renderer = AssetRenderer(session_factory=TestingSessionLocal, processes=1)
+    monkeypatch.setattr(storage_util, "_storage", LocalStorage(str(tmp_path / "assets")))
+    monkeypatch.setattr(asset_service, "asset_renderer", renderer)
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_token_subject] = lambda: ADMIN
+    yield renderer
+    renderer.stop()
+    app.dependency_overrides.clear()
+
+
+def as_user(user_id):
+    app.dependency_overrides[get_token_subject] = lambda: user_id
+
+
+def upload(poster_id, body, filename="poster.png"):
+    return client.put(f"/posters/{poster_id}/asset", params={"filename": filename}, content=body)
+
+
+def test_upload_and_range_download():
+    body = png_bytes()
+    response = upload(1, body)
+    assert response.status_code == 200
+    assert response.json()["content_type"] == "image/png"
+    assert response.json()["size"] == len(body)
+
+    as_user(JUDGE)
+    full = client.get("/posters/1/asset")
+    assert full.status_code == 200
+    assert full.content == body
+    assert full.headers["etag"] == f'"{response.json()["sha256"]}"'
+    assert full.headers["accept-ranges"] == "bytes"
+
+    partial = client.get("/posters/1/asset", headers={"Range": "bytes=0-99"})
+    assert partial.status_code == 206
+    assert partial.content == body[:100]
+    assert partial.headers["content-range"] == f"bytes 0-99/{len(body)}"
+
+    assert client.get("/posters/1/asset", headers={"If-None-Match": full.headers["etag"]}).status_code == 304
+
+
+def test_download_right_after_upload_ignores_a_lagging_replica():
+    # A replica that has not replayed the upload yet
+    replica = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=replica)
+
+    def get_lagging_read_db():
+        db = sessionmaker(bind=replica)()
+        db.info["replica"] = True
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = get_lagging_read_db
+    body = png_bytes()
+    assert upload(1, body).status_code == 200
+
+    assert client.get("/posters/1/asset").content == body
+
+
+def test_judges_only_get_their_own_posters_files():
+    upload(2, png_bytes())
+    as_user(JUDGE)
+    assert client.get("/posters/2/asset").status_code == 404
+
+
+def test_identical_files_are_stored_once(tmp_path):
+    body = pdf_bytes()
+    first, second = upload(1, body, "a.pdf").json(), upload(2, body, "b.pdf").json()
+
+    assert first["sha256"] == second["sha256"]
+    assert first["content_type"] == "application/pdf"
+    assert len([p for p in (tmp_path / "assets" / "blobs").rglob("*") if p.is_file()]) == 1
+    assert not list((tmp_path / "assets" / "staging").iterdir())
+
+
+def test_thumbnail_and_preview_are_rendered_off_the_request(override_dependencies):
+    assert upload(1, png_bytes(3000, 2000)).json()["render_status"] == "pending"
+    as_user(JUDGE)
+    assert client.get("/posters/1/asset/thumbnail").status_code in (200, 404)
+
+    override_dependencies.stop()  # waits for queued renders
+
+    thumbnail = client.get("/posters/1/asset/thumbnail")
+    preview = client.get("/posters/1/asset/preview")
+    assert thumbnail.headers["content-type"] == "image/jpeg"
+    assert Image.open(io.BytesIO(thumbnail.content)).size == (320, 213)
+    assert Image.open(io.BytesIO(preview.content)).size == (1600, 1067)
+
+
+def test_rejected_uploads(monkeypatch):
+    assert upload(1, b"not a poster", "notes.txt").status_code == 415
+    monkeypatch.setattr(asset_service, "ASSET_MAX_BYTES", 1000)
+    monkeypatch.setattr("app.api.v1.assets_api.ASSET_MAX_BYTES", 1000)
+    assert upload(1, png_bytes()).status_code == 413
+    assert upload(99, png_bytes(10, 10)).status_code == 404
+
+    as_user(JUDGE)
+    assert upload(1, png_bytes(10, 10)).status_code == 403
@@ -0,0 +1,65 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.exports_api import router
+from app.api.v1.dependencies import get_admin_subject
+from app.models import Base, PosterModel
+from app.models.core_db import get_db
+
+
+app = FastAPI()
+app.include_router(router)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def override_dependencies():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as session:
+        session.add_all([
+            PosterModel(event_id=1, judge_id=1, session="A", title="Autophagy Pathways", author="Bob", score=88.0),
+            PosterModel(event_id=1, judge_id=2, session="A", title="Autophagy Pathways", author="Bob", score=92.0),
+        ])
+        session.commit()
+
+    def get_test_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_admin_subject] = lambda: "1"
+    yield
+    app.dependency_overrides.clear()
+
+
+def test_export_scores_csv():
+    response = client.get("/exports/scores", params={"judge_id": 2})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="scores.csv"'
+    lines = response.text.splitlines()
+    assert lines[0] == "event_id,poster_id,judge_id,session,title,author,score"
+    assert len(lines) == 2
+
+
+def test_export_rankings_ndjson():
+    response = client.get("/exports/rankings", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.json()["mean_score"] == 90.0
+
+
+def test_export_requires_admin():
+    del app.dependency_overrides[get_admin_subject]
+    response = client.get("/exports/scores")
+    assert response.status_code == 401
@@ -0,0 +1,221 @@
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.posters_api import router
+from app.models import Base, EventModel, PosterModel
+from app.models.core_db import get_db, get_read_db
+from app.services.poster_service import BatchConflict
+from app.utils.jwt_util import get_token_subject
+
+
+app = FastAPI()
+app.include_router(router)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def override_dependencies():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as session:
+        session.add_all([
+            EventModel(id=1, name="Spring Symposium", is_active=True),
+            EventModel(id=2, name="Archive"),
+            PosterModel(id=3, event_id=2, judge_id=1, title="Last Year's Poster", author="Bob", score=50.0),
+            PosterModel(id=1, event_id=1, judge_id=1, title="Neural Networks in C. elegans", author="Alice", score=95.5),
+            PosterModel(id=2, event_id=1, judge_id=1, title="Autophagy Pathways", author="Bob", score=88.0),
+        ])
+        session.commit()
+
+    def get_test_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_token_subject] = lambda: "1"
+    yield
+    app.dependency_overrides.clear()
+
+
+def test_get_posters():
+    response = client.get("/posters", params={"page": 1, "limit": 10})
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+    assert response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+def test_get_posters_not_modified_skips_store():
+    etag = client.get("/posters").headers["etag"]
+
+    with patch("app.api.v1.posters_api.PosterService.list_posters") as list_posters:
+        response = client.get("/posters", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    list_posters.assert_not_called()
+
+
+def test_get_posters_etag_changes_after_update():
+    etag = client.get("/posters").headers["etag"]
+
+    response = client.put("/posters/2", json={"id": 2, "title": "Autophagy Pathways", "author": "Bob", "score": 91.0})
+    assert response.status_code == 200
+
+    response = client.get("/posters", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["data"][1]["score"] == 91.0
+
+
+def test_get_posters_etag_is_per_page():
+    first = client.get("/posters", params={"page": 1, "limit": 1}).headers["etag"]
+    second = client.get("/posters", params={"page": 2, "limit": 1}).headers["etag"]
+    assert first != second
+
+
+def test_update_missing_poster():
+    response = client.put("/posters/99", json={"title": "x", "author": "y", "score": 1.0})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Poster not found"
+
+
+def test_update_poster_rejects_null_required_fields():
+    response = client.put("/posters/2", json={"title": None})
+    assert response.status_code == 422
+
+    # Nullable fields can still be cleared
+    response = client.put("/posters/2", json={"session": None})
+    assert response.status_code == 200
+
+
+def test_update_poster_if_match():
+    poster = {"title": "Autophagy Pathways", "author": "Bob", "score": 91.0}
+
+    response = client.put("/posters/2", json=poster, headers={"If-Match": '"2.1"'})
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"2.2"'
+
+    # A second tab still holding version 1
+    response = client.put("/posters/2", json={**poster, "score": 10.0}, headers={"If-Match": '"2.1"'})
+    assert response.status_code == 409
+    assert response.headers["etag"] == '"2.2"'
+    assert response.json()["current"]["score"] == 91.0
+    assert response.json()["current"]["version"] == 2
+
+
+def test_update_poster_with_version():
+    poster = client.get("/posters").json()["data"][1]
+    assert poster["version"] == 1
+
+    response = client.put("/posters/2", json={**poster, "score": 91.0})
+    assert response.status_code == 200
+
+    # A second tab still holding version 1
+    response = client.put("/posters/2", json={**poster, "score": 10.0})
+    assert response.status_code == 409
+    assert response.json()["current"]["score"] == 91.0
+    assert response.json()["current"]["version"] == 2
+
+
+def test_update_poster_if_match_through_middleware():
+    # The full app: compression, profiling and query stats wrap the route
+    from app.main import app as main_app
+
+    main_app.dependency_overrides.update(app.dependency_overrides)
+    main_client = TestClient(main_app, headers={"Accept-Encoding": "gzip"})
+    try:
+        # A long abstract makes the response large enough to be compressed, which weakens its ETag
+        poster = {"title": "Autophagy Pathways", "author": "Bob", "score": 91.0, "abstract": "Autophagy " * 200}
+        response = main_client.put("/api/v1/posters/2", json=poster, headers={"If-Match": '"2.1"'})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        etag = response.headers["etag"]
+        assert etag == 'W/"2.2"'
+
+        # The browser echoes the ETag it was given
+        response = main_client.put("/api/v1/posters/2", json={**poster, "score": 92.0}, headers={"If-Match": etag})
+        assert response.status_code == 200
+
+        response = main_client.put("/api/v1/posters/2", json={**poster, "score": 10.0}, headers={"If-Match": etag})
+        assert response.status_code == 409
+        assert response.json()["current"]["score"] == 92.0
+        assert response.json()["current"]["version"] == 3
+    finally:
+        main_app.dependency_overrides.clear()
+
+
+def test_submit_score_batch():
+    etag = client.get("/posters").headers["etag"]
+    batch = {"changes": [
+        {"idempotency_key": "a", "poster_id": 1, "score": 50.0},
+        {"idempotency_key": "b", "poster_id": 42, "score": 50.0},
+    ]}
+
+    response = client.post("/posters/scores/batch", json=batch)
+    replay = client.post("/posters/scores/batch", json=batch)
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == ["applied", "not_found"]
+    assert [result["replayed"] for result in replay.json()["results"]] == [True, True]
+    assert client.get("/posters", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_submit_score_batch_conflict():
+    batch = {"changes": [{"idempotency_key": "a", "poster_id": 1, "score": 50.0}]}
+    with patch("app.api.v1.posters_api.PosterService.apply_score_batch", side_effect=BatchConflict("send it again")):
+        response = client.post("/posters/scores/batch", json=batch)
+    assert response.status_code == 409
+
+
+def test_get_posters_for_named_event():
+    response = client.get("/posters", params={"event_id": 2})
+    assert [poster["title"] for poster in response.json()["data"]] == ["Last Year's Poster"]
+
+
+def test_get_posters_without_active_event():
+    with patch("app.api.v1.dependencies.EventService.current_event_id", return_value=None):
+        response = client.get("/posters")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "No active event"
+
+
+def test_get_posters_served_by_replica_only_once_caught_up():
+    replica = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    ReplicaSession = sessionmaker(autocommit=False, autoflush=False, bind=replica)
+    Base.metadata.create_all(bind=replica)
+    with ReplicaSession() as session:
+        session.add_all([
+            EventModel(id=1, name="Spring Symposium", is_active=True),
+            PosterModel(id=1, event_id=1, judge_id=1, title="Replica Copy", author="Alice", score=95.5),
+        ])
+        session.commit()
+
+    def get_test_read_db():
+        db = ReplicaSession()
+        db.info["replica"] = True
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_read_db] = get_test_read_db
+    assert client.get("/posters").json()["data"][0]["title"] == "Replica Copy"
+
+    # The replica has not replayed this write yet, so the judge's next read goes to the primary
+    client.put("/posters/2", json={"score": 91.0})
+    assert [poster["title"] for poster in client.get("/posters").json()["data"]] == [
+        "Neural Networks in C. elegans", "Autophagy Pathways",
+    ]
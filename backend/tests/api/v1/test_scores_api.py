@@ -0,0 +1,56 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.v1.dependencies import get_admin_subject
+from app.api.v1.scores_api import router
+from app.models import Base, EventModel, PosterModel
+from app.models.core_db import get_db, get_read_db
+from app.services.score_log_service import score_log
+
+
+app = FastAPI()
+app.include_router(router)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def override_dependencies(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as session:
+        session.add_all([
+            EventModel(id=1, name="Spring Symposium", is_active=True),
+            PosterModel(id=1, event_id=1, judge_id=1, title="Autophagy Pathways", author="Bob", score=88.0),
+        ])
+        session.commit()
+
+    def get_test_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_read_db] = get_test_db
+    app.dependency_overrides[get_admin_subject] = lambda: "9"
+    # Rebuilds flush the worker's score log first
+    monkeypatch.setattr(score_log, "session_factory", TestingSessionLocal)
+    monkeypatch.setattr(score_log, "_pending", [])
+    yield
+    app.dependency_overrides.clear()
+
+
+def test_rebuild_requires_a_time_or_confirmation():
+    response = client.post("/scores/rebuild")
+    assert response.status_code == 400
+
+    assert client.post("/scores/rebuild", params={"confirm": True}).json() == {"updated": 0}
+    assert client.post("/scores/rebuild", params={"at": "2025-09-01T12:00:00Z"}).json() == {"updated": 0}
@@ -0,0 +1,73 @@
+import time
+import pytest
+from app.cache import LocalCache, LocalInvalidationBus, RedisInvalidationBus
+
+
+@pytest.fixture
+def bus():
+    return LocalInvalidationBus()
+
+
+def test_get_and_set(bus):
+    cache = LocalCache("test", bus=bus)
+    cache.set(1, "one")
+
+    assert cache.get(1) == "one"
+    assert cache.get(2) is None
+
+
+def test_least_recently_used_entry_is_dropped(bus):
+    cache = LocalCache("test", maxsize=2, bus=bus)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_entries_expire(bus):
+    cache = LocalCache("test", ttl=0.01, bus=bus)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_publish_evicts_by_key_and_tag_in_every_cache(bus):
+    # Two caches on one bus stand in for the same cache in two workers
+    first, second = LocalCache("test", bus=bus), LocalCache("test", bus=bus)
+    for cache in (first, second):
+        cache.set("a", 1, tags=["posters:1:1"])
+        cache.set("b", 2, tags=["posters:1:1"])
+        cache.set("c", 3, tags=["posters:1:2"])
+        cache.set("d", 4)
+
+    bus.publish(keys=["d"], tags=["posters:1:1"])
+
+    for cache in (first, second):
+        assert [cache.get(key) for key in "abcd"] == [None, None, 3, None]
+
+
+def test_redis_bus_reaches_other_processes():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    publisher = RedisInvalidationBus(client=fakeredis.FakeRedis(server=server))
+    subscriber = RedisInvalidationBus(client=fakeredis.FakeRedis(server=server))
+    try:
+        local, remote = LocalCache("test", bus=publisher), LocalCache("test", bus=subscriber)
+        local.set("a", 1, tags=["user:1"])
+        remote.set("a", 1, tags=["user:1"])
+
+        publisher.publish(tags=["user:1"])
+
+        assert local.get("a") is None  # evicted synchronously
+        deadline = time.monotonic() + 2
+        while remote.get("a") is not None and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert remote.get("a") is None
+    finally:
+        publisher.close()
+        subscriber.close()
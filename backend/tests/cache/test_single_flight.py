@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import pytest
+from app.cache.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    flights = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def read(page):
+        calls.append(page)
+        release.wait(5)
+        return {"page": page}
+
+    async def scenario():
+        callers = [asyncio.ensure_future(flights.do(("posters", 1), read, 1)) for _ in range(10)]
+        other = asyncio.ensure_future(flights.do(("posters", 2), read, 2))
+        await asyncio.sleep(0.05)
+        assert flights.in_flight() == 2
+        release.set()
+        return await asyncio.gather(*callers), await other
+
+    shared, other = asyncio.run(scenario())
+    assert sorted(calls) == [1, 2]
+    assert all(result is shared[0] for result in shared)
+    assert other == {"page": 2}
+    assert flights.in_flight() == 0
+
+
+def test_errors_reach_every_caller_and_are_not_kept():
+    flights = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def failing_read():
+        calls.append(1)
+        release.wait(5)
+        raise ValueError("store unavailable")
+
+    async def scenario():
+        callers = [asyncio.ensure_future(flights.do("key", failing_read)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        return await flights.do("key", lambda: "fresh")
+
+    assert asyncio.run(scenario()) == "fresh"
+    assert len(calls) == 1
+
+
+def test_read_gets_its_own_session():
+    flights = SingleFlight("test")
+    release = threading.Event()
+    sessions = []
+
+    class FakeSession:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    def session_factory():
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    def read(session, page):
+        release.wait(5)
+        assert not session.closed
+        return {"page": page}
+
+    async def scenario():
+        leader = asyncio.ensure_future(flights.do("key", read, 1, session_factory=session_factory))
+        follower = asyncio.ensure_future(flights.do("key", read, 1, session_factory=session_factory))
+        await asyncio.sleep(0.05)
+        # The leader's request goes away; the read and its session carry on for the follower
+        leader.cancel()
+        release.set()
+        return await follower
+
+    assert asyncio.run(scenario()) == {"page": 1}
+    assert len(sessions) == 1 and sessions[0].closed
@@ -0,0 +1,119 @@
+import pickle
+import threading
+import time
+import pytest
+import redis
+from app.cache import LocalInvalidationBus, RedisCacheStore, TieredCache
+from app.cache.remote import CACHE_STORE_PREFIX
+from app.schemas.poster import PosterRead
+from app.utils.metrics_util import metrics
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def worker_cache(server, bus=None, name="pages"):
+    """The same cache as seen by one worker: its own in-process tier, the shared store."""
+    return TieredCache(name, ttl=60.0, store=RedisCacheStore(client=fakeredis.FakeRedis(server=server)),
+                       bus=bus or LocalInvalidationBus())
+
+
+def test_shared_store_refills_other_workers(server):
+    first, second = worker_cache(server), worker_cache(server)
+    first.set((1, 1), ["poster"], tags=["posters:1:1"])
+    hits = metrics.get("cache_requests", cache="pages", outcome="remote_hit") or 0
+
+    assert second.get((1, 1)) == ["poster"]
+    assert len(second.local) == 1
+    assert metrics.get("cache_requests", cache="pages", outcome="remote_hit") == hits + 1
+
+
+def test_shared_store_returns_typed_values(server):
+    def cache():
+        return TieredCache("typed_pages", store=RedisCacheStore(client=fakeredis.FakeRedis(server=server)),
+                           bus=LocalInvalidationBus(), value_type=tuple[list[PosterRead], int])
+
+    page = ([PosterRead(id=1, event_id=1, title="Autophagy", author="Bob", score=7.5, version=2)], 1)
+    cache().set("k", page)
+
+    assert cache().get("k") == page
+
+
+def test_entries_that_are_not_json_are_misses(server):
+    client = fakeredis.FakeRedis(server=server)
+    # E.g. a pickle written by whoever can reach the server: never unpickled
+    client.set(CACHE_STORE_PREFIX + "pages:k", pickle.dumps((["poster"], ())))
+
+    assert worker_cache(server).get("k") is None
+
+
+def test_invalidate_evicts_tags_from_both_tiers(server):
+    bus = LocalInvalidationBus()
+    first, second = worker_cache(server, bus), worker_cache(server, bus)
+    first.set("a", 1, tags=["posters:1:1"])
+    first.set("b", 2, tags=["posters:1:2"])
+    second.get("a")
+
+    second.invalidate(tags=["posters:1:1"])
+
+    assert first.get("a") is None and second.get("a") is None
+    assert worker_cache(server).get("a") is None
+    assert first.get("b") == 2
+
+
+def test_get_or_load_runs_the_loader_once_per_process(server):
+    cache = worker_cache(server)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "page"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["page"] * 10
+    assert len(calls) == 1
+
+
+def test_get_or_load_waits_for_another_worker(server):
+    loading, waiting = worker_cache(server), worker_cache(server)
+    token = loading.store.acquire("pages:k", 5.0)
+
+    def finish_load():
+        time.sleep(0.05)
+        loading.set("k", "from the other worker")
+        loading.store.release("pages:k", token)
+
+    threading.Thread(target=finish_load).start()
+
+    assert waiting.get_or_load("k", lambda: "loaded twice") == "from the other worker"
+
+
+def test_store_errors_fall_back_to_loading():
+    class BrokenRedis:
+        def __getattr__(self, name):
+            def fail(*args, **kwargs):
+                raise redis.ConnectionError("store unavailable")
+            return fail
+
+    cache = TieredCache("pages", store=RedisCacheStore(client=BrokenRedis()), bus=LocalInvalidationBus())
+
+    assert cache.get_or_load("k", lambda: "from the database") == "from the database"
+    assert cache.get("k") == "from the database"  # still served by the in-process tier
+
+
+def test_without_a_store_the_cache_is_in_process():
+    cache = TieredCache("pages", bus=LocalInvalidationBus())  # CACHE_STORE_URL is unset in tests
+    assert cache.store is None
+    assert cache.get_or_load("k", lambda: None) is None
+    assert cache.get_or_load("k", lambda: "reloaded") is None  # None is cached like any value
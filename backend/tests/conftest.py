@@ -0,0 +1,10 @@
+import pytest
+from app.cache import clear_all_caches
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """Every test gets its own database, so cached rows from an earlier test must not leak into it."""
+    clear_all_caches()
+    yield
+    clear_all_caches()
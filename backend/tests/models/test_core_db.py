@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import create_engine, select
+from app.models import Base, EventModel
+from app.models import core_db
+from app.models.core_db import ReadSessionLocal, ReplicaSet, session_factory_for
+
+
+@pytest.fixture
+def primary_and_replica(tmp_path, monkeypatch):
+    """Two SQLite files standing in for a primary and its replica, each holding a differently named event."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "Primary"), (replica, "Replica")):
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(EventModel.__table__.insert().values(id=1, name=name))
+    monkeypatch.setattr(core_db, "engine", primary)
+    return primary, replica
+
+
+def test_reads_go_to_the_replica_until_the_session_writes(primary_and_replica):
+    _, replica = primary_and_replica
+    with ReadSessionLocal(replica=replica) as db:
+        assert db.scalar(select(EventModel.name)) == "Replica"
+
+        db.add(EventModel(id=2, name="Autumn Symposium"))
+        db.flush()
+
+        # Reads its own write from the primary
+        assert db.scalars(select(EventModel.name).order_by(EventModel.id)).all() == ["Primary", "Autumn Symposium"]
+        db.commit()
+
+
+def test_replica_set_skips_unhealthy_replicas(primary_and_replica, tmp_path):
+    _, replica = primary_and_replica
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replicas = ReplicaSet([broken, replica], check_seconds=60)
+
+    assert {replicas.choose() for _ in range(4)} == {replica}
+
+
+def test_replica_set_skips_lagging_replicas(primary_and_replica, monkeypatch):
+    _, replica = primary_and_replica
+    replicas = ReplicaSet([replica], max_lag_seconds=5, check_seconds=0)
+    monkeypatch.setattr(replicas, "_lag", lambda engine: 30.0)
+
+    assert replicas.choose() is None
+
+
+def test_without_replicas_reads_use_the_primary_session():
+    primary_session = object()
+    reads = core_db.get_read_db(primary_session)
+
+    assert next(reads) is primary_session
+
+
+def test_session_factory_for_opens_sessions_on_the_same_database(primary_and_replica):
+    primary, replica = primary_and_replica
+    with ReadSessionLocal(replica=replica) as read_db, core_db.SessionLocal(bind=primary) as db:
+        with session_factory_for(read_db)() as flight_db:
+            assert flight_db.scalar(select(EventModel.name)) == "Replica"
+            assert flight_db.info["replica"]
+        with session_factory_for(db)() as flight_db:
+            assert flight_db.scalar(select(EventModel.name)) == "Primary"
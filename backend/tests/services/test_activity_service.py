@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, UserModel
+from app.services.activity_service import ActivityRecorder
+
+T0 = datetime(2025, 9, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory SQLite DB with two users; the recorder opens its own sessions on it."""
+    engine = create_engine("sqlite:///:memory:", echo=False, future=True)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as session:
+        session.add_all([
+            UserModel(id=1, first_name="Ann", last_name="Lee", email="ann@example.com", last_login_at=T0),
+            UserModel(id=2, first_name="Ben", last_name="Ray", email="ben@example.com"),
+        ])
+        session.commit()
+    return TestingSessionLocal
+
+
+def _user(session_factory, user_id):
+    with session_factory() as session:
+        return session.get(UserModel, user_id)
+
+
+def test_flush_writes_latest_activity_in_one_batch(session_factory):
+    recorder = ActivityRecorder(session_factory)
+    recorder.record(1, at=T0 + timedelta(minutes=5))
+    recorder.record(1, at=T0 + timedelta(minutes=3))
+    recorder.record(2, login=True, at=T0 + timedelta(minutes=1))
+
+    assert _user(session_factory, 2).last_login_at is None  # nothing written yet
+    assert recorder.flush() == 2
+    assert recorder.pending() == 0
+
+    ann, ben = _user(session_factory, 1), _user(session_factory, 2)
+    assert ann.last_seen_at.replace(tzinfo=timezone.utc) == T0 + timedelta(minutes=5)
+    assert ann.last_login_at.replace(tzinfo=timezone.utc) == T0  # not a login: left alone
+    assert ben.last_login_at.replace(tzinfo=timezone.utc) == T0 + timedelta(minutes=1)
+    assert ben.last_seen_at.replace(tzinfo=timezone.utc) == T0 + timedelta(minutes=1)
+
+
+def test_buffer_is_bounded(session_factory):
+    recorder = ActivityRecorder(session_factory, max_pending=1)
+    recorder.record(1, at=T0)
+    recorder.record(2, at=T0)
+    recorder.record(1, at=T0 + timedelta(minutes=1))  # users already buffered still update
+
+    assert recorder.pending() == 1
+    assert recorder.dropped == 1
+
+
+def test_stop_flushes_pending_activity(session_factory):
+    recorder = ActivityRecorder(session_factory, flush_seconds=60)
+    recorder.start()
+    recorder.record(2, login=True, at=T0)
+
+    recorder.stop()
+
+    assert _user(session_factory, 2).last_login_at is not None
+
+
+def test_late_flush_never_moves_last_seen_backwards(session_factory):
+    recorder = ActivityRecorder(session_factory)
+    recorder.record(2, at=T0 + timedelta(minutes=5))
+    recorder.flush()
+    # Another worker's buffer with older activity is flushed afterwards
+    recorder.record(2, at=T0 + timedelta(minutes=1))
+    recorder.flush()
+
+    assert _user(session_factory, 2).last_seen_at.replace(tzinfo=timezone.utc) == T0 + timedelta(minutes=5)
@@ -0,0 +1,85 @@
+import io
+import boto3
+import pytest
+from moto import mock_aws
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base, EventModel, PosterModel, PosterAssetModel
+from app.services.asset_service import AssetRenderer, AssetService, AssetUpload, sniff_content_type
+from app.utils.storage_util import S3Storage, blob_key
+
+BUCKET = "posters"
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as session:
+        session.add_all([
+            EventModel(id=1, name="Spring Symposium", is_active=True),
+            PosterModel(id=1, event_id=1, judge_id=2, title="Neural Networks in C. elegans", author="Alice"),
+        ])
+        session.commit()
+    return factory
+
+
+@pytest.fixture
+def storage():
+    # moto stands in for an S3-compatible server such as MinIO
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield S3Storage(BUCKET, client=client)
+
+
+def stage(body, chunk_size=4096):
+    upload = AssetUpload()
+    for start in range(0, len(body), chunk_size):
+        upload.write(body[start:start + chunk_size])
+    return upload.finish()
+
+
+def pdf_bytes():
+    out = io.BytesIO()
+    Image.new("RGB", (842, 1191), (250, 250, 250)).save(out, "PDF")
+    return out.getvalue()
+
+
+def test_sniff_content_type():
+    assert sniff_content_type(b"%PDF-1.7\n") == "application/pdf"
+    assert sniff_content_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert sniff_content_type(b"<html>") is None
+
+
+def test_s3_upload_render_and_presigned_url(session_factory, storage):
+    renderer = AssetRenderer(session_factory=session_factory, storage=storage, processes=1)
+    body = pdf_bytes()
+    with session_factory() as db:
+        asset = AssetService(db, storage, renderer).attach(1, 1, stage(body), "../poster \"final\".pdf")
+    renderer.stop()
+
+    assert asset.filename == "poster final.pdf"
+    assert storage._client.get_object(Bucket=BUCKET, Key=blob_key(asset.sha256))["Body"].read() == body
+    with session_factory() as db:
+        stored = db.get(PosterAssetModel, 1)
+        assert stored.render_status == "ready"
+        assert storage.exists(blob_key(stored.thumbnail_sha256))
+    url = storage.url(blob_key(asset.sha256), asset.filename, asset.content_type)
+    assert url.startswith("https://") and "Signature=" in url
+
+
+def test_reupload_of_a_rendered_file_reuses_its_renders(session_factory, storage):
+    renderer = AssetRenderer(session_factory=session_factory, storage=storage, processes=1)
+    body = pdf_bytes()
+    with session_factory() as db:
+        AssetService(db, storage, renderer).attach(1, 1, stage(body), "poster.pdf")
+    renderer.stop()
+
+    with session_factory() as db:
+        again = AssetService(db, storage, renderer).attach(1, 1, stage(body), "poster.pdf")
+    assert again.render_status == "ready"
+    assert renderer._dispatch is None  # nothing was queued
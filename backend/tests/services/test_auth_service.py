@@ -1,10 +1,13 @@
 import pytest
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, select
+from passlib.context import CryptContext
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta, timezone
 from app.models.user import UserModel, Base
 from app.schemas import UserCreate, UserRead
+from app.schemas.user import JudgeInvite
 from app.services.auth_service import AuthService
 import re
 
@@ -168,6 +171,21 @@ def test_signin_success(db_session):
     assert result.last_login_at is not None
 
 
+def test_signin_rehashes_password_with_current_costs(db_session, monkeypatch):
+    old_context = CryptContext(schemes=["argon2"], argon2__time_cost=1, argon2__memory_cost=8192, argon2__parallelism=1)
+    new_context = CryptContext(schemes=["argon2"], argon2__time_cost=2, argon2__memory_cost=8192, argon2__parallelism=1)
+    db_session.add(UserModel(first_name="Nia", last_name="Park", email="nia@example.com",
+                             password=old_context.hash("mysecurepass")))
+    db_session.commit()
+    monkeypatch.setattr("app.services.auth_service.pwd_context", new_context)
+
+    AuthService(db_session).signin("nia@example.com", "mysecurepass")
+
+    stored = db_session.scalar(select(UserModel.password).where(UserModel.email == "nia@example.com"))
+    assert not new_context.needs_update(stored)
+    assert new_context.verify("mysecurepass", stored)
+
+
 def test_signin_invalid_password(db_session):
     """Wrong password should raise."""
     service = AuthService(db_session)
@@ -250,4 +268,135 @@ def test_password_reset_success(db_session):
 def test_password_reset_user_not_found(db_session):
     service = AuthService(db_session)
     with pytest.raises(ValueError, match="User not found"):
-        service.password_reset("noone@example.com", "irrelevant")
\ No newline at end of file
+        service.password_reset("noone@example.com", "irrelevant")
+
+
+def test_active_login_minutes(db_session):
+    db_session.add_all([
+        UserModel(first_name="Kim", last_name="Lee", email="kim@example.com",
+                  last_login_at=datetime.now(timezone.utc) - timedelta(minutes=12, seconds=5)),
+        UserModel(first_name="Lou", last_name="Reed", email="lou@example.com"),
+    ])
+    db_session.commit()
+    service = AuthService(db_session)
+
+    assert service.active_login_minutes("kim@example.com") == 12
+    assert service.active_login_minutes("lou@example.com") == -1
+
+# ---------------------------
+# Bulk invite
+# ---------------------------
+
+def test_bulk_invite_creates_passwordless_users(db_session, monkeypatch):
+    def no_hashing(*args, **kwargs):
+        raise AssertionError("bulk invites must not hash passwords")
+
+    monkeypatch.setattr("app.services.auth_service.pwd_context.hash", no_hashing)
+
+    service = AuthService(db_session)
+    invites = [
+        JudgeInvite(first_name=f"Judge{i}", last_name="Panel", email=f"judge{i}@example.com")
+        for i in range(5)
+    ]
+
+    users, skipped = service.bulk_invite(invites)
+
+    assert skipped == []
+    assert [user.email for user in users] == [f"judge{i}@example.com" for i in range(5)]
+    assert all(user.password is None and user.magic_link_token for user in users)
+    assert db_session.query(UserModel).count() == 5
+
+
+def test_bulk_invite_skips_existing_and_duplicate_emails(db_session):
+    service = AuthService(db_session)
+    service.bulk_invite([JudgeInvite(first_name="Lee", last_name="Wong", email="lee@example.com")])
+
+    users, skipped = service.bulk_invite([
+        JudgeInvite(first_name="Lee", last_name="Wong", email="LEE@example.com"),
+        JudgeInvite(first_name="Mia", last_name="Ross", email="mia@example.com"),
+        JudgeInvite(first_name="Mia", last_name="Ross", email="Mia@example.com"),
+    ])
+
+    assert skipped == ["LEE@example.com"]
+    assert [user.email for user in users] == ["mia@example.com"]
+
+
+def test_bulk_invite_token_verifies(db_session):
+    service = AuthService(db_session)
+    users, _ = service.bulk_invite([JudgeInvite(first_name="Ned", last_name="Stark", email="ned@example.com")])
+
+    result = service.verify(users[0].magic_link_token)
+
+    assert result.is_verified is True
+
+
+# ---------------------------
+# Round trips
+# ---------------------------
+
+@contextmanager
+def count_statements(session):
+    """Collects every SQL statement the session sends to the database."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _registered(service, monkeypatch):
+    monkeypatch.setattr("app.services.auth_service.send_email_verification", lambda *args: None)
+    return service.register(UserCreate(
+        first_name="Mia", last_name="Wong", email="mia@example.com", password="mysecurepass",
+    ))
+
+
+def test_register_round_trips(db_session, monkeypatch):
+    service = AuthService(db_session)
+    with count_statements(db_session) as statements:
+        _registered(service, monkeypatch)
+    assert len(statements) == 2  # duplicate check, INSERT ... RETURNING
+
+
+def test_verify_round_trips(db_session, monkeypatch):
+    service = AuthService(db_session)
+    user = _registered(service, monkeypatch)
+    with count_statements(db_session) as statements:
+        service.verify(user.magic_link_token)
+    assert len(statements) == 1  # UPDATE ... RETURNING
+
+    with count_statements(db_session) as statements:
+        assert service.verify(user.magic_link_token).is_verified  # an already used link still logs in
+    assert len(statements) == 3  # the UPDATE matches nothing, expiry check, UPDATE by email
+
+
+def test_signin_round_trips(db_session, monkeypatch):
+    service = AuthService(db_session)
+    _registered(service, monkeypatch)
+    with count_statements(db_session) as statements:
+        service.signin("mia@example.com", "mysecurepass")
+    assert len(statements) == 1
+
+
+def test_send_magic_link_round_trips(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.auth_service.send_magic_link", lambda *args: None)
+    service = AuthService(db_session)
+    _registered(service, monkeypatch)
+    with count_statements(db_session) as statements:
+        user = service.send_magic_link("MIA@example.com")
+    assert len(statements) == 2  # name lookup, UPDATE ... RETURNING
+    assert user.magic_link_token
+
+
+def test_password_reset_round_trips(db_session, monkeypatch):
+    service = AuthService(db_session)
+    _registered(service, monkeypatch)
+    with count_statements(db_session) as statements:
+        service.password_reset("mia@example.com", "anothersecurepass")
+    assert len(statements) == 1
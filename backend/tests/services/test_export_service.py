@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, PosterModel
+from app.services.export_service import ExportService, ExportFormat, SCORE_COLUMNS, RANKING_COLUMNS
+
+
+@pytest.fixture
+def db_session():
+    """Creates an in-memory SQLite DB seeded with posters scored by two judges."""
+    engine = create_engine("sqlite:///:memory:", echo=False, future=True)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    session.add_all([
+        PosterModel(event_id=1, judge_id=1, session="A", title="Autophagy Pathways", author="Bob", score=80.0),
+        PosterModel(event_id=1, judge_id=2, session="A", title="Autophagy Pathways", author="Bob", score=90.0),
+        PosterModel(event_id=1, judge_id=1, session="A", title="Mitochondrial Stress", author="Charlie", score=92.0),
+        PosterModel(event_id=1, judge_id=2, session="B", title="Neural Networks", author="Alice", score=70.0),
+        PosterModel(event_id=2, judge_id=1, session="A", title="Last Year's Poster", author="Bob", score=99.0),
+    ])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _read_csv(chunks):
+    return list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+
+
+def test_export_scores_csv(db_session):
+    service = ExportService(db_session)
+    rows = _read_csv(service.encode(service.score_rows(event_id=1), SCORE_COLUMNS, ExportFormat.CSV))
+
+    assert len(rows) == 4
+    assert list(rows[0].keys()) == [name for name, _ in SCORE_COLUMNS]
+    assert rows[0]["judge_id"] == "1"
+
+
+def test_export_scores_filters(db_session):
+    service = ExportService(db_session)
+
+    by_event = list(service.score_rows(event_id=2))
+    assert [row["title"] for row in by_event] == ["Last Year's Poster"]
+
+    by_judge = list(service.score_rows(judge_id=2))
+    assert {row["judge_id"] for row in by_judge} == {2}
+    assert len(by_judge) == 2
+
+    by_session = list(service.score_rows(event_id=1, session="B"))
+    assert [row["title"] for row in by_session] == ["Neural Networks"]
+
+
+def test_export_scores_ndjson_is_chunked(db_session):
+    service = ExportService(db_session)
+    service.CHUNK_ROWS = 3
+    chunks = list(service.encode(service.score_rows(event_id=1), SCORE_COLUMNS, ExportFormat.NDJSON))
+
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert json.loads(lines[-1])["title"] == "Neural Networks"
+
+
+def test_export_rankings(db_session):
+    service = ExportService(db_session)
+    rows = list(service.ranking_rows(event_id=1, session="A"))
+
+    assert [(row["rank"], row["title"]) for row in rows] == [
+        (1, "Mitochondrial Stress"),
+        (2, "Autophagy Pathways"),
+    ]
+    assert rows[1]["mean_score"] == 85.0
+    assert rows[1]["num_scores"] == 2
+
+
+def test_export_parquet(db_session):
+    pq = pytest.importorskip("pyarrow.parquet")
+    service = ExportService(db_session)
+    service.CHUNK_ROWS = 2
+    data = b"".join(service.encode(service.ranking_rows(), RANKING_COLUMNS, ExportFormat.PARQUET))
+
+    table = pq.read_table(io.BytesIO(data))
+    # Rankings are computed per event and session
+    assert table.num_rows == 4
+    assert table.column("rank").to_pylist() == [1, 2, 1, 1]
+    assert table.column_names == [name for name, _ in RANKING_COLUMNS]
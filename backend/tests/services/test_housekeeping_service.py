@@ -0,0 +1,46 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, IdempotencyKeyModel, UserModel
+from app.services.housekeeping_service import HousekeepingService
+
+
+@pytest.fixture
+def db_session():
+    """Creates an in-memory SQLite DB with expired and live magic links and idempotency keys."""
+    engine = create_engine("sqlite:///:memory:", echo=False, future=True)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    now = datetime.now(timezone.utc)
+    session.add_all(
+        [UserModel(first_name="Old", last_name=f"{i}", email=f"old{i}@example.com", magic_link_token=f"old{i}",
+                   magic_link_expires_at=now - timedelta(minutes=1)) for i in range(5)]
+        + [UserModel(first_name="New", last_name="0", email="new@example.com", magic_link_token="new",
+                     magic_link_expires_at=now + timedelta(minutes=15))]
+    )
+    session.flush()
+    session.add_all(
+        [IdempotencyKeyModel(user_id=1, key=f"old{i}", result={}, created_at=now - timedelta(days=8)) for i in range(5)]
+        + [IdempotencyKeyModel(user_id=1, key="new", result={})]
+    )
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def test_clear_expired_magic_links_in_chunks(db_session, monkeypatch):
+    monkeypatch.setattr(HousekeepingService, "CHUNK_ROWS", 2)
+
+    assert HousekeepingService(db_session).clear_expired_magic_links() == 5
+    assert db_session.scalars(select(UserModel.magic_link_token).where(UserModel.magic_link_token.is_not(None))).all() == ["new"]
+
+
+def test_delete_expired_idempotency_keys_in_chunks(db_session, monkeypatch):
+    monkeypatch.setattr(HousekeepingService, "CHUNK_ROWS", 2)
+
+    assert HousekeepingService(db_session).delete_expired_idempotency_keys() == 5
+    assert db_session.scalar(select(func.count(IdempotencyKeyModel.id))) == 1
@@ -0,0 +1,262 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+from app.models import Base, EventModel, PosterModel
+from app.schemas.poster import PosterUpdate, ScoreChange
+from app.services.poster_service import BatchConflict, PosterService, VersionConflict, poster_versions
+from app.utils.query_util import assert_queries
+
+EVENT_ID = 1
+
+
+@pytest.fixture
+def db_session():
+    """Creates an in-memory SQLite DB with posters assigned to two judges in the active event."""
+    engine = create_engine("sqlite:///:memory:", echo=False, future=True)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    session.add_all([EventModel(id=EVENT_ID, name="Spring Symposium", is_active=True), EventModel(id=2, name="Archive")])
+    session.add_all(
+        [PosterModel(event_id=EVENT_ID, judge_id=1, title=f"{i:02d} Autophagy Pathways", author="Bob", score=88.0) for i in range(1, 13)]
+        + [PosterModel(event_id=EVENT_ID, judge_id=4, title="Mitochondrial Stress", author="Charlie", score=92.3)]
+        + [PosterModel(event_id=2, judge_id=1, title="Last Year's Poster", author="Bob", score=50.0)]
+    )
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def test_list_posters_paginates(db_session):
+    service = PosterService(db_session)
+    posters, total = service.list_posters(EVENT_ID, judge_id=1, page=2, limit=10)
+
+    assert total == 12
+    assert [poster.title for poster in posters] == ["11 Autophagy Pathways", "12 Autophagy Pathways"]
+
+
+def test_list_posters_is_event_scoped(db_session):
+    service = PosterService(db_session)
+
+    posters, total = service.list_posters(2, judge_id=1)
+
+    assert total == 1
+    assert posters[0].title == "Last Year's Poster"
+    with pytest.raises(ValueError, match="Poster not found"):
+        service.update_poster(EVENT_ID, 1, posters[0].id, PosterUpdate(score=1.0))
+
+
+def test_update_poster(db_session):
+    service = PosterService(db_session)
+    poster, _ = service.list_posters(EVENT_ID, judge_id=1, page=1, limit=1)
+
+    updated = service.update_poster(EVENT_ID, 1, poster[0].id, PosterUpdate(score=99.0))
+
+    assert updated.score == 99.0
+    assert updated.title == poster[0].title
+
+
+def test_update_poster_of_other_judge_not_found(db_session):
+    service = PosterService(db_session)
+    other, _ = service.list_posters(EVENT_ID, judge_id=4)
+
+    with pytest.raises(ValueError, match="Poster not found"):
+        service.update_poster(EVENT_ID, 1, other[0].id, PosterUpdate(score=1.0))
+
+
+def test_delete_poster(db_session):
+    service = PosterService(db_session)
+    other, _ = service.list_posters(EVENT_ID, judge_id=4)
+
+    deleted = service.delete_poster(EVENT_ID, 4, other[0].id)
+
+    assert deleted.title == "Mitochondrial Stress"
+    assert service.all_posters(EVENT_ID, 4) == []
+
+
+def test_list_posters_is_cached_until_a_write(db_session):
+    service = PosterService(db_session)
+    posters, _ = service.list_posters(EVENT_ID, judge_id=4)
+    db_session.get(PosterModel, posters[0].id).title = "Changed Behind The Cache"
+    db_session.commit()
+
+    assert service.list_posters(EVENT_ID, judge_id=4)[0][0].title == "Mitochondrial Stress"
+
+    service.update_poster(EVENT_ID, 4, posters[0].id, PosterUpdate(score=1.0))
+
+    assert service.list_posters(EVENT_ID, judge_id=4)[0][0].title == "Changed Behind The Cache"
+
+
+def test_page_loaded_during_a_write_is_not_cached_for_the_new_version(db_session):
+    service = PosterService(db_session)
+    version = service.version(EVENT_ID, 4)
+    load_page = PosterService._load_page
+
+    def load_then_write(self, *args):
+        page = load_page(self, *args)
+        # Another worker's write commits (and invalidates) after the old rows were read
+        other = PosterService(sessionmaker(bind=db_session.get_bind())())
+        other.update_poster(EVENT_ID, 4, page[0][0].id, PosterUpdate(score=1.0))
+        return page
+
+    with patch.object(PosterService, "_load_page", load_then_write):
+        stale, _ = service.list_posters(EVENT_ID, judge_id=4, version=version)
+    assert stale[0].score == 92.3
+
+    new_version = service.version(EVENT_ID, 4)
+    db_session.expire_all()
+    posters, _ = service.list_posters(EVENT_ID, judge_id=4, version=new_version)
+    assert new_version != version
+    assert posters[0].score == 1.0
+
+
+def test_version_is_shared_between_sessions(db_session):
+    # Each worker process has its own session; all of them must see the same version
+    other_worker = PosterService(sessionmaker(bind=db_session.get_bind())())
+    service = PosterService(db_session)
+    poster, _ = service.list_posters(EVENT_ID, judge_id=1, page=1, limit=1)
+    assert other_worker.version(EVENT_ID, 1) == 0
+
+    service.update_poster(EVENT_ID, 1, poster[0].id, PosterUpdate(score=70.0))
+    service.update_poster(EVENT_ID, 1, poster[0].id, PosterUpdate(score=71.0))
+
+    assert other_worker.version(EVENT_ID, 1) == 2
+    assert other_worker.version(EVENT_ID, 4) == 0
+
+
+# ---------------------------
+# Optimistic concurrency
+# ---------------------------
+
+def test_update_poster_with_stale_version_conflicts(db_session):
+    service = PosterService(db_session)
+    poster = service.list_posters(EVENT_ID, judge_id=1, page=1, limit=1)[0][0]
+    assert poster.version == 1
+
+    updated = service.update_poster(EVENT_ID, 1, poster.id, PosterUpdate(score=70.0, version=1))
+    assert updated.version == 2
+
+    with pytest.raises(VersionConflict) as conflict:
+        service.update_poster(EVENT_ID, 1, poster.id, PosterUpdate(score=10.0, version=1))
+    assert (conflict.value.current.score, conflict.value.current.version) == (70.0, 2)
+
+
+def test_concurrent_write_is_not_overwritten(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'posters.db'}", future=True)
+    Sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with Sessions() as session:
+        session.add(PosterModel(id=1, event_id=EVENT_ID, judge_id=1, title="Autophagy", author="Bob", score=0.0))
+        session.commit()
+
+    # Another worker commits its edit after this one has read the poster, just before it writes
+    other_writes = []
+    bump = poster_versions.bump
+
+    def bump_after_another_write(db, key):
+        if not other_writes:
+            other_writes.append(1)
+            PosterService(Sessions()).update_poster(EVENT_ID, 1, 1, PosterUpdate(title="Autophagy, revised"))
+        bump(db, key)
+
+    with Sessions() as session, patch.object(poster_versions, "bump", side_effect=bump_after_another_write):
+        updated = PosterService(session).update_poster(EVENT_ID, 1, 1, PosterUpdate(score=80.0))
+
+    # Retried on the newer version: both edits survive
+    assert (updated.title, updated.score, updated.version) == ("Autophagy, revised", 80.0, 3)
+
+
+# ---------------------------
+# Batched score submission
+# ---------------------------
+
+def test_apply_score_batch(db_session):
+    service = PosterService(db_session)
+    posters, _ = service.list_posters(EVENT_ID, judge_id=1, page=1, limit=2)
+
+    results = service.apply_score_batch(EVENT_ID, 1, [
+        ScoreChange(idempotency_key="k1", poster_id=posters[0].id, score=70.0),
+        ScoreChange(idempotency_key="k2", poster_id=posters[1].id, score=71.0),
+        ScoreChange(idempotency_key="k3", poster_id=999, score=72.0),
+    ])
+
+    assert [result.status for result in results] == ["applied", "applied", "not_found"]
+    assert results[0].poster.score == 70.0
+    assert [poster.score for poster in service.list_posters(EVENT_ID, judge_id=1, page=1, limit=2)[0]] == [70.0, 71.0]
+
+
+def test_apply_score_batch_conflicts_on_stale_version(db_session):
+    service = PosterService(db_session)
+    first, second = service.list_posters(EVENT_ID, judge_id=1, page=1, limit=2)[0]
+    service.update_poster(EVENT_ID, 1, first.id, PosterUpdate(score=70.0))
+
+    results = service.apply_score_batch(EVENT_ID, 1, [
+        ScoreChange(idempotency_key="k1", poster_id=first.id, score=10.0, version=first.version),
+        ScoreChange(idempotency_key="k2", poster_id=second.id, score=75.0, version=second.version),
+        ScoreChange(idempotency_key="k3", poster_id=second.id, score=76.0, version=second.version + 1),
+    ])
+
+    assert [result.status for result in results] == ["conflict", "applied", "applied"]
+    assert (results[0].poster.score, results[0].poster.version) == (70.0, 2)
+    assert [result.poster.version for result in results[1:]] == [2, 3]
+    scores = {poster.id: (poster.score, poster.version) for poster in service.all_posters(EVENT_ID, 1)}
+    assert scores[first.id] == (70.0, 2)
+    assert scores[second.id] == (76.0, 3)
+
+
+def test_apply_score_batch_gives_up_after_repeated_conflicts(db_session):
+    service = PosterService(db_session)
+    poster = service.all_posters(EVENT_ID, 1)[0]
+
+    with patch.object(PosterService, "_apply_score_batch", side_effect=StaleDataError("changed")) as apply:
+        with pytest.raises(BatchConflict):
+            service.apply_score_batch(EVENT_ID, 1, [ScoreChange(idempotency_key="k1", poster_id=poster.id, score=1.0)])
+
+    assert apply.call_count == PosterService.WRITE_ATTEMPTS
+
+
+def test_apply_score_batch_has_no_per_change_queries(db_session):
+    service = PosterService(db_session)
+    posters = service.all_posters(EVENT_ID, 1)
+
+    with assert_queries(db_session.get_bind(), max_repeats=1) as stats:
+        service.apply_score_batch(EVENT_ID, 1, [
+            ScoreChange(idempotency_key=f"k{i}", poster_id=poster.id, score=60.0 + i) for i, poster in enumerate(posters)
+        ])
+
+    assert stats.count < len(posters)
+
+
+def test_apply_score_batch_replay_is_deduplicated(db_session):
+    service = PosterService(db_session)
+    poster = service.list_posters(EVENT_ID, judge_id=1, page=1, limit=1)[0][0]
+    first = service.apply_score_batch(EVENT_ID, 1, [ScoreChange(idempotency_key="k1", poster_id=poster.id, score=60.0)])
+
+    # Retried with a stale value: the stored result wins and the score is untouched
+    replay = service.apply_score_batch(EVENT_ID, 1, [
+        ScoreChange(idempotency_key="k1", poster_id=poster.id, score=10.0),
+        ScoreChange(idempotency_key="k2", poster_id=poster.id, score=65.0),
+        ScoreChange(idempotency_key="k2", poster_id=poster.id, score=66.0),
+    ])
+
+    assert replay[0].replayed is True
+    assert replay[0].poster == first[0].poster
+    assert [result.replayed for result in replay[1:]] == [False, True]
+    assert service.list_posters(EVENT_ID, judge_id=1, page=1, limit=1)[0][0].score == 65.0
+
+
+def test_apply_score_batch_is_scoped_to_judge(db_session):
+    service = PosterService(db_session)
+    other = service.list_posters(EVENT_ID, judge_id=4)[0][0]
+
+    results = service.apply_score_batch(EVENT_ID, 1, [ScoreChange(idempotency_key="k1", poster_id=other.id, score=0.0)])
+    # Keys are per judge, so judge 4 can use the same key
+    other_results = service.apply_score_batch(EVENT_ID, 4, [ScoreChange(idempotency_key="k1", poster_id=other.id, score=50.0)])
+
+    assert results[0].status == "not_found"
+    assert other_results[0].status == "applied"
+    assert other_results[0].replayed is False
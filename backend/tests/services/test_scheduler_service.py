@@ -0,0 +1,50 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base, JobLockModel
+from app.services.scheduler_service import Job, JobScheduler
+from app.utils.metrics_util import metrics
+
+
+@pytest.fixture
+def session_factory():
+    """One in-memory SQLite DB shared by every session, standing in for several workers."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def test_only_the_lease_holder_runs_a_job(session_factory):
+    first, second = JobScheduler(session_factory), JobScheduler(session_factory)
+    job = Job("sweep_test", 60, lambda db: 3)
+
+    assert first.run_job(job) == 3
+    assert second.run_job(job) is None  # lease held by the first worker
+    assert first.run_job(job) == 3  # the holder renews its lease
+    assert metrics.get("job_runs", job="sweep_test", outcome="skipped") >= 1
+    assert metrics.get("job_rows", job="sweep_test") >= 6
+
+
+def test_expired_lease_is_taken_over(session_factory):
+    first, second = JobScheduler(session_factory), JobScheduler(session_factory)
+    job = Job("takeover_test", 60, lambda db: 0)
+    first.run_job(job)
+    with session_factory() as db:
+        db.get(JobLockModel, "takeover_test").expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.commit()
+
+    assert second.run_job(job) == 0
+    with session_factory() as db:
+        assert db.get(JobLockModel, "takeover_test").holder == second.worker_id
+
+
+def test_failed_job_is_counted(session_factory):
+    def broken(db):
+        raise RuntimeError("boom")
+
+    assert JobScheduler(session_factory).run_job(Job("failing_test", 60, broken)) is None
+    assert metrics.get("job_runs", job="failing_test", outcome="failed") == 1
+    assert metrics.get("job_duration_seconds_count", job="failing_test") == 1
+    assert 'job_runs_total{job="failing_test",outcome="failed"} 1.0' in metrics.render()
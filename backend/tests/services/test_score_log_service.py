@@ -0,0 +1,210 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, delete, func, select, update
+from sqlalchemy.exc import DatabaseError
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, EventModel, PosterModel, ScoreEventModel, ScoreSnapshotModel
+from app.schemas.poster import PosterUpdate, ScoreChange
+from app.services.poster_service import PosterService, ScoreLogBehind
+from app.services.score_log_service import ScoreLog, ScoreLogService
+
+EVENT_ID = 1
+T0 = datetime(2025, 9, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory SQLite DB with two judges' posters; the score log opens its own sessions on it."""
+    engine = create_engine("sqlite:///:memory:", echo=False, future=True)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as session:
+        session.add(EventModel(id=EVENT_ID, name="Spring Symposium", is_active=True))
+        session.add_all([
+            PosterModel(id=1, event_id=EVENT_ID, judge_id=1, title="Autophagy", author="Bob", score=0),
+            PosterModel(id=2, event_id=EVENT_ID, judge_id=1, title="Ribosomes", author="Bob", score=0),
+            PosterModel(id=3, event_id=EVENT_ID, judge_id=4, title="Mitochondria", author="Charlie", score=0),
+        ])
+        session.commit()
+    return TestingSessionLocal
+
+
+@pytest.fixture
+def db_session(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _events(session_factory):
+    with session_factory() as session:
+        return session.scalar(select(func.count()).select_from(ScoreEventModel))
+
+
+def test_score_changes_are_logged_after_a_flush(session_factory, db_session):
+    log = ScoreLog(session_factory)
+    service = PosterService(db_session, log=log)
+
+    service.update_poster(EVENT_ID, 1, 1, PosterUpdate(score=7.0))
+    service.update_poster(EVENT_ID, 1, 1, PosterUpdate(title="Autophagy, revised"))  # not a score change
+    service.apply_score_batch(EVENT_ID, 1, [
+        ScoreChange(idempotency_key="a", poster_id=1, score=8.5),
+        ScoreChange(idempotency_key="b", poster_id=2, score=6.0),
+    ])
+    service.delete_poster(EVENT_ID, 1, 2)
+
+    assert _events(session_factory) == 0  # nothing written yet
+    assert log.flush() == 4
+
+    history = ScoreLogService(db_session).history(EVENT_ID, 1)
+    assert [(e.judge_id, e.old_value, e.new_value, e.source) for e in history] == [
+        (1, 0.0, 7.0, "update"),
+        (1, 7.0, 8.5, "batch"),
+    ]
+    deleted = ScoreLogService(db_session).history(EVENT_ID, 2)[-1]
+    assert (deleted.old_value, deleted.new_value, deleted.source) == (6.0, None, "delete")
+
+
+def test_failed_flush_keeps_events(session_factory):
+    # The first flush goes to a database without the table
+    empty = sessionmaker(bind=create_engine("sqlite:///:memory:", future=True))
+    factories = iter([empty, session_factory])
+    log = ScoreLog(lambda: next(factories)())
+    log.record(EVENT_ID, 1, 1, 0.0, 5.0, "update", at=T0)
+
+    assert log.flush() == 0
+    assert log.pending() == 1
+    assert log.flush() == 1
+    assert _events(session_factory) == 1
+
+
+def test_full_buffer_flushes_instead_of_dropping(session_factory):
+    log = ScoreLog(session_factory, max_pending=2)
+    log.record(EVENT_ID, 1, 1, 0.0, 5.0, "update", at=T0)
+    log.record(EVENT_ID, 1, 1, 5.0, 6.0, "update", at=T0 + timedelta(seconds=1))
+
+    assert log.pending() == 0
+    assert _events(session_factory) == 2
+
+
+def test_log_is_append_only(session_factory, db_session):
+    log = ScoreLog(session_factory)
+    log.record(EVENT_ID, 1, 1, 0.0, 5.0, "update", at=T0)
+    log.flush()
+
+    with pytest.raises(DatabaseError, match="append-only"):
+        db_session.execute(update(ScoreEventModel).values(new_value=10.0))
+    db_session.rollback()
+    with pytest.raises(DatabaseError, match="append-only"):
+        db_session.execute(delete(ScoreEventModel))
+
+
+def _record_history(session_factory):
+    log = ScoreLog(session_factory)
+    log.record(EVENT_ID, 1, 1, 0.0, 5.0, "update", at=T0)
+    log.record(EVENT_ID, 3, 4, 0.0, 9.0, "batch", at=T0 + timedelta(minutes=1))
+    log.record(EVENT_ID, 2, 1, 0.0, 7.0, "batch", at=T0 + timedelta(minutes=2))
+    log.record(EVENT_ID, 1, 1, 5.0, 6.0, "update", at=T0 + timedelta(minutes=3))
+    log.record(EVENT_ID, 2, 1, 7.0, None, "delete", at=T0 + timedelta(minutes=4))
+    log.flush()
+
+
+def test_replay_rebuilds_scores_and_aggregates(session_factory, db_session):
+    _record_history(session_factory)
+    service = ScoreLogService(db_session)
+
+    state = service.replay(EVENT_ID)
+    assert state.scores() == {1: 6.0, 3: 9.0}
+    assert state.aggregates() == {
+        "count": 2, "mean": 7.5,
+        "judges": {1: {"count": 1, "mean": 6.0}, 4: {"count": 1, "mean": 9.0}},
+    }
+    # As of an earlier time, e.g. when awards were announced
+    assert service.replay(EVENT_ID, until=T0 + timedelta(minutes=2)).scores() == {1: 5.0, 2: 7.0, 3: 9.0}
+
+
+def test_replay_from_snapshot_matches_full_replay(session_factory, db_session):
+    _record_history(session_factory)
+    service = ScoreLogService(db_session)
+
+    snapshot = service.snapshot(EVENT_ID)
+    assert snapshot.event_count == 5
+    assert service.snapshot(EVENT_ID) is None
+
+    # Events up to the snapshot are no longer read
+    log = ScoreLog(session_factory)
+    log.record(EVENT_ID, 3, 4, 9.0, 4.0, "update", at=T0 + timedelta(minutes=5))
+    log.flush()
+    state = service.replay(EVENT_ID)
+    assert state.event_count == 6
+    assert state.scores() == {1: 6.0, 3: 4.0}
+    # Snapshots of later changes are not used for earlier points in time
+    assert service.replay(EVENT_ID, until=T0 + timedelta(minutes=2)).scores() == {1: 5.0, 2: 7.0, 3: 9.0}
+
+
+def test_late_flush_is_replayed_after_a_snapshot(session_factory, db_session):
+    _record_history(session_factory)
+    service = ScoreLogService(db_session)
+    service.snapshot(EVENT_ID)
+
+    # A worker whose buffer is stored late, or whose clock is behind
+    log = ScoreLog(session_factory)
+    log.record(EVENT_ID, 3, 4, 9.0, 2.0, "update", at=T0 - timedelta(hours=1))
+    log.flush()
+
+    assert service.replay(EVENT_ID).scores() == {1: 6.0, 3: 2.0}
+    assert [e.new_value for e in service.history(EVENT_ID, 3)] == [9.0, 2.0]
+
+
+def test_snapshot_due_only_snapshots_busy_events(session_factory, db_session):
+    _record_history(session_factory)
+    service = ScoreLogService(db_session)
+
+    assert service.snapshot_due(every=10) == 0
+    assert service.snapshot_due(every=5) == 1
+    assert db_session.scalar(select(func.count()).select_from(ScoreSnapshotModel)) == 1
+    assert service.snapshot_due(every=5) == 0  # nothing logged since
+
+
+def test_rebuild_scores_restores_logged_values(session_factory, db_session):
+    _record_history(session_factory)
+    # Scores overwritten outside the service (e.g. a bad manual fix) leave no event
+    db_session.execute(update(PosterModel).values(score=0.0))
+    db_session.commit()
+
+    log = ScoreLog(session_factory)
+    assert PosterService(db_session, log=log).rebuild_scores(EVENT_ID, admin_id=9) == 2
+    assert {poster.id: poster.score for poster in db_session.scalars(select(PosterModel))} == {1: 6.0, 2: 0.0, 3: 9.0}
+
+    # The rebuild itself is logged, by the admin who ran it
+    assert log.flush() == 2
+    rebuilt = ScoreLogService(db_session).history(EVENT_ID, 1)[-1]
+    assert (rebuilt.old_value, rebuilt.new_value, rebuilt.source, rebuilt.judge_id, rebuilt.changed_by) == (0.0, 6.0, "rebuild", 1, 9)
+    assert ScoreLogService(db_session).replay(EVENT_ID).scores() == {1: 6.0, 3: 9.0}
+
+
+def test_rebuild_keeps_changes_not_yet_flushed(session_factory, db_session):
+    _record_history(session_factory)
+    log = ScoreLog(session_factory)
+    service = PosterService(db_session, log=log)
+    db_session.execute(update(PosterModel).where(PosterModel.id == 1).values(score=6.0))
+    db_session.commit()
+
+    service.update_poster(EVENT_ID, 1, 1, PosterUpdate(score=8.0))
+    assert log.pending() == 1
+
+    assert service.rebuild_scores(EVENT_ID, admin_id=9) == 1  # only poster 3, unlogged at 0
+    assert db_session.get(PosterModel, 1).score == 8.0
+    assert ScoreLogService(db_session).replay(EVENT_ID).scores()[1] == 8.0
+
+
+def test_rebuild_refuses_while_the_log_cannot_be_written(session_factory, db_session):
+    log = ScoreLog(sessionmaker(bind=create_engine("sqlite:///:memory:", future=True)))
+    service = PosterService(db_session, log=log)
+    service.update_poster(EVENT_ID, 1, 1, PosterUpdate(score=8.0))
+
+    with pytest.raises(ScoreLogBehind):
+        service.rebuild_scores(EVENT_ID, admin_id=9)
+    assert db_session.get(PosterModel, 1).score == 8.0
@@ -0,0 +1,111 @@
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, EventModel, PosterModel, UserModel
+from app.services.search_service import PosterSearchService
+
+# A disposable Postgres database with pg_trgm available; its tables are dropped and recreated
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+@pytest.fixture
+def db_session():
+    """Creates an in-memory SQLite DB; posters are indexed by FTS5 through triggers."""
+    engine = create_engine("sqlite:///:memory:", echo=False, future=True)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    session.add_all([
+        PosterModel(event_id=1, judge_id=1, title="Neural Networks in C. elegans", author="Alice Smith", score=95.5,
+                    abstract="Mapping the connectome of the nematode."),
+        PosterModel(event_id=1, judge_id=1, title="Autophagy Pathways", author="Bob Jones", score=88.0,
+                    abstract="Lysosomal degradation under starvation."),
+        PosterModel(event_id=1, judge_id=1, title="Mitochondrial Stress", author="Charlie Brown", score=92.3,
+                    abstract="Autophagy of damaged mitochondria."),
+        PosterModel(event_id=1, judge_id=2, title="Autophagy in Yeast", author="Dana White", score=80.0),
+        PosterModel(event_id=2, judge_id=1, title="Autophagy Revisited", author="Eve Adams", score=75.0),
+    ])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def test_search_by_prefix(db_session):
+    hits = PosterSearchService(db_session).search("Autoph", event_id=1)
+    assert {hit.title for hit in hits} == {"Autophagy Pathways", "Mitochondrial Stress", "Autophagy in Yeast"}
+
+
+def test_search_is_event_scoped(db_session):
+    hits = PosterSearchService(db_session).search("autophagy", event_id=2)
+    assert [hit.title for hit in hits] == ["Autophagy Revisited"]
+
+
+def test_search_ranks_title_above_abstract(db_session):
+    hits = PosterSearchService(db_session).search("autophagy", event_id=1, judge_id=1)
+    assert [hit.title for hit in hits] == ["Autophagy Pathways", "Mitochondrial Stress"]
+    assert hits[0].rank > hits[1].rank
+
+
+def test_search_by_author(db_session):
+    hits = PosterSearchService(db_session).search("Charlie")
+    assert [hit.author for hit in hits] == ["Charlie Brown"]
+
+
+def test_search_tolerates_typos(db_session):
+    hits = PosterSearchService(db_session).search("Autophgy Pathwys")
+    assert [hit.title for hit in hits] == ["Autophagy Pathways"]
+
+
+def test_search_follows_updates_and_deletes(db_session):
+    poster = db_session.query(PosterModel).filter_by(title="Autophagy in Yeast").one()
+    poster.title = "Proteostasis in Yeast"
+    db_session.commit()
+    service = PosterSearchService(db_session)
+
+    assert [hit.title for hit in service.search("proteostasis")] == ["Proteostasis in Yeast"]
+
+    db_session.delete(poster)
+    db_session.commit()
+    assert service.search("proteostasis") == []
+
+
+def test_search_ignores_query_syntax(db_session):
+    assert PosterSearchService(db_session).search('"* OR ) (') == []
+
+
+@pytest.fixture
+def pg_session():
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(TEST_POSTGRES_URL, future=True)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    session.add_all([
+        UserModel(id=1, first_name="Ann", last_name="Lee", email="ann@example.com"),
+        EventModel(id=1, name="Spring Symposium", is_active=True),
+    ])
+    session.flush()
+    session.add_all([
+        PosterModel(event_id=1, judge_id=1, title="Lysosomes", author="Bob Jones", score=88.0,
+                    abstract="Signalling pathways of the lysosome."),
+        PosterModel(event_id=1, judge_id=1, title="Autophagy Pathways", author="Alice Smith", score=95.5),
+    ])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_postgres_search_matches_inflected_abstract_terms(pg_session):
+    # The abstract is stemmed ("pathway"), the title is not ("pathways"): both must match
+    hits = PosterSearchService(pg_session).search("pathways", event_id=1)
+    assert {hit.title for hit in hits} == {"Lysosomes", "Autophagy Pathways"}
+
+    hits = PosterSearchService(pg_session).search("signalling pathway", event_id=1)
+    assert [hit.title for hit in hits] == ["Lysosomes"]
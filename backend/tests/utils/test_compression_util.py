@@ -0,0 +1,98 @@
+import gzip
+import json
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.utils.compression_util import CompressionMiddleware, choose_encoding
+from app.utils.metrics_util import metrics
+
+PAGE = [{"id": i, "title": f"Poster {i}", "author": "Alice"} for i in range(200)]
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+@app.get("/page")
+def page(response: Response):
+    response.headers["ETag"] = '"1.1.7.1.10"'
+    return PAGE
+
+
+@app.get("/small")
+def small():
+    return {"ok": True}
+
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse((f"{i},Poster {i}\n" for i in range(1000)), media_type="text/csv")
+
+
+@app.get("/image")
+def image():
+    return Response(b"\x89PNG" * 500, media_type="image/png")
+
+
+client = TestClient(app)
+
+
+def raw_get(path, accept_encoding):
+    # Read the body as sent, without the client decoding it
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("gzip;q=1.0, br;q=0.8", "gzip"),
+    ("br, gzip;q=0.5", "br"),
+    ("*", "zstd"),
+    ("zstd;q=0, *;q=0.1", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("encoding, decompress", [
+    ("gzip", gzip.decompress),
+    ("br", brotli.decompress),
+    ("zstd", zstandard.ZstdDecompressor().decompress),
+])
+def test_large_responses_are_compressed(encoding, decompress):
+    response, body = raw_get("/page", encoding)
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["content-length"] == str(len(body))
+    assert response.headers["etag"] == 'W/"1.1.7.1.10"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert json.loads(decompress(body)) == PAGE
+
+
+def test_small_and_binary_responses_are_sent_as_is():
+    response, body = raw_get("/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert json.loads(body) == {"ok": True}
+    response, body = raw_get("/image", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body == b"\x89PNG" * 500
+
+
+def test_streamed_responses_are_compressed_chunk_by_chunk():
+    response, body = raw_get("/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body).decode() == "".join(f"{i},Poster {i}\n" for i in range(1000))
+
+
+def test_identical_payloads_are_compressed_once():
+    hits = metrics.get("compression_cache", outcome="hit") or 0
+    misses = metrics.get("compression_cache", outcome="miss") or 0
+    first = raw_get("/page", "br")[1]
+    second = raw_get("/page", "br")[1]
+    assert first == second
+    assert metrics.get("compression_cache", outcome="miss") == misses + 1
+    assert metrics.get("compression_cache", outcome="hit") == hits + 1
@@ -0,0 +1,33 @@
+import email
+from email.header import decode_header, make_header
+import pytest
+from app.utils.email_template_util import EmailTemplate
+from app.utils.email_util import VERIFICATION_MESSAGE, VERIFICATION_EMAIL
+
+
+def test_rendered_message_matches_format():
+    message = email.message_from_string(
+        VERIFICATION_EMAIL.render("alice@example.com", first_name="Alice", redirect_url="https://app/verify/abc")
+    )
+    html_part = message.get_payload()[0]
+
+    assert message["To"] == "alice@example.com"
+    assert message["From"] == "judging_app@gmail.com"
+    assert message["Subject"] == "Please Verify your email"
+    assert html_part.get_content_type() == "text/html"
+    assert html_part.get_payload(decode=True).decode("utf-8") == VERIFICATION_MESSAGE.format(
+        first_name="Alice", redirect_url="https://app/verify/abc"
+    )
+
+
+def test_fields_are_escaped_and_headers_encoded():
+    template = EmailTemplate("Évaluation {no fields here}", "judging_app@gmail.com", "<p>{{Dear}} {first_name}</p>")
+    message = email.message_from_string(template.render("bob@example.com", first_name="<Bob & Co>"))
+
+    assert str(make_header(decode_header(message["Subject"]))) == "Évaluation {no fields here}"
+    assert message.get_payload()[0].get_payload(decode=True) == b"<p>{Dear} &lt;Bob &amp; Co&gt;</p>"
+
+
+def test_missing_field_raises():
+    with pytest.raises(ValueError, match="redirect_url"):
+        VERIFICATION_EMAIL.render("alice@example.com", first_name="Alice")
@@ -0,0 +1,42 @@
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+from app.utils import geolocation
+from app.utils.geolocation import get_geolocation
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    geolocation.geolocations.clear()
+    yield
+    geolocation.geolocations.clear()
+
+
+def _response(status_code, payload):
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = payload
+    response.raise_for_status.side_effect = requests.HTTPError(str(status_code)) if status_code >= 400 else None
+    return response
+
+
+def test_successful_lookup_is_cached():
+    found = _response(200, {"city": "Amherst", "region": "Massachusetts", "country": "US", "loc": "42.37,-72.52"})
+    with patch.object(geolocation.requests, "get", return_value=found) as get:
+        assert get_geolocation("8.8.8.8")["city"] == "Amherst"
+        assert get_geolocation("8.8.8.8")["latitude"] == "42.37"
+
+    assert get.call_count == 1
+    assert get.call_args.kwargs["timeout"] == geolocation.GEOLOCATION_TIMEOUT_SECONDS
+
+
+@pytest.mark.parametrize("outcome", [
+    _response(429, {"error": {"title": "Rate limit exceeded"}}),
+    _response(200, {"error": {"title": "Wrong ip"}}),
+    requests.Timeout("timed out"),
+])
+def test_failed_lookup_is_not_cached(outcome):
+    with patch.object(geolocation.requests, "get", side_effect=[outcome, outcome]) as get:
+        assert get_geolocation("8.8.8.8")["city"] == "City not found"
+        get_geolocation("8.8.8.8")
+
+    assert get.call_count == 2
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+from app.utils.metrics_util import Metrics
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORKER = """
+from app.utils.metrics_util import metrics
+metrics.describe("requests_served", "counter", "Requests served")
+metrics.describe("last_run_timestamp_seconds", "gauge", "Last run")
+metrics.inc("requests_served", {count}, route="/posters")
+metrics.set("last_run_timestamp_seconds", {count})
+"""
+
+SCRAPE = "from app.utils.metrics_util import metrics; print(metrics.render())"
+
+
+def _run(code: str, multiproc_dir) -> str:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+    return subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                          capture_output=True, text=True, check=True).stdout
+
+
+def test_render_single_process():
+    metrics = Metrics(multiprocess_dir="")
+    metrics.describe("jobs", "counter", "Jobs run")
+    metrics.inc("jobs", 2, outcome="ok")
+    metrics.observe("job_seconds", 0.5)
+
+    text = metrics.render()
+    assert "# HELP jobs_total Jobs run" in text
+    assert 'jobs_total{outcome="ok"} 2.0' in text
+    assert "job_seconds_count 1.0" in text
+    assert metrics.get("jobs", outcome="ok") == 2
+
+
+def test_scrape_sums_every_worker(tmp_path):
+    # Two workers (one of them already exited) each count their own requests
+    _run(WORKER.format(count=3), tmp_path)
+    _run(WORKER.format(count=4), tmp_path)
+
+    text = _run(SCRAPE, tmp_path)
+    assert 'requests_served_total{route="/posters"} 7.0' in text
+    assert "last_run_timestamp_seconds 4.0" in text
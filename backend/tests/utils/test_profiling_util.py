@@ -0,0 +1,61 @@
+import os
+from datetime import timedelta
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.utils import profiling_util
+from app.utils.jwt_util import TokenType, create_token
+from app.utils.profiling_util import ProfilingMiddleware, report_path
+
+
+def make_client(report_dir, sample_rate=0.0):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, sample_rate=sample_rate, report_dir=str(report_dir))
+
+    @app.get("/posters")
+    async def posters():
+        return {"total": sum(range(10_000))}
+
+    return TestClient(app)
+
+
+def token(token_type, minutes=5):
+    return create_token("1", "", timedelta(minutes=minutes), token_type)
+
+
+def test_request_with_profile_token_is_profiled(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling_util, "PROFILE_DIR", str(tmp_path))
+    response = make_client(tmp_path).get("/posters", headers={"X-Profile-Token": token(TokenType.PROFILE)})
+
+    assert response.status_code == 200
+    assert response.json() == {"total": 49995000}
+    path = report_path(response.headers["x-profile-id"])
+    assert path is not None and os.path.getsize(path) > 0
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"X-Profile-Token": "not-a-token"},
+    {"X-Profile-Token": token(TokenType.ACCESS)},
+    {"X-Profile-Token": token(TokenType.PROFILE, minutes=-1)},
+])
+def test_requests_without_a_valid_profile_token_are_not_profiled(tmp_path, headers):
+    response = make_client(tmp_path).get("/posters", headers=headers)
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert not tmp_path.exists() or not os.listdir(tmp_path)
+
+
+def test_sampled_requests_are_profiled(tmp_path):
+    client = make_client(tmp_path, sample_rate=1.0)
+    ids = {client.get("/posters").headers["x-profile-id"] for _ in range(3)}
+
+    assert len(ids) == 3
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_report_path_rejects_unknown_ids(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling_util, "PROFILE_DIR", str(tmp_path))
+    assert report_path("../../etc/passwd") is None
+    assert report_path("20260101000000-0123abcd") is None
@@ -0,0 +1,70 @@
+import logging
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from app.utils import query_util
+from app.utils.query_util import QueryStatsMiddleware, assert_queries, track_queries
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE posters (id INTEGER PRIMARY KEY, title TEXT)"))
+        conn.execute(text("INSERT INTO posters VALUES (1, 'A'), (2, 'B'), (3, 'C'), (4, 'D'), (5, 'E')"))
+    return engine
+
+
+def one_by_one(engine):
+    with engine.connect() as conn:
+        ids = conn.execute(text("SELECT id FROM posters")).scalars().all()
+        return [conn.execute(text("SELECT title FROM posters WHERE id = :id"), {"id": i}).scalar() for i in ids]
+
+
+def test_track_queries_counts_statements(engine):
+    with track_queries(engine) as stats:
+        one_by_one(engine)
+
+    assert stats.count == 6
+    assert stats.statements["SELECT title FROM posters WHERE id = ?"] == 5
+    assert stats.repeated(5) == {"SELECT title FROM posters WHERE id = ?": 5}
+
+
+def test_assert_queries_flags_n_plus_one_and_budget(engine):
+    with pytest.raises(AssertionError, match="N\\+1"):
+        with assert_queries(engine, max_repeats=4):
+            one_by_one(engine)
+    with pytest.raises(AssertionError, match="6 statements run, budget is 2"):
+        with assert_queries(engine, max_statements=2, max_repeats=10):
+            one_by_one(engine)
+    with assert_queries(engine, max_statements=1):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT id, title FROM posters")).all()
+
+
+def test_slow_statements_are_logged_with_their_plan(engine, monkeypatch, caplog):
+    monkeypatch.setattr(query_util, "SLOW_QUERY_MS", 0)
+    with track_queries(engine), caplog.at_level(logging.WARNING, logger="app.utils.query_util"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT title FROM posters WHERE id = :id"), {"id": 1})
+
+    assert "Slow statement" in caplog.text
+    assert "Plan:" in caplog.text and "posters" in caplog.text.split("Plan:")[1]
+
+
+def test_middleware_reports_statements_per_request(engine, caplog):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/posters")
+    def posters():
+        return one_by_one(engine)
+
+    with track_queries(engine), caplog.at_level(logging.WARNING, logger="app.utils.query_util"):
+        response = TestClient(app).get("/posters")
+
+    assert response.json() == ["A", "B", "C", "D", "E"]
+    assert 'desc="6 statements"' in response.headers["server-timing"]
+    assert "likely an N+1" in caplog.text
@@ -0,0 +1,83 @@
+import json
+import logging
+from datetime import timedelta
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from app.utils.jwt_util import TokenType, create_token, decode_token
+from app.utils.tracing_util import JsonLinesSpanExporter, TraceContextFilter, span, traced
+
+exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tracer_provider():
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    yield provider
+
+
+@pytest.fixture(autouse=True)
+def clear_spans():
+    exporter.clear()
+
+
+def test_traced_functions_nest_jwt_spans():
+    @traced("AuthService.signin")
+    def signin():
+        decode_token(create_token("1", "a@example.com", timedelta(minutes=1), TokenType.ACCESS))
+
+    signin()
+    spans = {s.name: s for s in exporter.get_finished_spans()}
+
+    assert set(spans) == {"AuthService.signin", "jwt.encode", "jwt.decode"}
+    root = spans["AuthService.signin"]
+    assert spans["jwt.encode"].parent.span_id == root.context.span_id
+    assert spans["jwt.decode"].parent.span_id == root.context.span_id
+    assert spans["jwt.encode"].attributes["token_type"] == "access"
+
+
+def test_log_records_carry_the_current_trace_id():
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "signed in", None, None)
+    with span("request") as current:
+        TraceContextFilter().filter(record)
+
+    assert record.trace_id == format(current.get_span_context().trace_id, "032x")
+    assert record.span_id == format(current.get_span_context().span_id, "016x")
+
+
+def test_json_lines_exporter_writes_one_span_per_line(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(JsonLinesSpanExporter(str(path))))
+    tracer = provider.get_tracer("test")
+    with tracer.start_as_current_span("argon2.verify"):
+        pass
+    with tracer.start_as_current_span("smtp.send"):
+        pass
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["argon2.verify", "smtp.send"]
+
+
+def test_statements_are_traced_under_the_current_span():
+    from sqlalchemy import create_engine, text
+    from app.utils.tracing_util import trace_statements
+
+    engine = create_engine("sqlite://")
+    trace_statements(engine)
+    with span("AuthService.signin"), engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with pytest.raises(Exception):
+            conn.execute(text("SELECT * FROM missing_table"))
+
+    spans = exporter.get_finished_spans()
+    root = next(s for s in spans if s.name == "AuthService.signin")
+    selects = [s for s in spans if s.name == "db.SELECT"]
+    assert len(selects) == 2
+    assert all(s.parent.span_id == root.context.span_id for s in selects)
+    assert selects[0].attributes["db.statement"] == "SELECT 1"
+    assert not selects[1].status.is_ok